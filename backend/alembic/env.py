@@ -21,9 +21,14 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Banco alvo: "postgres" (modelos SQLAlchemy) ou "oracle" (tabelas da API Oracle)
+#   alembic upgrade postgres@head
+#   alembic -x db=oracle upgrade oracle@head
+TARGET_DB = context.get_x_argument(as_dictionary=True).get("db", "postgres")
+
 # add your model's MetaData object here
-# for 'autogenerate' support
-target_metadata = Base.metadata
+# for 'autogenerate' support (o schema Oracle é mantido manualmente)
+target_metadata = Base.metadata if TARGET_DB != "oracle" else None
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -33,6 +38,15 @@ target_metadata = Base.metadata
 
 def get_url():
     """Get database URL from environment or config"""
+    if TARGET_DB == "oracle":
+        from app.core.oracle_config import oracle_settings
+        return (
+            f"oracle+oracledb://{oracle_settings.oracle_username}:"
+            f"{oracle_settings.oracle_password}@"
+            f"{oracle_settings.oracle_host}:"
+            f"{oracle_settings.oracle_port}/"
+            f"{oracle_settings.oracle_service_name}"
+        )
     url = os.getenv("DATABASE_URL")
     if url:
         return url
@@ -12,7 +12,7 @@ from sqlalchemy.dialects import postgresql
 # revision identifiers, used by Alembic.
 revision = '001'
 down_revision = None
-branch_labels = None
+branch_labels = ('postgres',)
 depends_on = None
 
 
@@ -0,0 +1,141 @@
+"""Oracle schema - TERRITORIOS, USUARIOS, OCORRENCIAS and query indexes
+
+Revision ID: ora001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+Bancos criados pelo código antigo (DDL em tempo de execução) já possuem as
+tabelas: nesse caso apenas os índices ausentes são criados.
+
+Executar com:
+    alembic -x db=oracle upgrade oracle@head
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ora001'
+down_revision = None
+branch_labels = ('oracle',)
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_index(table: str, name: str) -> bool:
+    indexes = sa.inspect(op.get_bind()).get_indexes(table)
+    return any(index['name'].lower() == name.lower() for index in indexes)
+
+
+def _create_index(name: str, table: str, columns: list, **kwargs):
+    if not _has_index(table, name):
+        op.create_index(name, table, columns, **kwargs)
+
+
+def upgrade() -> None:
+    if not _has_table('territorios'):
+        territorios = op.create_table('territorios',
+            sa.Column('id', sa.Integer(), sa.Identity(always=False), nullable=False),
+            sa.Column('nome', sa.String(200), nullable=False),
+            sa.Column('estado', sa.String(50), nullable=False),
+            sa.Column('municipio', sa.String(100), nullable=False),
+            sa.Column('area_hectares', sa.Numeric(10, 2), nullable=True),
+            sa.Column('populacao', sa.Numeric(10), nullable=True),
+            sa.Column('coordenadas_lat', sa.Numeric(10, 8), nullable=True),
+            sa.Column('coordenadas_lng', sa.Numeric(11, 8), nullable=True),
+            sa.Column('data_criacao', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('nome', 'estado', name='uk_territorios_nome')
+        )
+        # Território padrão usado no registro de usuários
+        op.bulk_insert(territorios, [{
+            'nome': 'Território de Desenvolvimento Naurú Yvy',
+            'estado': 'São Paulo',
+            'municipio': 'São Paulo',
+            'area_hectares': 1000.0,
+            'populacao': 500
+        }])
+
+    if not _has_table('usuarios'):
+        op.create_table('usuarios',
+            sa.Column('id', sa.Integer(), sa.Identity(always=False), nullable=False),
+            sa.Column('nome', sa.String(100), nullable=False),
+            sa.Column('email', sa.String(150), nullable=False),
+            sa.Column('senha_hash', sa.String(255), nullable=False),
+            sa.Column('tipo_usuario', sa.String(50), nullable=False),
+            sa.Column('territorio_id', sa.Integer(), nullable=True),
+            sa.Column('telefone', sa.String(20), nullable=True),
+            sa.Column('nome_social', sa.String(100), nullable=True),
+            sa.Column('nome_indigena', sa.String(100), nullable=True),
+            sa.Column('idade', sa.Numeric(3), nullable=True),
+            sa.Column('principal_atuacao', sa.String(200), nullable=True),
+            sa.Column('aldeia_comunidade', sa.String(200), nullable=True),
+            sa.Column('localizacao_territorio', sa.String(200), nullable=True),
+            sa.Column('aceite_lgpd', sa.Numeric(1), server_default=sa.text('0'), nullable=True),
+            sa.Column('status', sa.String(20), server_default=sa.text("'ativo'"), nullable=True),
+            sa.Column('data_criacao', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.Column('ultima_atualizacao', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email', name='uk_usuarios_email'),
+            sa.CheckConstraint(
+                "tipo_usuario IN ('administrador', 'lider_territorial', 'monitor_ambiental', 'membro_comunidade', 'pesquisador')",
+                name='chk_tipo_usuario'
+            ),
+            sa.CheckConstraint("status IN ('ativo', 'inativo', 'pendente', 'bloqueado')", name='chk_status_usuario'),
+            sa.CheckConstraint('aceite_lgpd IN (0, 1)', name='chk_aceite_lgpd'),
+            sa.CheckConstraint('idade >= 0 AND idade <= 150', name='chk_idade')
+        )
+
+    if not _has_table('ocorrencias'):
+        op.create_table('ocorrencias',
+            sa.Column('id', sa.Integer(), sa.Identity(always=False), nullable=False),
+            sa.Column('usuario_id', sa.Integer(), nullable=False),
+            sa.Column('tipo_ocorrencia', sa.String(50), nullable=False),
+            sa.Column('localizacao', sa.String(200), nullable=False),
+            sa.Column('grau_severidade', sa.String(20), nullable=False),
+            sa.Column('descricao', sa.Text(), nullable=False),
+            sa.Column('coordenadas', sa.Text(), nullable=True),
+            sa.Column('imagens', sa.Text(), nullable=True),
+            sa.Column('status', sa.String(20), server_default=sa.text("'reportada'"), nullable=True),
+            sa.Column('notas_investigacao', sa.Text(), nullable=True),
+            sa.Column('notas_resolucao', sa.Text(), nullable=True),
+            sa.Column('data_criacao', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.Column('data_atualizacao', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], name='fk_ocorrencias_usuario'),
+            sa.CheckConstraint(
+                "tipo_ocorrencia IN ('desmatamento', 'queimada', 'caca_pesca', 'enchente', 'poluicao', 'mineracao_ilegal')",
+                name='chk_ocorr_tipo'
+            ),
+            sa.CheckConstraint("grau_severidade IN ('baixa', 'media', 'alta', 'critica')", name='chk_ocorr_severidade'),
+            sa.CheckConstraint(
+                "status IN ('reportada', 'investigando', 'confirmada', 'resolvida', 'descartada')",
+                name='chk_ocorr_status'
+            )
+        )
+
+    # Login e /auth/me: WHERE UPPER(EMAIL) = UPPER(:email)
+    _create_index('idx_usuarios_email_upper', 'usuarios', [sa.text('UPPER(email)')])
+    # FK e filtro de estatísticas por território
+    _create_index('idx_usuarios_territorio', 'usuarios', ['territorio_id'])
+
+    # Listagem do usuário (keyset) e estatísticas por usuário
+    _create_index('idx_ocorr_usuario_data', 'ocorrencias', ['usuario_id', 'data_criacao', 'id'])
+    # Listagem geral (admin, keyset)
+    _create_index('idx_ocorr_data_id', 'ocorrencias', ['data_criacao', 'id'])
+    _create_index('idx_ocorr_status', 'ocorrencias', ['status'])
+    _create_index('idx_ocorr_tipo', 'ocorrencias', ['tipo_ocorrencia'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ocorr_tipo', table_name='ocorrencias')
+    op.drop_index('idx_ocorr_status', table_name='ocorrencias')
+    op.drop_index('idx_ocorr_data_id', table_name='ocorrencias')
+    op.drop_index('idx_ocorr_usuario_data', table_name='ocorrencias')
+    op.drop_index('idx_usuarios_territorio', table_name='usuarios')
+    op.drop_index('idx_usuarios_email_upper', table_name='usuarios')
+    op.drop_table('ocorrencias')
+    op.drop_table('usuarios')
+    op.drop_table('territorios')
@@ -0,0 +1,86 @@
+"""Oracle - OCORRENCIAS CLOB columns to VARCHAR2 (JSON checked)
+
+Revision ID: ora002
+Revises: ora001
+Create Date: 2026-10-18 10:00:00.000000
+
+DESCRICAO e as notas são limitadas a 1000 caracteres pelos schemas da API;
+COORDENADAS e IMAGENS são JSON curtos. Como VARCHAR2 os valores vêm na
+própria linha do fetch, sem um LOB locator (e idas extras ao banco) por linha.
+O tipo JSON nativo exige Oracle 21c; aqui usamos VARCHAR2 com CHECK IS JSON.
+
+Antes de converter, a migração aborta listando as linhas que não cabem no
+novo tamanho ou cujo JSON é inválido: nada é truncado em silêncio. Corrija
+essas linhas e rode de novo.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ora002'
+down_revision = 'ora001'
+branch_labels = None
+depends_on = None
+
+# coluna -> (tipo VARCHAR2, tamanho em caracteres, NOT NULL, JSON)
+COLUMNS = {
+    'DESCRICAO': ('VARCHAR2(1000 CHAR)', 1000, True, False),
+    'COORDENADAS': ('VARCHAR2(200 CHAR)', 200, False, True),
+    'IMAGENS': ('VARCHAR2(4000 BYTE)', 4000, False, True),
+    'NOTAS_INVESTIGACAO': ('VARCHAR2(1000 CHAR)', 1000, False, False),
+    'NOTAS_RESOLUCAO': ('VARCHAR2(1000 CHAR)', 1000, False, False),
+}
+
+
+def _check_existing_rows():
+    """Abortar se algum valor atual seria truncado ou não é JSON válido"""
+    bind = op.get_bind()
+    problems = []
+    for column, (_, max_len, _, is_json) in COLUMNS.items():
+        condition = f'DBMS_LOB.GETLENGTH({column}) > {max_len}'
+        if is_json:
+            condition += f' OR ({column} IS NOT NULL AND {column} IS NOT JSON)'
+        ids = [row[0] for row in bind.execute(sa.text(
+            f'SELECT ID FROM OCORRENCIAS WHERE {condition} ORDER BY ID FETCH FIRST 50 ROWS ONLY'
+        ))]
+        if ids:
+            problems.append(f'{column} (até {max_len} caracteres{", JSON válido" if is_json else ""}): IDs {ids}')
+
+    if problems:
+        raise RuntimeError(
+            'OCORRENCIAS tem valores que seriam truncados ou JSON inválido; '
+            'corrija-os antes da migração:\n  ' + '\n  '.join(problems)
+        )
+
+
+def _convert(column: str, new_type: str, substr_len: int, not_null: bool, from_type: str):
+    """Trocar o tipo via coluna temporária (Oracle não converte CLOB <-> VARCHAR2 in-place)"""
+    tmp = f'{column}_TMP'
+    op.execute(f'ALTER TABLE OCORRENCIAS ADD ({tmp} {new_type})')
+    if from_type == 'CLOB':
+        op.execute(f'UPDATE OCORRENCIAS SET {tmp} = DBMS_LOB.SUBSTR({column}, {substr_len}, 1)')
+    else:
+        op.execute(f'UPDATE OCORRENCIAS SET {tmp} = TO_CLOB({column})')
+    op.execute(f'ALTER TABLE OCORRENCIAS DROP COLUMN {column}')
+    op.execute(f'ALTER TABLE OCORRENCIAS RENAME COLUMN {tmp} TO {column}')
+    if not_null:
+        op.execute(f'ALTER TABLE OCORRENCIAS MODIFY ({column} NOT NULL)')
+
+
+def upgrade() -> None:
+    _check_existing_rows()
+    for column, (new_type, substr_len, not_null, is_json) in COLUMNS.items():
+        _convert(column, new_type, substr_len, not_null, from_type='CLOB')
+        if is_json:
+            # Validada: _check_existing_rows garantiu que as linhas atuais passam
+            op.execute(
+                f'ALTER TABLE OCORRENCIAS ADD CONSTRAINT CHK_OCORR_{column}_JSON '
+                f'CHECK ({column} IS JSON) ENABLE VALIDATE'
+            )
+
+
+def downgrade() -> None:
+    for column, (_, _, not_null, is_json) in COLUMNS.items():
+        if is_json:
+            op.execute(f'ALTER TABLE OCORRENCIAS DROP CONSTRAINT CHK_OCORR_{column}_JSON')
+        _convert(column, 'CLOB', 0, not_null, from_type='VARCHAR2')
@@ -0,0 +1,39 @@
+"""Oracle - numeric LAT/LNG columns and spatial index on OCORRENCIAS
+
+Revision ID: ora003
+Revises: ora002
+Create Date: 2026-10-18 11:00:00.000000
+
+Preenchidas a partir de COORDENADAS ({"lat": ..., "lng": ...}); o índice
+composto atende /occurrences/bbox e o pré-filtro de /occurrences/near.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ora003'
+down_revision = 'ora002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ocorrencias', sa.Column('lat', sa.Numeric(10, 7), nullable=True))
+    op.add_column('ocorrencias', sa.Column('lng', sa.Numeric(10, 7), nullable=True))
+    op.execute("""
+        UPDATE OCORRENCIAS
+        SET LAT = JSON_VALUE(COORDENADAS, '$.lat' RETURNING NUMBER NULL ON ERROR),
+            LNG = JSON_VALUE(COORDENADAS, '$.lng' RETURNING NUMBER NULL ON ERROR)
+        WHERE COORDENADAS IS NOT NULL
+    """)
+    op.create_check_constraint('chk_ocorr_lat', 'ocorrencias', 'lat BETWEEN -90 AND 90')
+    op.create_check_constraint('chk_ocorr_lng', 'ocorrencias', 'lng BETWEEN -180 AND 180')
+    op.create_index('idx_ocorr_lat_lng', 'ocorrencias', ['lat', 'lng'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ocorr_lat_lng', table_name='ocorrencias')
+    op.drop_constraint('chk_ocorr_lng', 'ocorrencias', type_='check')
+    op.drop_constraint('chk_ocorr_lat', 'ocorrencias', type_='check')
+    op.drop_column('ocorrencias', 'lng')
+    op.drop_column('ocorrencias', 'lat')
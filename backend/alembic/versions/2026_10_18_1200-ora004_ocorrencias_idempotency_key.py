@@ -0,0 +1,34 @@
+"""Oracle - client idempotency key on OCORRENCIAS (offline sync)
+
+Revision ID: ora004
+Revises: ora003
+Create Date: 2026-10-18 12:00:00.000000
+
+Chave gerada pelo aplicativo ao registrar offline; POST /occurrences/batch
+reenviado não duplica ocorrências. O índice único é por expressão para que
+linhas sem chave (criadas pelo POST /occurrences/) fiquem fora dele: no
+Oracle, (USUARIO_ID, NULL) repetido violaria um índice composto comum.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ora004'
+down_revision = 'ora003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ocorrencias', sa.Column('chave_idempotencia', sa.String(64), nullable=True))
+    op.execute("""
+        CREATE UNIQUE INDEX UK_OCORR_IDEMPOTENCIA ON OCORRENCIAS (
+            CASE WHEN CHAVE_IDEMPOTENCIA IS NOT NULL THEN USUARIO_ID END,
+            CHAVE_IDEMPOTENCIA
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX UK_OCORR_IDEMPOTENCIA')
+    op.drop_column('ocorrencias', 'chave_idempotencia')
@@ -0,0 +1,33 @@
+"""Oracle - DATA_ATUALIZACAO always set, index for delta sync
+
+Revision ID: ora005
+Revises: ora004
+Create Date: 2026-10-18 13:00:00.000000
+
+GET /occurrences/changes percorre as ocorrências do usuário por
+(DATA_ATUALIZACAO, ID). Linhas antigas recebem DATA_CRIACAO como marca de
+atualização e novas linhas já nascem com ela preenchida.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ora005'
+down_revision = 'ora004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE OCORRENCIAS
+        SET DATA_ATUALIZACAO = NVL(DATA_CRIACAO, CURRENT_TIMESTAMP)
+        WHERE DATA_ATUALIZACAO IS NULL
+    """)
+    op.execute('ALTER TABLE OCORRENCIAS MODIFY (DATA_ATUALIZACAO DEFAULT CURRENT_TIMESTAMP NOT NULL)')
+    op.create_index('idx_ocorr_usuario_atualizacao', 'ocorrencias', ['usuario_id', 'data_atualizacao', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ocorr_usuario_atualizacao', table_name='ocorrencias')
+    op.execute('ALTER TABLE OCORRENCIAS MODIFY (DATA_ATUALIZACAO DEFAULT NULL NULL)')
@@ -0,0 +1,63 @@
+"""Oracle - Oracle Text index over DESCRICAO and LOCALIZACAO
+
+Revision ID: ora006
+Revises: ora005
+Create Date: 2026-10-18 14:00:00.000000
+
+Índice CONTEXT único sobre as duas colunas (MULTI_COLUMN_DATASTORE), com
+acentos removidos (BASE_LETTER), radicais em português (STEMMER) e
+sincronizado a cada commit, atendendo GET /occurrences/search.
+Requer o papel CTXAPP para o usuário da aplicação.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ora006'
+down_revision = 'ora005'
+branch_labels = None
+depends_on = None
+
+# Palavras frequentes demais para ajudar na busca
+STOPWORDS = (
+    'a', 'ao', 'aos', 'as', 'com', 'da', 'das', 'de', 'do', 'dos', 'e', 'em',
+    'na', 'nas', 'no', 'nos', 'o', 'os', 'ou', 'para', 'por', 'que', 'se', 'um', 'uma'
+)
+
+
+def upgrade() -> None:
+    stopwords = '\n'.join(f"CTX_DDL.ADD_STOPWORD('OCORR_STOPLIST', '{word}');" for word in STOPWORDS)
+    op.execute(f"""
+        BEGIN
+            CTX_DDL.CREATE_PREFERENCE('OCORR_DATASTORE', 'MULTI_COLUMN_DATASTORE');
+            CTX_DDL.SET_ATTRIBUTE('OCORR_DATASTORE', 'COLUMNS', 'LOCALIZACAO, DESCRICAO');
+
+            CTX_DDL.CREATE_PREFERENCE('OCORR_LEXER', 'BASIC_LEXER');
+            CTX_DDL.SET_ATTRIBUTE('OCORR_LEXER', 'BASE_LETTER', 'YES');
+            CTX_DDL.SET_ATTRIBUTE('OCORR_LEXER', 'MIXED_CASE', 'NO');
+
+            CTX_DDL.CREATE_PREFERENCE('OCORR_WORDLIST', 'BASIC_WORDLIST');
+            CTX_DDL.SET_ATTRIBUTE('OCORR_WORDLIST', 'STEMMER', 'PORTUGUESE');
+
+            CTX_DDL.CREATE_STOPLIST('OCORR_STOPLIST', 'BASIC_STOPLIST');
+            {stopwords}
+        END;
+    """)
+    op.execute("""
+        CREATE INDEX IDX_OCORR_TEXTO ON OCORRENCIAS (DESCRICAO)
+        INDEXTYPE IS CTXSYS.CONTEXT
+        PARAMETERS ('DATASTORE OCORR_DATASTORE LEXER OCORR_LEXER WORDLIST OCORR_WORDLIST
+                     STOPLIST OCORR_STOPLIST SYNC (ON COMMIT)')
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IDX_OCORR_TEXTO')
+    op.execute("""
+        BEGIN
+            CTX_DDL.DROP_STOPLIST('OCORR_STOPLIST');
+            CTX_DDL.DROP_PREFERENCE('OCORR_WORDLIST');
+            CTX_DDL.DROP_PREFERENCE('OCORR_LEXER');
+            CTX_DDL.DROP_PREFERENCE('OCORR_DATASTORE');
+        END;
+    """)
@@ -0,0 +1,25 @@
+"""Oracle - VERSAO column on OCORRENCIAS (optimistic concurrency)
+
+Revision ID: ora007
+Revises: ora006
+Create Date: 2026-10-18 15:00:00.000000
+
+PATCH /occurrences/{id} só atualiza se a versão lida pelo cliente
+(If-Match) ainda for a atual, sem SELECT ... FOR UPDATE.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ora007'
+down_revision = 'ora006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ocorrencias', sa.Column('versao', sa.Numeric(10), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('ocorrencias', 'versao')
@@ -0,0 +1,40 @@
+"""Oracle - triage work queue columns and index on OCORRENCIAS
+
+Revision ID: ora008
+Revises: ora007
+Create Date: 2026-10-18 16:00:00.000000
+
+RESPONSAVEL_ID/LEASE_EXPIRA_EM marcam a ocorrência reservada por um
+investigador; lease vencido volta para a fila sem job de limpeza. O índice
+segue a ordem da fila (severidade, idade) para que a reserva leia só as
+primeiras entradas.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ora008'
+down_revision = 'ora007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('ocorrencias', sa.Column('responsavel_id', sa.Integer(), nullable=True))
+    op.add_column('ocorrencias', sa.Column('lease_expira_em', sa.TIMESTAMP(), nullable=True))
+    op.create_foreign_key('fk_ocorr_responsavel', 'ocorrencias', 'usuarios', ['responsavel_id'], ['id'])
+    op.execute("""
+        CREATE INDEX IDX_OCORR_FILA ON OCORRENCIAS (
+            STATUS,
+            CASE GRAU_SEVERIDADE WHEN 'critica' THEN 0 WHEN 'alta' THEN 1 WHEN 'media' THEN 2 ELSE 3 END,
+            DATA_CRIACAO,
+            ID
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IDX_OCORR_FILA')
+    op.drop_constraint('fk_ocorr_responsavel', 'ocorrencias', type_='foreignkey')
+    op.drop_column('ocorrencias', 'lease_expira_em')
+    op.drop_column('ocorrencias', 'responsavel_id')
@@ -3,9 +3,9 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Dict, Any
 
-from ...schemas.user_schemas import UserCreate, UserLogin, Token, ApiResponse, UserProfileUpdate
+from ...schemas.user_schemas import UserCreate, UserLogin, Token, ApiResponse, UserProfileUpdate, UserStatusUpdate
 from ...services.auth_service import auth_service
-from ...core.oracle_config import test_oracle_connection
+from ...core.oracle_config import oracle_manager, test_oracle_connection
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ security = HTTPBearer()
 async def health_check():
     """Verificar saúde da conexão Oracle"""
     try:
-        oracle_status = test_oracle_connection()
+        oracle_status = await oracle_manager.run_async(test_oracle_connection)
         
         return {
             "status": "healthy",
@@ -64,7 +64,7 @@ async def register_user(user_data: UserCreate):
         logger.info(f"🔐 Tentativa de registro: {user_data.email} - Tipo: {user_data.tipo_usuario}")
         
         # Registrar usuário
-        result = auth_service.register_user(user_data)
+        result = await auth_service.register_user_async(user_data)
         
         logger.info(f"✅ Registro bem-sucedido: {user_data.email}")
         
@@ -100,7 +100,7 @@ async def login_user(login_data: UserLogin):
         logger.info(f"🔐 Tentativa de login: {login_data.email}")
         
         # Autenticar usuário
-        result = auth_service.authenticate_user(login_data)
+        result = await auth_service.authenticate_user_async(login_data)
         
         logger.info(f"✅ Login bem-sucedido: {login_data.email}")
         
@@ -146,7 +146,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
                 headers={"WWW-Authenticate": "Bearer"}
             )
         
-        user = auth_service.get_user_by_email(user_email)
+        user = await auth_service.get_user_by_email_async(user_email)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -280,12 +280,12 @@ async def update_user_profile(
     try:
         # Verificar token
         token = credentials.credentials
-        user_data = auth_service.verify_access_token(token)
+        user_data = await auth_service.verify_access_token_async(token)
         
         logger.info(f"👤 Atualizando perfil do usuário {user_data['id']}")
         
         # Atualizar perfil
-        result = auth_service.update_user_profile(user_data['id'], profile_data)
+        result = await auth_service.update_user_profile_async(user_data['id'], profile_data)
         
         logger.info(f"✅ Perfil atualizado com sucesso: {user_data['id']}")
         
@@ -302,4 +302,46 @@ async def update_user_profile(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno ao atualizar perfil"
-        ) 
\ No newline at end of file
+        ) 
+
+@router.put("/users/{user_id}/status", response_model=ApiResponse)
+async def update_user_status(
+    user_id: int,
+    status_data: UserStatusUpdate,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Alterar status de um usuário (apenas administradores)
+    
+    **Status disponíveis:** `ativo`, `inativo`, `pendente`, `bloqueado`
+    
+    A alteração invalida o cache de autenticação do usuário imediatamente.
+    """
+    try:
+        token = credentials.credentials
+        admin_data = await auth_service.verify_access_token_async(token)
+        
+        if admin_data.get('tipo_usuario') != 'administrador':
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado. Apenas administradores podem alterar status de usuários"
+            )
+        
+        logger.info(f"👤 Administrador {admin_data['id']} alterando status do usuário {user_id}")
+        
+        result = await auth_service.update_user_status_async(user_id, status_data.status)
+        
+        return ApiResponse(
+            success=True,
+            message="Status do usuário atualizado com sucesso",
+            data=result
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro no endpoint de alteração de status: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao alterar status do usuário"
+        )
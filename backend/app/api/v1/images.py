@@ -0,0 +1,66 @@
+import re
+import logging
+from fastapi import APIRouter, HTTPException, status, Query, Request, Response
+from typing import Optional
+
+from ...core.file_responses import RangeFileResponse, RangeNotSatisfiable
+from ...services.image_service import image_service
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Router para servir imagens enviadas
+router = APIRouter(prefix="/images", tags=["Imagens"])
+
+# URL contém o SHA-256 do conteúdo: a resposta nunca muda
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+@router.api_route("/{digest}", methods=["GET", "HEAD"])
+async def get_image(
+    digest: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=16, le=4096, description="Largura desejada (arredondada para um tamanho padrão)")
+):
+    """
+    Servir imagem por hash: original ou variante WebP redimensionada (`w`)
+    
+    Suporta Range e If-None-Match. Público: a URL contém o hash do conteúdo,
+    impossível de adivinhar, como nos links usados pelo aplicativo.
+    """
+    if not DIGEST_PATTERN.match(digest):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Imagem não encontrada")
+    
+    if w is None:
+        original = image_service.original(digest)
+        if original is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Imagem não encontrada")
+        path, media_type, etag = original["path"], original["content_type"], f'"{digest}"'
+    else:
+        path = await image_service.get_variant(digest, w)
+        if path is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Imagem não encontrada")
+        media_type, etag = "image/webp", f'"{digest}-{image_service.width_bucket(w)}"'
+    
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if request.headers.get("if-none-match") in (etag, "*"):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    # If-Range com outra ETag: enviar o arquivo inteiro
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range != etag:
+        range_header = None
+    
+    try:
+        return RangeFileResponse(path, range_header=range_header, media_type=media_type, headers=headers)
+    except RangeNotSatisfiable as e:
+        # Content-Range com o tamanho real, para o cliente refazer o pedido (RFC 9110)
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Intervalo solicitado fora do arquivo",
+            headers={"Content-Range": f"bytes */{e.size}"}
+        )
+    except FileNotFoundError:
+        # Variante descartada do cache por outro processo entre a checagem e o envio
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Imagem não encontrada")
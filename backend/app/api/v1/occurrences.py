@@ -1,15 +1,27 @@
 import logging
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from datetime import date
 
 from ...schemas.occurrence_schemas import (
     OccurrenceCreate, 
+    OccurrenceBatchCreate,
+    OccurrenceUpdate,
+    QueueRelease,
     OccurrenceResponse, 
-    ApiResponse
+    ApiResponse,
+    PaginatedApiResponse,
+    SyncApiResponse,
+    StatusOcorrencia,
+    TipoOcorrencia
 )
-from ...services.occurrence_service import occurrence_service
+from ...services.occurrence_service import occurrence_service, occurrence_etag
+from ...services.cluster_service import cluster_service, MAX_ZOOM
 from ...services.auth_service import auth_service
+from ...services.image_service import image_service
+from ...core.config import settings
+from ...core.responses import unvalidated_response
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
@@ -20,11 +32,14 @@ router = APIRouter(prefix="/occurrences", tags=["Ocorrências"])
 # Security scheme
 security = HTTPBearer()
 
+# Perfis que fazem a triagem (mudança de status e notas) das ocorrências
+TRIAGE_ROLES = {"administrador", "lider_territorial", "monitor_ambiental"}
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependência para autenticação JWT"""
     try:
         token = credentials.credentials
-        user_data = auth_service.verify_access_token(token)
+        user_data = await auth_service.verify_access_token_async(token)
         return user_data
     except Exception as e:
         logger.error(f"❌ Erro na autenticação: {e}")
@@ -34,6 +49,44 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             headers={"WWW-Authenticate": "Bearer"}
         )
 
+def visible_owner(current_user: Dict[str, Any]) -> Optional[int]:
+    """Dono cujas ocorrências o usuário pode listar (None = todos, para a triagem)"""
+    if current_user.get('tipo_usuario') in TRIAGE_ROLES:
+        return None
+    return current_user['id']
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Verificar If-None-Match contra a ETag atual"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in [value.strip() for value in header.split(",")]
+
+def parse_if_match(if_match: str, occurrence_id: int) -> int:
+    """Extrair a versão de um If-Match no formato da ETag de ocorrência"""
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        etag_id, versao = value.strip('"').split("-")
+        if int(etag_id) != occurrence_id:
+            raise ValueError
+        return int(versao)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match não corresponde a esta ocorrência"
+        )
+
+def not_modified(etag: str) -> Response:
+    """Resposta 304 sem corpo"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+    )
+
 @router.post("/", response_model=ApiResponse)
 async def create_occurrence(
     occurrence_data: OccurrenceCreate,
@@ -60,7 +113,7 @@ async def create_occurrence(
         logger.info(f"🚨 Nova ocorrência sendo criada por usuário {current_user['id']}: {occurrence_data.tipo_ocorrencia}")
         
         # Criar ocorrência
-        result = occurrence_service.create_occurrence(occurrence_data, current_user['id'])
+        result = await occurrence_service.create_occurrence_async(occurrence_data, current_user['id'])
         
         logger.info(f"✅ Ocorrência criada com sucesso: ID {result['data']['id']}")
         
@@ -79,22 +132,137 @@ async def create_occurrence(
             detail="Erro interno ao criar ocorrência"
         )
 
-@router.get("/", response_model=ApiResponse)
+@router.post("/batch", response_model=ApiResponse)
+async def create_occurrences_batch(
+    batch: OccurrenceBatchCreate,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Sincronizar ocorrências registradas offline
+    
+    Cada item segue o formato de criação acrescido de `chave_idempotencia`
+    (gerada no aplicativo). Reenviar o mesmo lote não duplica ocorrências.
+    
+    **Status por item:**
+    - `criada`: ocorrência gravada agora
+    - `existente`: chave já sincronizada antes (retorna o ID original)
+    - `invalida`: item não passou na validação (ver `erros`)
+    - `duplicada`: chave repetida dentro do próprio lote
+    - `erro`: rejeitado pelo banco
+    """
+    try:
+        logger.info(f"📦 Lote de {len(batch.items)} ocorrências do usuário {current_user['id']}")
+        
+        result = await occurrence_service.create_occurrences_batch_async(batch.items, current_user['id'])
+        
+        return ApiResponse(
+            success=result["falhas"] == 0,
+            message=(
+                f"Lote processado: {result['criadas']} criadas, "
+                f"{result['existentes']} já existentes, {result['falhas']} com falha"
+            ),
+            data=result
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro no endpoint de lote de ocorrências: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao sincronizar ocorrências"
+        )
+
+@router.post("/queue/claim", response_model=ApiResponse)
+async def claim_occurrences(
+    quantidade: int = Query(5, ge=1, le=settings.QUEUE_MAX_CLAIM, description="Quantas ocorrências reservar"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Reservar as próximas ocorrências reportadas para triagem (mais severas e antigas primeiro)
+    
+    A reserva expira em `lease_expira_em`; depois disso a ocorrência volta
+    para a fila se ainda estiver como reportada.
+    """
+    try:
+        if current_user.get('tipo_usuario') not in TRIAGE_ROLES:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado. Apenas a equipe de triagem usa a fila"
+            )
+        
+        occurrences = await occurrence_service.claim_occurrences_async(current_user['id'], quantidade)
+        
+        return ApiResponse(
+            success=True,
+            message=f"{len(occurrences)} ocorrências reservadas",
+            data=occurrences
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao reservar ocorrências da fila: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao reservar ocorrências"
+        )
+
+@router.post("/queue/release", response_model=ApiResponse)
+async def release_occurrences(
+    release: QueueRelease,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Devolver à fila ocorrências reservadas pelo usuário
+    """
+    try:
+        released = await occurrence_service.release_occurrences_async(current_user['id'], release.ids)
+        
+        return ApiResponse(
+            success=True,
+            message=f"{released} ocorrências devolvidas à fila",
+            data={"liberadas": released}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao devolver ocorrências à fila: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao devolver ocorrências"
+        )
+
+@router.get("/", response_model=PaginatedApiResponse)
 async def get_user_occurrences(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description="Itens por página (máximo MAX_PAGE_SIZE)"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Buscar todas as ocorrências do usuário autenticado
+    Buscar ocorrências do usuário autenticado, paginadas por cursor
+    
+    Responde com ETag; com If-None-Match igual e nada alterado, devolve 304.
     """
     try:
         logger.info(f"📋 Buscando ocorrências do usuário {current_user['id']}")
         
-        occurrences = occurrence_service.get_user_occurrences(current_user['id'])
+        etag = await occurrence_service.get_user_occurrences_etag_async(current_user['id'], "list", limit, cursor)
+        if etag_matches(request, etag):
+            return not_modified(etag)
         
-        return ApiResponse(
+        page = await occurrence_service.get_user_occurrences_async(current_user['id'], limit, cursor)
+        occurrences = page['items']
+        
+        return unvalidated_response(
+            PaginatedApiResponse,
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"},
             success=True,
             message=f"Encontradas {len(occurrences)} ocorrências",
-            data=occurrences
+            data=occurrences,
+            next_cursor=page['next_cursor']
         )
         
     except HTTPException:
@@ -106,12 +274,56 @@ async def get_user_occurrences(
             detail="Erro interno ao buscar ocorrências"
         )
 
-@router.get("/all", response_model=ApiResponse)
+@router.get("/changes", response_model=SyncApiResponse)
+async def get_occurrence_changes(
+    request: Request,
+    since: Optional[str] = Query(None, description="Marca next_since da sincronização anterior (vazio: desde o início)"),
+    limit: Optional[int] = Query(None, ge=1, description="Itens por página (máximo MAX_PAGE_SIZE)"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Sincronização incremental: ocorrências do usuário criadas ou alteradas após `since`
+    
+    Ocorrências descartadas voltam em `removidas` (apenas id e data). Repetir
+    com `next_since` enquanto `has_more` for verdadeiro. Sem alterações e com
+    If-None-Match igual à ETag anterior, devolve 304.
+    """
+    try:
+        etag = await occurrence_service.get_user_occurrences_etag_async(
+            current_user['id'], "changes", since, limit, settled=True
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        changes = await occurrence_service.get_user_occurrence_changes_async(current_user['id'], since, limit)
+        
+        return unvalidated_response(
+            SyncApiResponse,
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+            success=True,
+            message=f"{len(changes['alteradas'])} alteradas, {len(changes['removidas'])} removidas",
+            data={"alteradas": changes["alteradas"], "removidas": changes["removidas"]},
+            next_since=changes["next_since"],
+            has_more=changes["has_more"]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao buscar alterações de ocorrências: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao buscar alterações"
+        )
+
+@router.get("/all", response_model=PaginatedApiResponse)
 async def get_all_occurrences(
+    limit: Optional[int] = Query(None, ge=1, description="Itens por página (máximo MAX_PAGE_SIZE)"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Buscar todas as ocorrências do sistema (apenas administradores)
+    Buscar todas as ocorrências do sistema, paginadas por cursor (apenas administradores)
     """
     try:
         # Verificar se usuário é administrador
@@ -123,12 +335,15 @@ async def get_all_occurrences(
         
         logger.info(f"📋 Administrador {current_user['id']} buscando todas as ocorrências")
         
-        occurrences = occurrence_service.get_all_occurrences()
+        page = await occurrence_service.get_all_occurrences_async(limit, cursor)
+        occurrences = page['items']
         
-        return ApiResponse(
+        return unvalidated_response(
+            PaginatedApiResponse,
             success=True,
             message=f"Encontradas {len(occurrences)} ocorrências no sistema",
-            data=occurrences
+            data=occurrences,
+            next_cursor=page['next_cursor']
         )
         
     except HTTPException:
@@ -140,6 +355,165 @@ async def get_all_occurrences(
             detail="Erro interno ao buscar ocorrências"
         )
 
+@router.get("/search", response_model=PaginatedApiResponse)
+async def search_occurrences(
+    q: str = Query(..., min_length=2, max_length=200, description="Palavras a buscar na descrição e na localização"),
+    status_filtro: Optional[StatusOcorrencia] = Query(None, alias="status", description="Filtrar por status"),
+    tipo_ocorrencia: Optional[TipoOcorrencia] = Query(None, description="Filtrar por tipo"),
+    limit: Optional[int] = Query(None, ge=1, description="Itens por página (máximo MAX_PAGE_SIZE)"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Buscar ocorrências por palavras-chave, das mais relevantes para as menos (apenas administradores)
+    
+    A busca ignora acentos e maiúsculas e encontra variações da palavra
+    (ex.: "queimada" também encontra "queimadas").
+    """
+    try:
+        if current_user.get('tipo_usuario') != 'administrador':
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado. Apenas administradores podem buscar ocorrências"
+            )
+        
+        page = await occurrence_service.search_occurrences_async(
+            q,
+            limit,
+            cursor,
+            status_filtro.value if status_filtro else None,
+            tipo_ocorrencia.value if tipo_ocorrencia else None
+        )
+        occurrences = page['items']
+        
+        return unvalidated_response(
+            PaginatedApiResponse,
+            success=True,
+            message=f"Encontradas {len(occurrences)} ocorrências para a busca",
+            data=occurrences,
+            next_cursor=page['next_cursor']
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro na busca de ocorrências: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao buscar ocorrências"
+        )
+
+@router.get("/bbox", response_model=ApiResponse)
+async def get_occurrences_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90, description="Latitude sul"),
+    min_lng: float = Query(..., ge=-180, le=180, description="Longitude oeste"),
+    max_lat: float = Query(..., ge=-90, le=90, description="Latitude norte"),
+    max_lng: float = Query(..., ge=-180, le=180, description="Longitude leste (pode ser < min_lng no antimeridiano)"),
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de itens (até MAX_PAGE_SIZE)"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Buscar ocorrências dentro da área visível do mapa, mais recentes primeiro
+    
+    Perfis de triagem veem as ocorrências de todos; os demais, só as próprias.
+    """
+    try:
+        if min_lat > max_lat:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="min_lat deve ser menor ou igual a max_lat"
+            )
+        
+        occurrences = await occurrence_service.get_occurrences_in_bbox_async(
+            min_lat, min_lng, max_lat, max_lng, limit, visible_owner(current_user)
+        )
+        
+        return unvalidated_response(
+            ApiResponse,
+            success=True,
+            message=f"Encontradas {len(occurrences)} ocorrências na área",
+            data=occurrences
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao buscar ocorrências por área: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao buscar ocorrências"
+        )
+
+@router.get("/clusters", response_model=ApiResponse)
+async def get_occurrence_clusters(
+    min_lat: float = Query(..., ge=-90, le=90, description="Latitude sul"),
+    min_lng: float = Query(..., ge=-180, le=180, description="Longitude oeste"),
+    max_lat: float = Query(..., ge=-90, le=90, description="Latitude norte"),
+    max_lng: float = Query(..., ge=-180, le=180, description="Longitude leste (pode ser < min_lng no antimeridiano)"),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM, description="Nível de zoom do mapa"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Clusters de ocorrências da área visível (centróide e contagens por tipo e severidade)
+    """
+    try:
+        if min_lat > max_lat:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="min_lat deve ser menor ou igual a max_lat"
+            )
+        
+        clusters = await cluster_service.get_clusters_async(min_lat, min_lng, max_lat, max_lng, zoom)
+        
+        return ApiResponse(
+            success=True,
+            message=f"{len(clusters['clusters'])} clusters com {clusters['total']} ocorrências",
+            data=clusters
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao buscar clusters de ocorrências: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao buscar clusters"
+        )
+
+@router.get("/near", response_model=ApiResponse)
+async def get_occurrences_near(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude do ponto"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude do ponto"),
+    raio_km: float = Query(5.0, gt=0, le=500, description="Raio em quilômetros"),
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de itens (até MAX_PAGE_SIZE)"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Buscar ocorrências num raio a partir de um ponto, da mais próxima para a mais distante
+    
+    Perfis de triagem veem as ocorrências de todos; os demais, só as próprias.
+    """
+    try:
+        occurrences = await occurrence_service.get_occurrences_near_async(
+            lat, lng, raio_km, limit, visible_owner(current_user)
+        )
+        
+        return unvalidated_response(
+            ApiResponse,
+            success=True,
+            message=f"Encontradas {len(occurrences)} ocorrências em {raio_km} km",
+            data=occurrences
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao buscar ocorrências próximas: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao buscar ocorrências"
+        )
+
 @router.get("/stats", response_model=ApiResponse)
 async def get_occurrence_stats(
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -150,28 +524,7 @@ async def get_occurrence_stats(
     try:
         logger.info(f"📊 Buscando estatísticas de ocorrências para usuário {current_user['id']}")
         
-        occurrences = occurrence_service.get_user_occurrences(current_user['id'])
-        
-        # Calcular estatísticas
-        stats = {
-            "total": len(occurrences),
-            "por_tipo": {},
-            "por_severidade": {},
-            "por_status": {}
-        }
-        
-        for occ in occurrences:
-            # Por tipo
-            tipo = occ['tipo_ocorrencia']
-            stats['por_tipo'][tipo] = stats['por_tipo'].get(tipo, 0) + 1
-            
-            # Por severidade
-            severidade = occ['grau_severidade']
-            stats['por_severidade'][severidade] = stats['por_severidade'].get(severidade, 0) + 1
-            
-            # Por status
-            status_occ = occ['status']
-            stats['por_status'][status_occ] = stats['por_status'].get(status_occ, 0) + 1
+        stats = await occurrence_service.get_occurrence_stats_async(usuario_id=current_user['id'])
         
         return ApiResponse(
             success=True,
@@ -186,4 +539,213 @@ async def get_occurrence_stats(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno ao calcular estatísticas"
-        ) 
\ No newline at end of file
+        )
+
+@router.get("/stats/all", response_model=ApiResponse)
+async def get_all_occurrence_stats(
+    data_inicio: Optional[date] = Query(None, description="Data inicial (inclusiva)"),
+    data_fim: Optional[date] = Query(None, description="Data final (inclusiva)"),
+    territorio_id: Optional[int] = Query(None, description="Filtrar pelo território do autor"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Obter estatísticas de todas as ocorrências do sistema (apenas administradores)
+    """
+    try:
+        if current_user.get('tipo_usuario') != 'administrador':
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado. Apenas administradores podem ver estatísticas gerais"
+            )
+        
+        logger.info(f"📊 Administrador {current_user['id']} buscando estatísticas gerais")
+        
+        stats = await occurrence_service.get_occurrence_stats_async(
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            territorio_id=territorio_id
+        )
+        
+        return ApiResponse(
+            success=True,
+            message="Estatísticas calculadas com sucesso",
+            data=stats
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao calcular estatísticas gerais: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao calcular estatísticas"
+        )
+
+@router.get("/stats/territorios", response_model=ApiResponse)
+async def get_territory_occurrence_counts(
+    data_inicio: Optional[date] = Query(None, description="Data inicial (inclusiva)"),
+    data_fim: Optional[date] = Query(None, description="Data final (inclusiva)"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Contagem de ocorrências por território (apenas administradores)
+    
+    Servida do cache de agregados: pode refletir dados de alguns segundos atrás.
+    """
+    try:
+        if current_user.get('tipo_usuario') != 'administrador':
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado. Apenas administradores podem ver estatísticas gerais"
+            )
+        
+        territorios = await occurrence_service.get_territory_counts_async(data_inicio, data_fim)
+        
+        return ApiResponse(
+            success=True,
+            message=f"Contagens de {len(territorios)} territórios",
+            data=territorios
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao contar ocorrências por território: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao calcular estatísticas"
+        )
+
+@router.get("/{occurrence_id}", response_model=ApiResponse)
+async def get_occurrence(
+    occurrence_id: int,
+    request: Request,
+    response: Response,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Buscar uma ocorrência (autor ou equipe de triagem), com ETag para o PATCH
+    """
+    try:
+        occurrence = await occurrence_service.get_occurrence_async(occurrence_id)
+        
+        if occurrence['usuario_id'] != current_user['id'] and current_user.get('tipo_usuario') not in TRIAGE_ROLES:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado a esta ocorrência"
+            )
+        
+        etag = occurrence_etag(occurrence_id, occurrence['versao'])
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        
+        return ApiResponse(
+            success=True,
+            message="Ocorrência encontrada",
+            data=occurrence
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao buscar ocorrência {occurrence_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao buscar ocorrência"
+        )
+
+@router.patch("/{occurrence_id}", response_model=ApiResponse)
+async def update_occurrence(
+    occurrence_id: int,
+    update: OccurrenceUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Atualizar status e notas de uma ocorrência (equipe de triagem)
+    
+    Envie a ETag lida em `If-Match` (ou `versao` no corpo). Se outra pessoa
+    alterou a ocorrência nesse meio tempo, a resposta é 412 com a ETag atual.
+    
+    **Fluxo de status:** reportada → investigando → confirmada → resolvida;
+    qualquer etapa ativa pode ir para descartada; resolvida e descartada
+    podem voltar para investigando.
+    """
+    try:
+        if current_user.get('tipo_usuario') not in TRIAGE_ROLES:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado. Apenas a equipe de triagem pode atualizar ocorrências"
+            )
+        
+        if if_match:
+            versao = parse_if_match(if_match, occurrence_id)
+        elif update.versao is not None:
+            versao = update.versao
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+                detail="Informe a versão lida no cabeçalho If-Match ou no campo versao"
+            )
+        
+        logger.info(f"📝 Usuário {current_user['id']} atualizando ocorrência {occurrence_id} (versão {versao})")
+        
+        occurrence = await occurrence_service.update_occurrence_async(occurrence_id, update, versao)
+        response.headers["ETag"] = occurrence_etag(occurrence_id, occurrence['versao'])
+        
+        return ApiResponse(
+            success=True,
+            message="Ocorrência atualizada com sucesso",
+            data=occurrence
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao atualizar ocorrência {occurrence_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao atualizar ocorrência"
+        )
+
+@router.post("/{occurrence_id}/images", response_model=ApiResponse)
+async def upload_occurrence_image(
+    occurrence_id: int,
+    request: Request,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Enviar uma foto da ocorrência (multipart/form-data, campo `file`)
+    
+    O arquivo é gravado em disco conforme chega; miniatura e versão WebP são
+    geradas fora do processo da API e a URL é anexada à ocorrência.
+    """
+    try:
+        occurrence = await occurrence_service.get_occurrence_async(occurrence_id)
+        if occurrence['usuario_id'] != current_user['id'] and current_user.get('tipo_usuario') not in TRIAGE_ROLES:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado a esta ocorrência"
+            )
+        
+        stored = await image_service.receive_multipart(request)
+        image = await image_service.process(stored)
+        attached = await occurrence_service.attach_images_async(occurrence_id, [image['url']])
+        
+        return ApiResponse(
+            success=True,
+            message="Imagem enviada com sucesso",
+            data={**image, **attached}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro no upload de imagem da ocorrência {occurrence_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao enviar imagem"
+        )
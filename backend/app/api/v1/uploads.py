@@ -0,0 +1,155 @@
+import logging
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response, Header
+from typing import Dict, Any, Optional
+from starlette.concurrency import run_in_threadpool
+
+from ...schemas.occurrence_schemas import ApiResponse
+from ...services.occurrence_service import occurrence_service
+from ...services.image_service import image_service
+from ...services.upload_service import resumable_uploads
+from .occurrences import get_current_user, TRIAGE_ROLES
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Router para uploads retomáveis (protocolo no estilo tus 1.0)
+router = APIRouter(prefix="/uploads", tags=["Uploads"])
+
+TUS_VERSION = "1.0.0"
+TUS_CONTENT_TYPE = "application/offset+octet-stream"
+
+def upload_headers(upload: Dict[str, Any]) -> Dict[str, str]:
+    """Cabeçalhos de progresso de um upload"""
+    return {
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(upload["offset"]),
+        "Upload-Length": str(upload["length"]),
+        "Cache-Control": "no-store"
+    }
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_upload(
+    request: Request,
+    occurrence_id: int = Query(..., description="Ocorrência que receberá a imagem"),
+    upload_length: int = Header(..., description="Tamanho total do arquivo em bytes"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Iniciar upload retomável de uma foto da ocorrência
+    
+    Devolve em `Location` a URL para enviar os bytes com PATCH.
+    """
+    try:
+        occurrence = await occurrence_service.get_occurrence_async(occurrence_id)
+        if occurrence['usuario_id'] != current_user['id'] and current_user.get('tipo_usuario') not in TRIAGE_ROLES:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Acesso negado a esta ocorrência"
+            )
+        
+        upload_id = await run_in_threadpool(
+            resumable_uploads.create, occurrence_id, current_user['id'], upload_length
+        )
+        
+        return Response(
+            status_code=status.HTTP_201_CREATED,
+            headers={
+                "Location": f"{request.url.path.rstrip('/')}/{upload_id}",
+                "Tus-Resumable": TUS_VERSION,
+                "Upload-Offset": "0"
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao criar upload: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao criar upload"
+        )
+
+@router.api_route("/{upload_id}", methods=["HEAD"])
+async def get_upload_offset(
+    upload_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Consultar quantos bytes do upload já foram recebidos (Upload-Offset)
+    
+    Upload concluído responde com Upload-Offset igual a Upload-Length até
+    expirar; o resultado vem repetindo o PATCH final (corpo vazio).
+    """
+    upload = await run_in_threadpool(resumable_uploads.get, upload_id, current_user['id'])
+    return Response(status_code=status.HTTP_200_OK, headers=upload_headers(upload))
+
+@router.patch("/{upload_id}")
+async def append_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., description="Offset em que estes bytes começam"),
+    content_type: Optional[str] = Header(None),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Enviar bytes do upload a partir de `Upload-Offset`
+    
+    Responde 204 com o novo offset. Quando o último byte chega, a imagem é
+    processada, anexada à ocorrência e a resposta é 200 com os dados dela.
+    """
+    try:
+        if content_type != TUS_CONTENT_TYPE:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Content-Type deve ser {TUS_CONTENT_TYPE}"
+            )
+        
+        upload = await resumable_uploads.append(upload_id, current_user['id'], upload_offset, request.stream())
+        headers = upload_headers(upload)
+        
+        if not upload["completo"]:
+            return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+        
+        # PATCH final repetido (cliente perdeu a resposta): mesmo desfecho
+        if "erro" in upload:
+            raise HTTPException(**upload["erro"])
+        
+        resultado = upload.get("resultado")
+        if resultado is None:
+            stored = await run_in_threadpool(resumable_uploads.complete, upload_id)
+            try:
+                image = await image_service.process(stored)
+            except HTTPException as e:
+                # Arquivo inválido é definitivo; sobrecarga (503) pode ser repetida,
+                # pois o original continua armazenado
+                if e.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE:
+                    await run_in_threadpool(
+                        resumable_uploads.record_outcome, upload_id,
+                        erro={"status_code": e.status_code, "detail": e.detail}
+                    )
+                raise
+            attached = await occurrence_service.attach_images_async(upload["occurrence_id"], [image['url']])
+            resultado = {**image, **attached}
+            await run_in_threadpool(resumable_uploads.record_outcome, upload_id, resultado=resultado)
+            
+            logger.info(f"✅ Upload {upload_id} concluído e anexado à ocorrência {upload['occurrence_id']}")
+        
+        response = ApiResponse(
+            success=True,
+            message="Imagem enviada com sucesso",
+            data=resultado
+        )
+        return Response(
+            content=response.model_dump_json(),
+            media_type="application/json",
+            headers=headers
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro no upload {upload_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao receber upload"
+        )
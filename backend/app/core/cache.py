@@ -0,0 +1,200 @@
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Cache em memória com expiração por TTL e despejo LRU, seguro entre threads
+
+    Para não regravar um valor invalidado durante a carga, tome `snapshot()`
+    antes de ler a origem e passe-o em `set(..., generation=...)`: se houve
+    invalidação no meio, o valor é descartado.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_discards = 0
+        self._generation = 0
+
+    def snapshot(self) -> int:
+        """Geração atual (muda a cada invalidação)"""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Obter valor válido ou `default`, atualizando a ordem LRU"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None):
+        """Armazenar valor, despejando o menos usado se o cache estiver cheio
+
+        Com `generation` (de snapshot()), não grava se houve invalidação desde então.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.stale_discards += 1
+                return
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remover uma chave; retorna True se ela existia"""
+        with self._lock:
+            # Mesmo sem a chave: uma carga em andamento pode estar para gravá-la
+            self._generation += 1
+            if self._data.pop(key, None) is None:
+                return False
+            self.invalidations += 1
+            return True
+
+    def clear(self):
+        """Esvaziar o cache"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de acerto/erro do cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_discards": self.stale_discards,
+            }
+
+
+class StaleWhileRevalidateCache:
+    """Cache assíncrono que serve o valor na hora e o renova em segundo plano
+
+    Até `soft_ttl` o valor é servido como está. Entre `soft_ttl` e `hard_ttl`
+    ainda é servido, e uma tarefa em segundo plano recarrega a chave. Passado
+    `hard_ttl` (ou sem valor) a chamada aguarda a carga. Cargas da mesma chave
+    são agrupadas. Usar só no event loop (sem trava entre threads).
+    """
+
+    def __init__(self, name: str, maxsize: int, soft_ttl: float, hard_ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._loads = SingleFlight(name)
+        self._refreshing: Set[Hashable] = set()
+        self._tasks: Set["asyncio.Task"] = set()
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Valor da chave, carregado com `loader()` quando ausente ou expirado"""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, loaded_at = entry
+            age = time.monotonic() - loaded_at
+            if age < self.soft_ttl:
+                self._data.move_to_end(key)
+                self.fresh_hits += 1
+                return value
+            if age < self.hard_ttl:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                self._schedule_refresh(key, loader)
+                return value
+
+        self.misses += 1
+        return await self._loads.run(key, self._load, key, loader)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self.refreshes += 1
+        task = asyncio.ensure_future(self._refresh(key, loader))
+        # Manter referência até terminar (o event loop guarda só referência fraca)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        try:
+            await self._loads.run(key, self._load, key, loader)
+        except Exception as e:
+            # Segue servindo o valor antigo até hard_ttl; a próxima leitura tenta de novo
+            self.refresh_errors += 1
+            logger.warning(f"⚠️ Falha ao renovar cache {self.name} em segundo plano: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remover uma chave; retorna True se ela existia"""
+        return self._data.pop(key, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de acerto (fresco/antigo), cargas e renovações"""
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "soft_ttl_seconds": self.soft_ttl,
+            "hard_ttl_seconds": self.hard_ttl,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.fresh_hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refreshes_in_flight": len(self._refreshing),
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "evictions": self.evictions,
+            "loads_coalesced": self._loads.coalesced,
+        }
@@ -19,6 +19,23 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing (bcrypt em pool de processos)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    
+    # Startup: "full" verifica todas as tabelas, "marker" confia na revisão
+    # registrada em ALEMBIC_VERSION quando ela confere, "skip" não verifica nada
+    SCHEMA_CHECK_MODE: str = "marker"
+    
+    # GET /metrics (somente administradores); False desliga o endpoint
+    METRICS_ENABLED: bool = True
+    
+    # Compressão de respostas (gzip, ou brotli se instalado) acima do limite
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
 
@@ -55,10 +72,33 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
+    # Sincronização offline (POST /occurrences/batch)
+    MAX_BATCH_SIZE: int = 500
+    
+    # Fila de triagem (POST /occurrences/queue/claim)
+    QUEUE_LEASE_SECONDS: int = 900
+    QUEUE_MAX_CLAIM: int = 20
+    
+    # Agregados dos painéis (stale-while-revalidate): até o soft TTL o valor é
+    # servido como está; até o hard TTL é servido e renovado em segundo plano
+    STATS_CACHE_SOFT_TTL_SECONDS: int = 15
+    STATS_CACHE_HARD_TTL_SECONDS: int = 120
+    STATS_CACHE_MAXSIZE: int = 256
+    
     # File Upload
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_FILE_TYPES: List[str] = ["image/jpeg", "image/png", "image/gif"]
     
+    # Imagens enviadas (armazenamento local por hash de conteúdo)
+    UPLOAD_DIR: str = "uploads"
+    IMAGE_WORKERS: int = 2
+    IMAGE_MAX_PENDING: int = 16
+    IMAGE_VARIANT_WIDTHS: List[int] = [320, 1280]
+    MAX_IMAGES_PER_OCCURRENCE: int = 10
+    RESUMABLE_UPLOAD_EXPIRATION_HOURS: int = 24
+    IMAGE_WIDTH_BUCKETS: List[int] = [160, 320, 640, 960, 1280, 1920]
+    IMAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # 512MB de variantes em disco
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,100 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+class DiskLRU:
+    """Arquivos derivados em disco com limite de tamanho total e descarte LRU
+
+    A ordem de uso vive em memória (por processo) e é reconstruída pelo mtime
+    dos arquivos na primeira chamada; cada acesso atualiza o mtime para que a
+    ordem sobreviva a reinícios. Arquivos descartados por outro processo são
+    tratados como ausentes e gerados de novo.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: Optional[OrderedDict] = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _load(self):
+        """Indexar os arquivos existentes, do menos para o mais recente"""
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+
+        self._entries = OrderedDict((path, size) for _, path, size in sorted(files))
+        self._size = sum(self._entries.values())
+
+    def get(self, path: str) -> bool:
+        """Verificar se o arquivo está no cache, marcando-o como usado"""
+        with self._lock:
+            if self._entries is None:
+                self._load()
+
+            if path in self._entries and os.path.exists(path):
+                self._entries.move_to_end(path)
+                self._hits += 1
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    pass
+                return True
+
+            if path in self._entries:
+                self._size -= self._entries.pop(path)
+            self._misses += 1
+            return False
+
+    def add(self, path: str):
+        """Registrar arquivo recém-gerado e descartar os menos usados acima do limite"""
+        with self._lock:
+            if self._entries is None:
+                self._load()
+
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                return
+
+            if path in self._entries:
+                self._size -= self._entries.pop(path)
+            self._entries[path] = size
+            self._size += size
+
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                old_path, old_size = self._entries.popitem(last=False)
+                self._size -= old_size
+                self._evictions += 1
+                try:
+                    os.unlink(old_path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas do cache"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "files": len(self._entries) if self._entries is not None else None,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / total, 4) if total else 0.0,
+                "evictions": self._evictions,
+            }
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(RuntimeError):
+    """Fila do executor está cheia e a tarefa foi recusada"""
+
+
+class BoundedExecutor:
+    """Executor com número limitado de workers para tirar trabalho bloqueante do event loop"""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[..., Executor],
+        max_workers: int,
+        max_pending: Optional[int] = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        """Executor subjacente, criado sob demanda"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self._factory(max_workers=self.max_workers)
+                    logger.info(f"🧵 Executor {self.name} iniciado com {self.max_workers} workers")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Executar função bloqueante no executor e aguardar o resultado"""
+        with self._lock:
+            if self.max_pending is not None and self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ExecutorSaturated(f"Executor {self.name} saturado ({self._pending} tarefas pendentes)")
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores do executor para monitoramento"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Encerrar o executor subjacente"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
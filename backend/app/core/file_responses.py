@@ -0,0 +1,108 @@
+import os
+from typing import Optional, Tuple, Mapping
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """Range fora do tamanho do arquivo (HTTP 416)"""
+
+    def __init__(self, header: str, size: int):
+        super().__init__(header)
+        self.size = size
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Intervalo (início, fim inclusivo) de um cabeçalho Range de um só trecho
+
+    Retorna None para servir o arquivo inteiro (sem Range, múltiplos trechos
+    ou sintaxe inválida, como permite a RFC 9110).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text == "":
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise RangeNotSatisfiable(header, size)
+            return max(0, size - suffix), size - 1
+        start = int(start_text)
+        end = min(int(end_text), size - 1) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(header, size)
+    return start, end
+
+
+class RangeFileResponse(Response):
+    """Resposta de arquivo com Range (206) e envio zero-copy quando disponível
+
+    Usa a extensão ASGI `http.response.zerocopysend` (sendfile) se o servidor
+    a oferecer; senão lê o trecho em blocos numa thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        range_header: Optional[str] = None,
+        media_type: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        self.path = path
+        self.media_type = media_type
+        self.background = None
+
+        size = os.stat(path).st_size
+        byte_range = parse_range(range_header, size)
+        if byte_range is None:
+            self.status_code = 200
+            self.start, self.length = 0, size
+        else:
+            self.status_code = 206
+            self.start, self.length = byte_range[0], byte_range[1] - byte_range[0] + 1
+
+        self.init_headers(headers)
+        self.headers["content-length"] = str(self.length)
+        self.headers["accept-ranges"] = "bytes"
+        if byte_range is not None:
+            self.headers["content-range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        if scope.get("method", "GET").upper() == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.start,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+
+        async with await anyio.open_file(self.path, "rb") as file:
+            await file.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+        if remaining > 0:
+            # Arquivo encolheu durante o envio: encerrar o corpo
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
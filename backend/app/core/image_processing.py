@@ -0,0 +1,107 @@
+import os
+import warnings
+from typing import Dict, Any, List
+
+from PIL import Image, ImageOps
+
+# Limite de pixels por imagem: acima disso Pillow levanta DecompressionBombError
+# (o aviso intermediário também vira erro nos workers)
+Image.MAX_IMAGE_PIXELS = 25_000_000
+warnings.simplefilter("error", Image.DecompressionBombWarning)
+
+WEBP_QUALITY = 80
+
+# Tag EXIF de orientação (aplicada por exif_transpose nas variantes)
+EXIF_ORIENTATION = 0x0112
+
+# Tipo MIME -> formato Pillow aceito no upload
+PIL_FORMATS = {
+    "image/jpeg": "JPEG",
+    "image/png": "PNG",
+    "image/gif": "GIF",
+    "image/webp": "WEBP",
+}
+
+# Assinaturas (magic bytes) dos formatos aceitos
+SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+SNIFF_BYTES = 12
+
+
+def sniff_content_type(head: bytes) -> str:
+    """Tipo MIME pelos primeiros bytes do arquivo (None se desconhecido)"""
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _save_webp(image: Image.Image, dest_path: str):
+    """Gravar WebP de forma atômica (arquivo temporário + rename)"""
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    image.save(tmp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+    os.replace(tmp_path, dest_path)
+
+
+def _open_for_resize(source_path: str, max_width: int) -> Image.Image:
+    """Abrir imagem já orientada (EXIF), decodificando JPEG em escala reduzida"""
+    image = Image.open(source_path)
+    # JPEG: decodifica direto numa escala 1/2, 1/4 ou 1/8 próxima do necessário
+    image.draft("RGB", (max_width, max_width))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    return image
+
+
+def _resize_to_width(image: Image.Image, width: int) -> Image.Image:
+    """Reduzir para a largura indicada (nunca amplia)"""
+    if image.width <= width:
+        return image
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def build_variants(source_path: str, variants_dir: str, widths: List[int], content_type: str) -> Dict[str, Any]:
+    """Validar a imagem e gerar as variantes WebP (executado no pool de processos)
+
+    Levanta ValueError se o arquivo não for uma imagem válida do tipo esperado.
+    """
+    try:
+        with Image.open(source_path) as probe:
+            if probe.format != PIL_FORMATS.get(content_type):
+                raise ValueError(f"Formato {probe.format} não corresponde a {content_type}")
+            # Tamanho real, antes do draft() de _open_for_resize reduzir o JPEG;
+            # orientações EXIF 5-8 giram 90°, trocando largura e altura
+            width, height = probe.size
+            if probe.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8):
+                width, height = height, width
+            original_size = (width, height)
+            probe.verify()
+
+        image = _open_for_resize(source_path, max(widths))
+        for width in sorted(widths, reverse=True):
+            image = _resize_to_width(image, width)
+            _save_webp(image, os.path.join(variants_dir, f"{width}.webp"))
+    except (OSError, SyntaxError, Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+        raise ValueError(f"Imagem inválida: {e}") from e
+
+    return {"largura": original_size[0], "altura": original_size[1]}
+
+
+def render_variant(source_path: str, dest_path: str, width: int) -> str:
+    """Gerar uma variante WebP com a largura indicada (executado no pool de processos)"""
+    try:
+        image = _open_for_resize(source_path, width)
+        _save_webp(_resize_to_width(image, width), dest_path)
+    except (OSError, SyntaxError, Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+        raise ValueError(f"Imagem inválida: {e}") from e
+    return dest_path
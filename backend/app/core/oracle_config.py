@@ -1,16 +1,28 @@
 import os
+import time
 import logging
-from typing import Optional, Dict, Any
+import threading
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Sequence
 import oracledb
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 from sqlalchemy.exc import SQLAlchemyError
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pydantic_settings import BaseSettings
 
+from .executors import BoundedExecutor
+from .query_cache import QueryCache, dml_table
+
 # Configurar logging para auditoria
 logger = logging.getLogger(__name__)
 
+# LOBs restantes chegam como str/bytes no próprio fetch, sem LOB locator
+# (evita uma ida extra ao banco por linha e coluna)
+oracledb.defaults.fetch_lobs = False
+
 class OracleSettings(BaseSettings):
     """Configurações seguras para Oracle Database"""
     
@@ -26,19 +38,80 @@ class OracleSettings(BaseSettings):
     max_overflow: int = 10
     pool_timeout: int = 30
     
+    # Pool nativo python-oracledb (opcional, substitui o QueuePool do SQLAlchemy)
+    use_native_pool: bool = False
+    native_pool_min: int = 2
+    native_pool_max: int = 15
+    native_pool_increment: int = 1
+    stmt_cache_size: int = 50
+    pool_ping_interval: int = 60  # segundos
+    
+    # Threads para chamadas Oracle fora do event loop
+    executor_workers: int = 15
+    
+    # Cache opcional de resultados de SELECT (execute_query com cache_tables)
+    query_cache_size: int = 2000
+    query_cache_ttl: int = 30  # segundos
+    
     class Config:
         env_file = "config.env"
         extra = "ignore"
 
 oracle_settings = OracleSettings()
 
+# Tipos Python aceitos em execute_returning e o tipo Oracle da variável de saída
+RETURNING_TYPES = {
+    int: int,
+    float: float,
+    str: str,
+    datetime: oracledb.DB_TYPE_TIMESTAMP
+}
+
+# Tipos Python aceitos em execute_batch e o tamanho/tipo de bind Oracle
+# (declarados antes do executemany: uma primeira linha com None não fixa o tipo)
+BATCH_INPUT_TYPES = {
+    int: oracledb.DB_TYPE_NUMBER,
+    float: oracledb.DB_TYPE_NUMBER,
+    str: 4000
+}
+
+class DuplicateKeyError(Exception):
+    """Violação de constraint UNIQUE/PRIMARY KEY (ORA-00001)"""
+
 class OracleConnectionManager:
     """Gerenciador de conexões Oracle com padrão bancário"""
     
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
-        self._initialize_connection()
+        self.pool = None
+        self._pool_stats_lock = threading.Lock()
+        self._pool_acquisitions = 0
+        self._pool_acquire_errors = 0
+        self._pool_wait_total = 0.0
+        self._pool_wait_max = 0.0
+        self._init_lock = threading.Lock()
+        self.executor = BoundedExecutor(
+            "oracle",
+            ThreadPoolExecutor,
+            max_workers=oracle_settings.executor_workers
+        )
+        self.query_cache = QueryCache(
+            maxsize=oracle_settings.query_cache_size,
+            ttl=oracle_settings.query_cache_ttl
+        )
+    
+    @property
+    def is_initialized(self) -> bool:
+        return self.SessionLocal is not None
+    
+    def initialize(self):
+        """Conectar ao Oracle (idempotente); chamado no lifespan ou no primeiro uso"""
+        if self.is_initialized:
+            return
+        with self._init_lock:
+            if not self.is_initialized:
+                self._initialize_connection()
     
     def _initialize_connection(self):
         """Inicializa a conexão Oracle com tratamento de erros"""
@@ -46,41 +119,148 @@ class OracleConnectionManager:
             # Configurar Oracle Instant Client (se necessário)
             # oracledb.init_oracle_client()
             
-            # String de conexão Oracle
-            connection_string = (
-                f"oracle+oracledb://{oracle_settings.oracle_username}:"
-                f"{oracle_settings.oracle_password}@"
-                f"{oracle_settings.oracle_host}:"
-                f"{oracle_settings.oracle_port}/"
-                f"{oracle_settings.oracle_service_name}"
-            )
+            if oracle_settings.use_native_pool:
+                self.engine = self._create_native_pool_engine()
+            else:
+                self.engine = self._create_queue_pool_engine()
             
-            # Criar engine SQLAlchemy
-            self.engine = create_engine(
-                connection_string,
-                pool_size=oracle_settings.pool_size,
-                max_overflow=oracle_settings.max_overflow,
-                pool_timeout=oracle_settings.pool_timeout,
-                pool_pre_ping=True,  # Verificar conexão antes de usar
-                echo=False  # Set True para debug SQL
-            )
+            # Testar conexão
+            self._test_connection()
             
-            # Criar session factory
+            # Criar session factory (marca o gerenciador como inicializado)
             self.SessionLocal = sessionmaker(
                 autocommit=False,
                 autoflush=False,
                 bind=self.engine
             )
             
-            # Testar conexão
-            self._test_connection()
-            
             logger.info("✅ Conexão Oracle estabelecida com sucesso")
             
         except Exception as e:
             logger.error(f"❌ Erro ao conectar Oracle: {e}")
+            # Descartar estado parcial para que a próxima chamada tente de novo
+            if self.engine is not None:
+                self.engine.dispose()
+                self.engine = None
+            if self.pool is not None:
+                self.pool.close(force=True)
+                self.pool = None
             raise ConnectionError(f"Falha na conexão Oracle: {e}")
     
+    def _create_queue_pool_engine(self):
+        """Engine SQLAlchemy com QueuePool próprio"""
+        # String de conexão Oracle
+        connection_string = (
+            f"oracle+oracledb://{oracle_settings.oracle_username}:"
+            f"{oracle_settings.oracle_password}@"
+            f"{oracle_settings.oracle_host}:"
+            f"{oracle_settings.oracle_port}/"
+            f"{oracle_settings.oracle_service_name}"
+        )
+        
+        # Criar engine SQLAlchemy
+        return create_engine(
+            connection_string,
+            pool_size=oracle_settings.pool_size,
+            max_overflow=oracle_settings.max_overflow,
+            pool_timeout=oracle_settings.pool_timeout,
+            pool_pre_ping=True,  # Verificar conexão antes de usar
+            echo=False  # Set True para debug SQL
+        )
+    
+    def _create_native_pool_engine(self):
+        """Engine SQLAlchemy que obtém conexões do pool nativo python-oracledb"""
+        self.pool = oracledb.create_pool(
+            user=oracle_settings.oracle_username,
+            password=oracle_settings.oracle_password,
+            dsn=oracle_settings.oracle_dsn,
+            min=oracle_settings.native_pool_min,
+            max=oracle_settings.native_pool_max,
+            increment=oracle_settings.native_pool_increment,
+            stmtcachesize=oracle_settings.stmt_cache_size,
+            ping_interval=oracle_settings.pool_ping_interval,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=oracle_settings.pool_timeout * 1000
+        )
+        logger.info(
+            f"🏊 Pool nativo Oracle criado (min={oracle_settings.native_pool_min}, "
+            f"max={oracle_settings.native_pool_max}, increment={oracle_settings.native_pool_increment})"
+        )
+        
+        # NullPool: o SQLAlchemy devolve a conexão ao pool nativo ao fechar
+        return create_engine(
+            "oracle+oracledb://",
+            creator=self._acquire_pooled_connection,
+            poolclass=NullPool,
+            echo=False
+        )
+    
+    def _acquire_pooled_connection(self):
+        """Obter conexão do pool nativo registrando o tempo de espera"""
+        start = time.perf_counter()
+        try:
+            connection = self.pool.acquire()
+        except Exception:
+            with self._pool_stats_lock:
+                self._pool_acquire_errors += 1
+            raise
+        
+        waited = time.perf_counter() - start
+        with self._pool_stats_lock:
+            self._pool_acquisitions += 1
+            self._pool_wait_total += waited
+            self._pool_wait_max = max(self._pool_wait_max, waited)
+        return connection
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Estatísticas do pool de conexões para dimensionamento"""
+        if self.pool is None:
+            queue_pool = self.engine.pool if self.engine else None
+            if queue_pool is None:
+                return {"mode": "not_initialized"}
+            return {
+                "mode": "sqlalchemy",
+                "size": queue_pool.size(),
+                "checked_out": queue_pool.checkedout(),
+                "checked_in": queue_pool.checkedin(),
+                "overflow": queue_pool.overflow()
+            }
+        
+        with self._pool_stats_lock:
+            acquisitions = self._pool_acquisitions
+            wait_total = self._pool_wait_total
+            wait_max = self._pool_wait_max
+            acquire_errors = self._pool_acquire_errors
+        
+        return {
+            "mode": "native",
+            "min": self.pool.min,
+            "max": self.pool.max,
+            "increment": self.pool.increment,
+            "opened": self.pool.opened,
+            "busy": self.pool.busy,
+            "stmt_cache_size": oracle_settings.stmt_cache_size,
+            "ping_interval": self.pool.ping_interval,
+            "acquisitions": acquisitions,
+            "acquire_errors": acquire_errors,
+            "wait_time_total_ms": round(wait_total * 1000, 2),
+            "wait_time_avg_ms": round(wait_total * 1000 / acquisitions, 3) if acquisitions else 0.0,
+            "wait_time_max_ms": round(wait_max * 1000, 2)
+        }
+    
+    def close(self):
+        """Liberar engine, pool nativo e executor"""
+        self.executor.shutdown(wait=False)
+        with self._init_lock:
+            if self.engine is not None:
+                self.engine.dispose()
+                self.engine = None
+                self.SessionLocal = None
+            if self.pool is not None:
+                self.pool.close(force=True)
+                self.pool = None
+        logger.info("🔌 Conexões Oracle encerradas")
+    
     def _test_connection(self):
         """Testa a conexão Oracle"""
         try:
@@ -98,9 +278,7 @@ class OracleConnectionManager:
     @contextmanager
     def get_db_session(self):
         """Context manager para sessões Oracle com tratamento de erros"""
-        if not self.SessionLocal:
-            raise ConnectionError("Oracle não inicializado")
-            
+        self.initialize()
         session = self.SessionLocal()
         try:
             yield session
@@ -114,8 +292,11 @@ class OracleConnectionManager:
             session.close()
     
     def get_raw_connection(self):
-        """Obter conexão raw Oracle para operações específicas"""
+        """Obter conexão raw Oracle para operações específicas (fechar após uso)"""
         try:
+            self.initialize()
+            if self.pool is not None:
+                return self._acquire_pooled_connection()
             return oracledb.connect(
                 user=oracle_settings.oracle_username,
                 password=oracle_settings.oracle_password,
@@ -126,27 +307,224 @@ class OracleConnectionManager:
             logger.error(f"❌ Erro ao obter conexão raw Oracle: {e}")
             raise
     
-    def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> list:
-        """Executar query SELECT de forma segura"""
+    @contextmanager
+    def get_dbapi_connection(self):
+        """Conexão DBAPI (oracledb) do pool do engine, com commit/rollback automáticos"""
+        self.initialize()
+        connection = self.engine.raw_connection()
+        try:
+            yield connection
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"❌ Erro na transação Oracle (DBAPI): {e}")
+            raise
+        finally:
+            connection.close()
+    
+    def execute_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        cache_tables: Optional[Sequence[str]] = None,
+        cache_ttl: Optional[float] = None
+    ) -> list:
+        """Executar query SELECT de forma segura
+        
+        Com `cache_tables` (tabelas lidas pela query) o resultado fica no
+        query_cache até expirar ou até um DML feito por este gerenciador
+        alterar uma dessas tabelas.
+        """
+        cache_key = self.query_cache.key(query, params) if cache_tables else None
+        if cache_key is not None:
+            rows = self.query_cache.get(cache_key)
+            if rows is not None:
+                return rows
+            generations = self.query_cache.snapshot(cache_tables)
+        
         try:
             with self.get_db_session() as session:
                 result = session.execute(text(query), params or {})
-                return result.fetchall()
+                rows = result.fetchall()
         except Exception as e:
             logger.error(f"❌ Erro ao executar query: {e}")
             raise
+        
+        if cache_key is not None:
+            self.query_cache.set(cache_key, rows, cache_tables, generations, cache_ttl)
+        return rows
+    
+    def _invalidate_cached(self, *queries: str):
+        """Descartar do query_cache o que depende das tabelas alteradas pelos DMLs"""
+        tables = {dml_table(query) for query in queries} - {None}
+        if tables:
+            self.query_cache.invalidate_tables(*tables)
     
-    def execute_insert(self, query: str, params: Dict[str, Any]) -> bool:
-        """Executar INSERT de forma segura"""
+    def execute_insert(self, query: str, params: Dict[str, Any], invalidate_cache: bool = True) -> bool:
+        """Executar INSERT de forma segura
+        
+        `invalidate_cache=False` para escritas em colunas que nenhuma consulta
+        em cache lê (ex.: carimbo de último acesso), sem esvaziar o query_cache.
+        """
         try:
             with self.get_db_session() as session:
                 session.execute(text(query), params)
                 session.commit()
                 logger.info(f"✅ INSERT executado com sucesso")
-                return True
         except Exception as e:
             logger.error(f"❌ Erro ao executar INSERT: {e}")
             raise
+        if invalidate_cache:
+            self._invalidate_cached(query)
+        return True
+    
+    def execute_update(self, query: str, params: Dict[str, Any], invalidate_cache: bool = True) -> int:
+        """Executar UPDATE/DELETE e retornar o número de linhas afetadas
+        
+        `invalidate_cache` como em execute_insert.
+        """
+        try:
+            with self.get_db_session() as session:
+                result = session.execute(text(query), params)
+                session.commit()
+                rowcount = result.rowcount
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar UPDATE: {e}")
+            raise
+        if rowcount and invalidate_cache:
+            self._invalidate_cached(query)
+        return rowcount
+    
+    def execute_returning(
+        self,
+        query: str,
+        params: Dict[str, Any],
+        returning: Dict[str, type]
+    ) -> Optional[Dict[str, Any]]:
+        """Executar DML com RETURNING ... INTO em uma única ida ao banco
+        
+        `returning` mapeia o nome de cada bind de saída para seu tipo Python
+        (int, float, str ou datetime). Retorna None se nenhuma linha foi afetada.
+        """
+        try:
+            with self.get_dbapi_connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    out_vars = {
+                        name: cursor.var(RETURNING_TYPES[py_type])
+                        for name, py_type in returning.items()
+                    }
+                    cursor.execute(query, {**params, **out_vars})
+                    
+                    if cursor.rowcount == 0:
+                        return None
+                    
+                    returned = {name: var.getvalue()[0] for name, var in out_vars.items()}
+                finally:
+                    cursor.close()
+        except oracledb.IntegrityError as e:
+            error, = e.args
+            if getattr(error, "code", None) == 1:
+                raise DuplicateKeyError(str(e)) from e
+            logger.error(f"❌ Erro ao executar DML com RETURNING: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar DML com RETURNING: {e}")
+            raise
+        self._invalidate_cached(query)
+        return returned
+    
+    def execute_batch(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        input_types: Optional[Dict[str, type]] = None
+    ) -> List[Dict[str, Any]]:
+        """Executar DML em lote (array DML / executemany) numa única transação
+        
+        Linhas com erro não abortam as demais (batcherrors). Retorna os erros
+        como [{"offset", "code", "message"}], offset sendo o índice em `rows`.
+        """
+        if not rows:
+            return []
+        
+        try:
+            with self.get_dbapi_connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    if input_types:
+                        cursor.setinputsizes(**{
+                            name: BATCH_INPUT_TYPES[py_type]
+                            for name, py_type in input_types.items()
+                        })
+                    cursor.executemany(query, rows, batcherrors=True)
+                    
+                    errors = [
+                        {"offset": error.offset, "code": error.code, "message": error.message}
+                        for error in cursor.getbatcherrors()
+                    ]
+                finally:
+                    cursor.close()
+        except Exception as e:
+            logger.error(f"❌ Erro ao executar DML em lote: {e}")
+            raise
+        if len(errors) < len(rows):
+            self._invalidate_cached(query)
+        return errors
+    
+    def claim_rows(
+        self,
+        select_query: str,
+        params: Dict[str, Any],
+        limit: int,
+        update_query: str,
+        update_params: Dict[str, Any]
+    ) -> List[Any]:
+        """Reservar até `limit` linhas livres numa única transação
+        
+        `select_query` é um SELECT ... FOR UPDATE SKIP LOCKED com o ID na
+        primeira coluna: linhas bloqueadas por outra sessão são puladas em vez
+        de esperadas. Cada ID obtido é marcado com `update_query` (bind :id).
+        """
+        try:
+            with self.get_dbapi_connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    # Com SKIP LOCKED a linha é bloqueada ao ser buscada:
+                    # buscar só o necessário para não reservar linhas a mais
+                    cursor.prefetchrows = limit
+                    cursor.arraysize = limit
+                    cursor.execute(select_query, params)
+                    ids = [row[0] for row in cursor.fetchmany(limit)]
+                    
+                    if ids:
+                        cursor.executemany(update_query, [{**update_params, "id": row_id} for row_id in ids])
+                finally:
+                    cursor.close()
+        except Exception as e:
+            logger.error(f"❌ Erro ao reservar linhas: {e}")
+            raise
+        if ids:
+            self._invalidate_cached(update_query)
+        return ids
+    
+    async def run_async(self, func, *args, **kwargs):
+        """Executar chamada bloqueante no executor Oracle sem travar o event loop"""
+        return await self.executor.run(func, *args, **kwargs)
+    
+    async def execute_query_async(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        cache_tables: Optional[Sequence[str]] = None,
+        cache_ttl: Optional[float] = None
+    ) -> list:
+        """Versão assíncrona de execute_query"""
+        return await self.run_async(self.execute_query, query, params, cache_tables, cache_ttl)
+    
+    async def execute_insert_async(self, query: str, params: Dict[str, Any], invalidate_cache: bool = True) -> bool:
+        """Versão assíncrona de execute_insert"""
+        return await self.run_async(self.execute_insert, query, params, invalidate_cache)
     
     def check_table_exists(self, table_name: str) -> bool:
         """Verificar se tabela existe"""
@@ -176,7 +554,7 @@ class OracleConnectionManager:
             logger.error(f"❌ Erro ao obter estrutura da tabela {table_name}: {e}")
             return []
 
-# Instância global do gerenciador Oracle
+# Instância global do gerenciador Oracle (conecta sob demanda)
 oracle_manager = OracleConnectionManager()
 
 def get_oracle_session():
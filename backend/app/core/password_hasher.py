@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.executors import BoundedExecutor, ExecutorSaturated
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Hashes com custo diferente de BCRYPT_ROUNDS são marcados para rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+def hash_password(password: str) -> str:
+    """Gerar hash bcrypt (bloqueante, CPU)"""
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verificar senha contra hash bcrypt (bloqueante, CPU)"""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verificar senha e, se o custo mudou, devolver novo hash"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _warm_up_worker() -> bool:
+    """Tarefa vazia para subir os processos do pool antes do primeiro login"""
+    return True
+
+
+class PasswordHasher:
+    """Hash e verificação de senhas em pool de processos limitado"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.executor = BoundedExecutor(
+            "bcrypt",
+            ProcessPoolExecutor,
+            max_workers=workers,
+            max_pending=max_pending
+        )
+
+    async def _run(self, func, *args):
+        try:
+            return await self.executor.run(func, *args)
+        except ExecutorSaturated as e:
+            logger.warning(f"⚠️ {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Serviço de autenticação sobrecarregado. Tente novamente em instantes.",
+                headers={"Retry-After": "1"}
+            )
+
+    async def warm_up(self):
+        """Iniciar os processos do pool (chamado no lifespan da aplicação)"""
+        await asyncio.gather(*(self.executor.run(_warm_up_worker) for _ in range(self.executor.max_workers)))
+
+    async def hash(self, password: str) -> str:
+        """Gerar hash fora do event loop"""
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verificar senha fora do event loop"""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verificar senha e obter novo hash se o custo bcrypt mudou"""
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+
+# Instância global do hasher
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -0,0 +1,151 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+# Tabela alvo de um comando DML (INSERT/UPDATE/DELETE/MERGE), com ou sem schema
+DML_TARGET = re.compile(
+    r"^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|DELETE|MERGE\s+INTO)\s+(?:\w+\.)?(\w+)",
+    re.IGNORECASE
+)
+
+def normalize_sql(query: str) -> str:
+    """SQL com espaços colapsados (a mesma query indentada de outro jeito casa)"""
+    return " ".join(query.split())
+
+def dml_table(query: str) -> Optional[str]:
+    """Tabela modificada pelo comando DML, em maiúsculas (None se não for DML)"""
+    match = DML_TARGET.match(query)
+    return match.group(1).upper() if match else None
+
+class QueryCache:
+    """Cache de resultados de SELECT com TTL, despejo LRU e invalidação por tabela
+
+    Cada entrada declara as tabelas de que depende; um DML numa delas descarta
+    as entradas. Um contador de geração por tabela impede que uma leitura
+    iniciada antes do DML grave no cache um resultado já desatualizado.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._keys_by_table: Dict[str, Set[Hashable]] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_discards = 0
+
+    @staticmethod
+    def key(query: str, params: Optional[Dict[str, Any]]) -> Optional[Hashable]:
+        """Chave da consulta (None se algum parâmetro não for hashable)"""
+        key = (normalize_sql(query), tuple(sorted((params or {}).items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Gerações atuais das tabelas, tomadas antes de executar a consulta"""
+        with self._lock:
+            return tuple(self._generations.get(table.upper(), 0) for table in tables)
+
+    def get(self, key: Hashable) -> Optional[list]:
+        """Linhas em cache ou None, atualizando a ordem LRU"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            rows, expires_at, tables = entry
+            if expires_at <= time.monotonic():
+                self._discard(key, tables)
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return list(rows)
+
+    def set(
+        self,
+        key: Hashable,
+        rows: list,
+        tables: Iterable[str],
+        generations: Tuple[int, ...],
+        ttl: Optional[float] = None
+    ):
+        """Guardar o resultado, a menos que alguma tabela tenha mudado desde o snapshot"""
+        tables = tuple(table.upper() for table in tables)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            current = tuple(self._generations.get(table, 0) for table in tables)
+            if current != generations:
+                self.stale_discards += 1
+                return
+
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._unindex(key, previous[2])
+            self._data[key] = (tuple(rows), expires_at, tables)
+            for table in tables:
+                self._keys_by_table.setdefault(table, set()).add(key)
+
+            while len(self._data) > self.maxsize:
+                old_key, (_, _, old_tables) = self._data.popitem(last=False)
+                self._unindex(old_key, old_tables)
+                self.evictions += 1
+
+    def invalidate_tables(self, *tables: str):
+        """Descartar as entradas que dependem das tabelas"""
+        with self._lock:
+            for table in tables:
+                table = table.upper()
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in self._keys_by_table.pop(table, ()):
+                    entry = self._data.get(key)
+                    if entry is not None:
+                        self._discard(key, entry[2])
+                        self.invalidations += 1
+
+    def clear(self):
+        """Esvaziar o cache"""
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+            self._keys_by_table.clear()
+
+    def _discard(self, key: Hashable, tables: Tuple[str, ...]):
+        del self._data[key]
+        self._unindex(key, tables)
+
+    def _unindex(self, key: Hashable, tables: Tuple[str, ...]):
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de acerto/erro do cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_discards": self.stale_discards,
+                "entries_by_table": {table: len(keys) for table, keys in self._keys_by_table.items()},
+            }
@@ -0,0 +1,147 @@
+from contextvars import ContextVar
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Mapping, Optional, Type
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import msgpack
+except ImportError:  # msgpack é opcional: sem ele, sempre JSON
+    msgpack = None
+
+# Chaves não-string (ex.: contagens por id de território) viram texto como no json
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+NEGOTIATED_TYPES = ("application/json", MSGPACK_MEDIA_TYPE)
+
+# Formato pedido pelo cliente na requisição atual ("json" ou "msgpack")
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def json_default(obj: Any) -> Any:
+    """Tipos que o orjson não serializa sozinho
+
+    datetime, date, UUID e Enum já são nativos; aqui ficam o Decimal (NUMBER
+    do Oracle quando buscado como Decimal) e modelos pydantic aninhados.
+    """
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, BaseModel):
+        return dict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    raise TypeError(f"Tipo não serializável em JSON: {type(obj).__name__}")
+
+
+def msgpack_default(obj: Any) -> Any:
+    """Tipos que o msgpack não serializa sozinho, no mesmo formato do JSON"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    return json_default(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serializar para JSON (UTF-8) com orjson"""
+    return orjson.dumps(content, default=json_default, option=ORJSON_OPTIONS)
+
+
+def packb(content: Any) -> bytes:
+    """Serializar para MessagePack (datas como texto ISO, como no JSON)"""
+    return msgpack.packb(content, default=msgpack_default, use_bin_type=True, datetime=False)
+
+
+def prefers_msgpack(accept: str) -> bool:
+    """Cliente pediu MessagePack com prioridade igual ou maior que JSON"""
+    qualities = {}
+    for item in accept.split(","):
+        media_type, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[media_type.strip().lower()] = quality
+
+    msgpack_quality = max(qualities.get(MSGPACK_MEDIA_TYPE, 0.0), qualities.get("application/x-msgpack", 0.0))
+    return msgpack_quality > 0 and msgpack_quality >= qualities.get("application/json", 0.0)
+
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON serializada com orjson (classe padrão da aplicação)
+
+    Quando o ContentNegotiationMiddleware marcou a requisição como
+    MessagePack, o mesmo conteúdo sai em application/msgpack.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if response_format.get() == "msgpack":
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return packb(content)
+        return dumps(content)
+
+
+class ContentNegotiationMiddleware:
+    """Escolhe JSON ou MessagePack pelo cabeçalho Accept
+
+    Só marca o formato no contextvar `response_format`; quem serializa é o
+    FastJSONResponse. Respostas JSON/MessagePack recebem `Vary: Accept`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_vary(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if headers.get("content-type", "").startswith(NEGOTIATED_TYPES):
+                    headers.add_vary_header("Accept")
+            await send(message)
+
+        accept = Headers(scope=scope).get("accept", "")
+        if msgpack is None or not prefers_msgpack(accept):
+            await self.app(scope, receive, send_with_vary)
+            return
+
+        token = response_format.set("msgpack")
+        try:
+            await self.app(scope, receive, send_with_vary)
+        finally:
+            response_format.reset(token)
+
+
+def unvalidated_response(
+    model: Type[BaseModel],
+    headers: Optional[Mapping[str, str]] = None,
+    status_code: int = 200,
+    **fields: Any
+) -> FastJSONResponse:
+    """Resposta no formato de `model` sem a validação e o jsonable_encoder do FastAPI
+
+    Para listagens grandes montadas pelo serviço, cujos itens já saem no
+    formato da API: o modelo é construído sem validar (model_construct) e
+    serializado direto pelo orjson. O response_model da rota continua
+    documentando o formato no OpenAPI.
+    """
+    return FastJSONResponse(model.model_construct(**fields), status_code=status_code, headers=headers)
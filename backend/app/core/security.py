@@ -1,12 +1,9 @@
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional
 from jose import jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core import password_hasher as hasher
 
 
 def create_access_token(
@@ -31,14 +28,28 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verificar senha plain com hash
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return hasher.verify_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Gerar hash da senha
     """
-    return pwd_context.hash(password)
+    return hasher.hash_password(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verificar senha no pool de processos bcrypt
+    """
+    return await hasher.password_hasher.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Gerar hash da senha no pool de processos bcrypt
+    """
+    return await hasher.password_hasher.hash(password)
 
 
 def verify_token(token: str) -> Optional[str]:
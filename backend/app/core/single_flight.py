@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Agrupa chamadas assíncronas idênticas simultâneas numa única execução
+
+    Enquanto a chamada de uma chave está em andamento, quem pedir a mesma
+    chave aguarda o mesmo resultado (ou a mesma exceção) em vez de disparar
+    outra consulta. Nada é guardado depois que a chamada termina.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, "asyncio.Task"] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Executar `func(*args, **kwargs)` uma vez por chave em andamento"""
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # Task própria: se quem disparou desconectar, os demais seguem aguardando
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._calls[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task"):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de execuções e chamadas agrupadas"""
+        calls = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / calls, 4) if calls else 0.0,
+            "errors": self.errors,
+        }
@@ -44,11 +44,22 @@ def create_oracle_engine():
         print(f"🔄 Usando fallback SQLite: {fallback_url}")
         return create_engine(fallback_url, connect_args={"check_same_thread": False})
 
-# Usar a função para criar o engine
-engine = create_oracle_engine()
+# Engine criado sob demanda (não conecta nem configura nada no import)
+engine = None
 
-# Criar SessionLocal para gerenciar sessões do banco
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Criar SessionLocal para gerenciar sessões do banco (bind feito em get_engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def get_engine():
+    """
+    Obter engine, criando-o no primeiro uso
+    """
+    global engine
+    if engine is None:
+        engine = create_oracle_engine()
+        SessionLocal.configure(bind=engine)
+    return engine
 
 # Base class para modelos SQLAlchemy
 Base = declarative_base()
@@ -58,6 +69,7 @@ def get_db():
     """
     Dependency para obter sessão do banco de dados
     """
+    get_engine()
     db = SessionLocal()
     try:
         yield db
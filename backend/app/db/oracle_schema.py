@@ -0,0 +1,51 @@
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.core.oracle_config import oracle_manager
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Revisão Alembic (branch "oracle") esperada por este código.
+# Atualizar sempre que uma nova revisão ora00N for adicionada.
+ORACLE_SCHEMA_REVISION = "ora008"
+REQUIRED_TABLES = ("TERRITORIOS", "USUARIOS", "OCORRENCIAS")
+MIGRATION_HINT = "alembic -x db=oracle upgrade oracle@head"
+
+
+def read_schema_revision() -> Optional[str]:
+    """Ler revisão aplicada pelo Alembic (None se o schema nunca foi migrado)"""
+    try:
+        result = oracle_manager.execute_query("SELECT VERSION_NUM FROM ALEMBIC_VERSION")
+        return result[0][0] if result else None
+    except Exception:
+        return None
+
+
+def ensure_oracle_schema(mode: Optional[str] = None) -> str:
+    """Verificar o schema Oracle conforme SCHEMA_CHECK_MODE; nunca executa DDL
+
+    Retorna a ação tomada: "skipped", "marker", "checked" ou "outdated".
+    """
+    mode = mode or settings.SCHEMA_CHECK_MODE
+
+    if mode == "skip":
+        logger.info("⏭️ Verificação de schema desativada")
+        return "skipped"
+
+    revision = read_schema_revision()
+    if mode == "marker" and revision == ORACLE_SCHEMA_REVISION:
+        logger.info(f"✅ Schema Oracle na revisão {ORACLE_SCHEMA_REVISION} (alembic_version)")
+        return "marker"
+
+    missing = [table for table in REQUIRED_TABLES if not oracle_manager.check_table_exists(table)]
+    if missing or revision != ORACLE_SCHEMA_REVISION:
+        logger.error(
+            f"❌ Schema Oracle desatualizado (revisão {revision}, esperada {ORACLE_SCHEMA_REVISION}; "
+            f"tabelas ausentes: {', '.join(missing) or 'nenhuma'}). Execute: {MIGRATION_HINT}"
+        )
+        return "outdated"
+
+    logger.info(f"✅ Schema Oracle verificado na revisão {ORACLE_SCHEMA_REVISION}")
+    return "checked"
@@ -1,6 +1,6 @@
 import asyncio
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal, engine
+from app.db.database import SessionLocal, get_engine
 from app.models.user import User, UserRole
 from app.models.soil_analysis import SoilAnalysis, SoilType, AnalysisStatus
 from app.models.occurrence import Occurrence, OccurrenceType, SeverityLevel, OccurrenceStatus
@@ -358,6 +358,7 @@ def seed_database():
     print("🌱 Iniciando seed do banco de dados...")
     
     # Criar sessão do banco
+    get_engine()
     db = SessionLocal()
     
     try:
@@ -1,10 +1,67 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from app.core.config import settings
+from app.core.oracle_config import oracle_manager
+from app.core.password_hasher import password_hasher
+from app.core.responses import FastJSONResponse, ContentNegotiationMiddleware
+from app.core.compression import CompressionMiddleware
+from app.services.auth_service import auth_service
+from app.services.cluster_service import cluster_service
+from app.services.occurrence_service import occurrence_service
+from app.services.image_service import image_service
 from app.api.v1.endpoints import auth, users
-from app.api.v1 import auth as oracle_auth, occurrences
+from app.api.v1 import auth as oracle_auth, occurrences, uploads, images
+from app.api.v1.occurrences import get_current_user
+from app.db.oracle_schema import ensure_oracle_schema
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Inicialização e finalização da aplicação
+
+    Pools são iniciados em paralelo; falha no Oracle não derruba o processo
+    (o gerenciador tenta conectar de novo na primeira requisição).
+    """
+    start = time.perf_counter()
+    oracle_result, hasher_result = await asyncio.gather(
+        oracle_manager.run_async(oracle_manager.initialize),
+        password_hasher.warm_up(),
+        return_exceptions=True
+    )
+
+    if isinstance(hasher_result, Exception):
+        logger.warning(f"⚠️ Pool de hash de senhas não iniciado: {hasher_result}")
+
+    if isinstance(oracle_result, Exception):
+        logger.warning(f"⚠️ Oracle indisponível na inicialização, conexão será feita sob demanda: {oracle_result}")
+    else:
+        try:
+            await oracle_manager.run_async(ensure_oracle_schema)
+        except Exception as e:
+            logger.warning(f"⚠️ Verificação de schema falhou: {e}")
+
+    print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} iniciada em {time.perf_counter() - start:.2f}s!")
+    print(f"📍 Ambiente: {settings.ENVIRONMENT}")
+    if settings.DEBUG:
+        print(f"📖 Documentação: http://localhost:8000{settings.API_V1_STR}/docs")
+
+    yield
+
+    oracle_manager.close()
+    password_hasher.executor.shutdown(wait=False)
+    image_service.executor.shutdown(wait=False)
+    print(f"🛑 {settings.APP_NAME} finalizada!")
+
 
 # Criar aplicação FastAPI
 app = FastAPI(
@@ -14,8 +71,13 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.DEBUG else None,
     docs_url=f"{settings.API_V1_STR}/docs" if settings.DEBUG else None,
     redoc_url=f"{settings.API_V1_STR}/redoc" if settings.DEBUG else None,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Cabeçalhos de resposta lidos pelo cliente web (ETag e uploads retomáveis)
+EXPOSED_HEADERS = ["ETag", "Location", "Upload-Offset", "Upload-Length", "Tus-Resumable"]
+
 # Configurar CORS
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -24,6 +86,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=EXPOSED_HEADERS,
     )
 else:
     # Para desenvolvimento, permitir todas as origens
@@ -33,6 +96,7 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=EXPOSED_HEADERS,
     )
 
 # Adicionar middleware de segurança para hosts confiáveis
@@ -41,6 +105,17 @@ app.add_middleware(
     allowed_hosts=["localhost", "127.0.0.1", "192.168.0.24", "*.cainvest.com", "*.vercel.app", "*.onrender.com", "*"]
 )
 
+# Accept: application/msgpack devolve MessagePack no lugar de JSON
+app.add_middleware(ContentNegotiationMiddleware)
+
+# Compressão por último (mais externa): vale para JSON e MessagePack
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -53,7 +128,8 @@ async def http_exception_handler(request, exc):
             "error": True,
             "message": exc.detail,
             "status_code": exc.status_code
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -111,6 +187,41 @@ async def health_check():
         )
 
 
+async def require_metrics_access(current_user: Dict[str, Any] = Depends(get_current_user)):
+    """Métricas internas só para administradores, e só se METRICS_ENABLED"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if current_user.get('tipo_usuario') != 'administrador':
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso negado. Apenas administradores podem ver as métricas"
+        )
+
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_access)])
+async def metrics():
+    """
+    Métricas internas para dimensionamento (pool Oracle e executores)
+    
+    Exige token de administrador; desligado com METRICS_ENABLED=false.
+    """
+    return {
+        "oracle_pool": oracle_manager.get_pool_stats(),
+        "oracle_executor": oracle_manager.executor.stats(),
+        "oracle_query_cache": oracle_manager.query_cache.stats(),
+        "auth_principal_cache": auth_service.principal_cache.stats(),
+        "password_hasher": password_hasher.executor.stats(),
+        "occurrence_cluster_cache": cluster_service.tile_cache.stats(),
+        "image_processing": image_service.executor.stats(),
+        "image_variant_cache": image_service.variant_cache.stats(),
+        "occurrence_stats_cache": occurrence_service.stats_cache.stats(),
+        "single_flight": {
+            flight.name: flight.stats()
+            for flight in (occurrence_service.single_flight, cluster_service.single_flight, image_service.single_flight)
+        }
+    }
+
+
 # Incluir rotas da API v1
 # app.include_router(
 #     auth.router,
@@ -136,25 +247,17 @@ app.include_router(
     tags=["Ocorrências"]
 )
 
+app.include_router(
+    uploads.router,
+    prefix=f"{settings.API_V1_STR}",
+    tags=["Uploads"]
+)
 
-# Eventos de inicialização e finalização
-@app.on_event("startup")
-async def startup_event():
-    """
-    Executado na inicialização da aplicação
-    """
-    print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} iniciada!")
-    print(f"📍 Ambiente: {settings.ENVIRONMENT}")
-    if settings.DEBUG:
-        print(f"📖 Documentação: http://localhost:8000{settings.API_V1_STR}/docs")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """
-    Executado na finalização da aplicação
-    """
-    print(f"🛑 {settings.APP_NAME} finalizada!")
+app.include_router(
+    images.router,
+    prefix=f"{settings.API_V1_STR}",
+    tags=["Imagens"]
+)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,13 @@
+import json
 from pydantic import BaseModel, Field, validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
+from app.core.config import settings
+
+# Tamanho das colunas JSON de OCORRENCIAS (migração ora002)
+COORDENADAS_MAX_CHARS = 200
+IMAGENS_MAX_BYTES = 4000
 
 class TipoOcorrencia(str, Enum):
     """Tipos de ocorrência ambiental"""
@@ -47,12 +53,35 @@ class OccurrenceBase(BaseModel):
                 raise ValueError('Latitude deve estar entre -90 e 90')
             if not (-180 <= v['lng'] <= 180):
                 raise ValueError('Longitude deve estar entre -180 e 180')
+            if len(json.dumps(v)) > COORDENADAS_MAX_CHARS:
+                raise ValueError(f'Coordenadas excedem {COORDENADAS_MAX_CHARS} caracteres')
+        return v
+
+    @validator('imagens')
+    def validate_imagens(cls, v):
+        if v:
+            if len(v) > settings.MAX_IMAGES_PER_OCCURRENCE:
+                raise ValueError(f'Limite de {settings.MAX_IMAGES_PER_OCCURRENCE} imagens por ocorrência')
+            if len(json.dumps(v).encode()) > IMAGENS_MAX_BYTES:
+                raise ValueError(f'Lista de imagens excede {IMAGENS_MAX_BYTES} bytes')
         return v
 
 class OccurrenceCreate(OccurrenceBase):
     """Schema para criação de ocorrência"""
     pass
 
+class OccurrenceBatchItem(OccurrenceCreate):
+    """Ocorrência registrada offline, com chave de idempotência gerada no aplicativo"""
+    chave_idempotencia: str = Field(..., min_length=1, max_length=64, description="Chave única por usuário")
+
+class OccurrenceBatchCreate(BaseModel):
+    """Lote de ocorrências para sincronização offline
+
+    Os itens são validados individualmente pelo serviço, para que um item
+    inválido não rejeite o lote inteiro.
+    """
+    items: List[Dict[str, Any]] = Field(..., min_length=1, description="Itens no formato de OccurrenceBatchItem")
+
 class OccurrenceResponse(OccurrenceBase):
     """Schema de resposta para ocorrência"""
     id: int
@@ -60,6 +89,7 @@ class OccurrenceResponse(OccurrenceBase):
     status: StatusOcorrencia
     data_criacao: datetime
     data_atualizacao: Optional[datetime]
+    versao: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -69,9 +99,25 @@ class OccurrenceUpdate(BaseModel):
     status: Optional[StatusOcorrencia] = None
     notas_investigacao: Optional[str] = Field(None, max_length=1000)
     notas_resolucao: Optional[str] = Field(None, max_length=1000)
+    versao: Optional[int] = Field(None, ge=1, description="Versão lida (alternativa ao cabeçalho If-Match)")
+
+class QueueRelease(BaseModel):
+    """Ocorrências reservadas a devolver para a fila de triagem"""
+    ids: List[int] = Field(..., min_length=1, max_length=100, description="IDs das ocorrências")
 
 class ApiResponse(BaseModel):
     """Resposta padrão da API"""
     success: bool = True
     message: str
-    data: Optional[Any] = None 
\ No newline at end of file
+    data: Optional[Any] = None 
+
+
+class PaginatedApiResponse(ApiResponse):
+    """Resposta paginada por cursor (keyset)"""
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco para a próxima página")
+
+
+class SyncApiResponse(ApiResponse):
+    """Resposta de sincronização incremental (delta)"""
+    next_since: Optional[str] = Field(None, description="Marca a enviar como since na próxima sincronização")
+    has_more: bool = Field(False, description="Há mais alterações além desta página")
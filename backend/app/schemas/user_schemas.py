@@ -85,6 +85,10 @@ class UserProfileUpdate(BaseModel):
     aldeia_comunidade: Optional[str] = Field(None, max_length=200)
     localizacao_territorio: Optional[str] = Field(None, max_length=200)
 
+class UserStatusUpdate(BaseModel):
+    """Schema para alteração de status do usuário (administradores)"""
+    status: StatusUsuario = Field(..., description="Novo status do usuário")
+
 class UserChangePassword(BaseModel):
     """Schema para alteração de senha"""
     senha_atual: str = Field(..., description="Senha atual")
@@ -2,12 +2,18 @@ import logging
 import hashlib
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
 from sqlalchemy import text
 
-from ..core.oracle_config import oracle_manager
+from ..core.cache import TTLCache
+from ..core.password_hasher import (
+    password_hasher,
+    hash_password,
+    verify_password,
+    verify_and_update_password
+)
+from ..core.oracle_config import oracle_manager, DuplicateKeyError
 from ..schemas.user_schemas import UserCreate, UserLogin, UserResponse, TipoUsuario, StatusUsuario, UserProfileUpdate
 
 # Configuração de logging
@@ -18,121 +24,26 @@ SECRET_KEY = "nauru_yvy_secret_key_development_bityx_2024"  # Em produção, usa
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480  # 8 horas
 
-# Context para hash de senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cache de usuários autenticados (evita consulta ao Oracle a cada requisição)
+PRINCIPAL_CACHE_TTL_SECONDS = 60
+PRINCIPAL_CACHE_MAXSIZE = 10000
 
 class AuthService:
     """Serviço de autenticação com Oracle - padrão bancário"""
     
     def __init__(self):
-        self.ensure_tables_exist()
-    
-    def ensure_tables_exist(self):
-        """Garantir que as tabelas necessárias existem no Oracle"""
-        try:
-            # Verificar se as tabelas existem (ordem importante: TERRITORIOS primeiro)
-            tables_to_check = ["TERRITORIOS", "USUARIOS"]
-            
-            for table in tables_to_check:
-                if not oracle_manager.check_table_exists(table):
-                    logger.warning(f"⚠️ Tabela {table} não encontrada, criando...")
-                    self.create_table(table)
-                else:
-                    logger.info(f"✅ Tabela {table} existe")
-                    
-        except Exception as e:
-            logger.error(f"❌ Erro ao verificar/criar tabelas: {e}")
-    
-    def create_table(self, table_name: str):
-        """Criar tabelas necessárias no Oracle"""
-        try:
-            if table_name == "TERRITORIOS":
-                create_query = """
-                CREATE TABLE TERRITORIOS (
-                    ID NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                    NOME VARCHAR2(200) NOT NULL,
-                    ESTADO VARCHAR2(50) NOT NULL,
-                    MUNICIPIO VARCHAR2(100) NOT NULL,
-                    AREA_HECTARES NUMBER(10,2),
-                    POPULACAO NUMBER(10),
-                    COORDENADAS_LAT NUMBER(10,8),
-                    COORDENADAS_LNG NUMBER(11,8),
-                    DATA_CRIACAO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    CONSTRAINT UK_TERRITORIOS_NOME UNIQUE (NOME, ESTADO)
-                )
-                """
-                
-            elif table_name == "USUARIOS":
-                create_query = """
-                CREATE TABLE USUARIOS (
-                    ID NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                    NOME VARCHAR2(100) NOT NULL,
-                    EMAIL VARCHAR2(150) NOT NULL UNIQUE,
-                    SENHA_HASH VARCHAR2(255) NOT NULL,
-                    TIPO_USUARIO VARCHAR2(50) NOT NULL,
-                    TERRITORIO_ID NUMBER,
-                    TELEFONE VARCHAR2(20),
-                    NOME_SOCIAL VARCHAR2(100),
-                    NOME_INDIGENA VARCHAR2(100),
-                    IDADE NUMBER(3),
-                    PRINCIPAL_ATUACAO VARCHAR2(200),
-                    ALDEIA_COMUNIDADE VARCHAR2(200),
-                    LOCALIZACAO_TERRITORIO VARCHAR2(200),
-                    ACEITE_LGPD NUMBER(1) DEFAULT 0,
-                    STATUS VARCHAR2(20) DEFAULT 'ativo',
-                    DATA_CRIACAO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    ULTIMA_ATUALIZACAO TIMESTAMP,
-                    CONSTRAINT CHK_TIPO_USUARIO 
-                        CHECK (TIPO_USUARIO IN ('administrador', 'lider_territorial', 'monitor_ambiental', 'membro_comunidade', 'pesquisador')),
-                    CONSTRAINT CHK_STATUS_USUARIO 
-                        CHECK (STATUS IN ('ativo', 'inativo', 'pendente', 'bloqueado')),
-                    CONSTRAINT CHK_ACEITE_LGPD
-                        CHECK (ACEITE_LGPD IN (0, 1)),
-                    CONSTRAINT CHK_IDADE
-                        CHECK (IDADE >= 0 AND IDADE <= 150)
-                )
-                """
-            
-            oracle_manager.execute_insert(create_query, {})
-            logger.info(f"✅ Tabela {table_name} criada com sucesso")
-            
-            # Inserir território padrão se for a primeira vez
-            if table_name == "TERRITORIOS":
-                self.create_default_territory()
-                
-        except Exception as e:
-            logger.error(f"❌ Erro ao criar tabela {table_name}: {e}")
-            raise
-    
-    def create_default_territory(self):
-        """Criar território padrão"""
-        try:
-            territory_query = """
-                INSERT INTO TERRITORIOS (NOME, ESTADO, MUNICIPIO, AREA_HECTARES, POPULACAO)
-                VALUES (:nome, :estado, :municipio, :area, :populacao)
-            """
-            
-            territory_data = {
-                "nome": "Território de Desenvolvimento Naurú Yvy",
-                "estado": "São Paulo",
-                "municipio": "São Paulo",
-                "area": 1000.0,
-                "populacao": 500
-            }
-            
-            oracle_manager.execute_insert(territory_query, territory_data)
-            logger.info("✅ Território padrão criado")
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Território padrão pode já existir: {e}")
+        self.principal_cache = TTLCache(
+            maxsize=PRINCIPAL_CACHE_MAXSIZE,
+            ttl=PRINCIPAL_CACHE_TTL_SECONDS
+        )
     
     def hash_password(self, password: str) -> str:
         """Gerar hash seguro da senha"""
-        return pwd_context.hash(password)
+        return hash_password(password)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verificar senha"""
-        return pwd_context.verify(plain_password, hashed_password)
+        return verify_password(plain_password, hashed_password)
     
     def create_access_token(self, data: dict) -> str:
         """Criar token JWT"""
@@ -199,21 +110,14 @@ class AuthService:
                 detail="Erro interno do servidor"
             )
     
-    def register_user(self, user_data: UserCreate) -> Dict[str, Any]:
-        """Registrar novo usuário"""
+    def register_user(self, user_data: UserCreate, hashed_password: Optional[str] = None) -> Dict[str, Any]:
+        """Registrar novo usuário (hashed_password permite receber o hash já calculado)"""
         try:
-            # Verificar se email já existe
-            existing_user = self.get_user_by_email(user_data.email)
-            if existing_user:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email já cadastrado no sistema"
-                )
-            
             # Hash da senha
-            hashed_password = self.hash_password(user_data.senha)
+            if hashed_password is None:
+                hashed_password = self.hash_password(user_data.senha)
             
-            # Inserir usuário
+            # Inserir usuário; a constraint UNIQUE de EMAIL garante a unicidade
             insert_query = """
                 INSERT INTO USUARIOS (
                     NOME, EMAIL, SENHA_HASH, TIPO_USUARIO, 
@@ -226,6 +130,8 @@ class AuthService:
                     :idade, :principal_atuacao, :aldeia_comunidade,
                     :localizacao_territorio, :aceite_lgpd, 'ativo'
                 )
+                RETURNING ID, STATUS, DATA_CRIACAO
+                INTO :out_id, :out_status, :out_data_criacao
             """
             
             user_params = {
@@ -244,10 +150,35 @@ class AuthService:
                 "aceite_lgpd": 1 if user_data.aceite_lgpd else 0
             }
             
-            oracle_manager.execute_insert(insert_query, user_params)
+            try:
+                created = oracle_manager.execute_returning(
+                    insert_query,
+                    user_params,
+                    {"out_id": int, "out_status": str, "out_data_criacao": datetime}
+                )
+            except DuplicateKeyError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Email já cadastrado no sistema"
+                )
             
-            # Buscar usuário criado
-            created_user = self.get_user_by_email(user_data.email)
+            created_user = {
+                "id": created["out_id"],
+                "nome": user_params["nome"],
+                "email": user_params["email"],
+                "tipo_usuario": user_params["tipo_usuario"],
+                "territorio_id": user_params["territorio_id"],
+                "telefone": user_params["telefone"],
+                "nome_social": user_params["nome_social"],
+                "nome_indigena": user_params["nome_indigena"],
+                "idade": user_params["idade"],
+                "principal_atuacao": user_params["principal_atuacao"],
+                "aldeia_comunidade": user_params["aldeia_comunidade"],
+                "localizacao_territorio": user_params["localizacao_territorio"],
+                "aceite_lgpd": bool(user_params["aceite_lgpd"]),
+                "status": created["out_status"],
+                "data_criacao": created["out_data_criacao"]
+            }
             
             # Gerar token
             token_data = {
@@ -294,19 +225,34 @@ class AuthService:
     
     def authenticate_user(self, login_data: UserLogin) -> Dict[str, Any]:
         """Autenticar usuário"""
+        user = self.get_login_candidate(login_data)
+        password_valid, new_hash = verify_and_update_password(login_data.senha, user["senha_hash"])
+        return self.complete_login(login_data, user, password_valid, new_hash)
+    
+    def get_login_candidate(self, login_data: UserLogin) -> Dict[str, Any]:
+        """Buscar usuário para login (401 se o email não existir)"""
+        user = self.get_user_by_email(login_data.email)
+        
+        if not user:
+            logger.warning(f"❌ Tentativa de login com email não cadastrado: {login_data.email}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Email ou senha incorretos"
+            )
+        
+        return user
+    
+    def complete_login(
+        self,
+        login_data: UserLogin,
+        user: Dict[str, Any],
+        password_valid: bool,
+        new_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Finalizar login após a verificação bcrypt, regravando o hash se o custo mudou"""
         try:
-            # Buscar usuário
-            user = self.get_user_by_email(login_data.email)
-            
-            if not user:
-                logger.warning(f"❌ Tentativa de login com email não cadastrado: {login_data.email}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Email ou senha incorretos"
-                )
-            
             # Verificar senha
-            if not self.verify_password(login_data.senha, user["senha_hash"]):
+            if not password_valid:
                 logger.warning(f"❌ Tentativa de login com senha incorreta: {login_data.email}")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -320,13 +266,24 @@ class AuthService:
                     detail=f"Usuário {user['status']}. Entre em contato com o administrador."
                 )
             
-            # Atualizar última atualização
-            update_query = """
-                UPDATE USUARIOS 
-                SET ULTIMA_ATUALIZACAO = CURRENT_TIMESTAMP 
-                WHERE ID = :user_id
-            """
-            oracle_manager.execute_insert(update_query, {"user_id": user["id"]})
+            # Atualizar última atualização (e o hash, se o custo bcrypt mudou)
+            if new_hash:
+                update_query = """
+                    UPDATE USUARIOS 
+                    SET SENHA_HASH = :senha_hash, ULTIMA_ATUALIZACAO = CURRENT_TIMESTAMP 
+                    WHERE ID = :user_id
+                """
+                oracle_manager.execute_insert(update_query, {"user_id": user["id"], "senha_hash": new_hash})
+                logger.info(f"🔐 Hash de senha atualizado para o custo bcrypt atual: {login_data.email}")
+            else:
+                update_query = """
+                    UPDATE USUARIOS 
+                    SET ULTIMA_ATUALIZACAO = CURRENT_TIMESTAMP 
+                    WHERE ID = :user_id
+                """
+                # Só o carimbo de acesso muda e nenhuma consulta em cache o lê:
+                # não invalidar USUARIOS a cada login
+                oracle_manager.execute_insert(update_query, {"user_id": user["id"]}, invalidate_cache=False)
             
             # Gerar token
             token_data = {
@@ -386,7 +343,9 @@ class AuthService:
                 AND u.STATUS = 'ativo'
             """
             
-            result = oracle_manager.execute_query(query, {"user_id": user_id})
+            result = oracle_manager.execute_query(
+                query, {"user_id": user_id}, cache_tables=("USUARIOS", "TERRITORIOS")
+            )
             
             if result:
                 row = result[0]
@@ -431,6 +390,13 @@ class AuthService:
                 )
             
             user_id = int(payload.get("sub"))
+            principal = self.principal_cache.get(user_id)
+            if principal is not None:
+                return dict(principal)
+            
+            # Geração antes da leitura: se invalidate_principal rodar durante
+            # a consulta, o principal lido (talvez já desatualizado) não é gravado
+            generation = self.principal_cache.snapshot()
             user = self.get_user_by_id(user_id)
             
             if not user:
@@ -440,11 +406,13 @@ class AuthService:
                     headers={"WWW-Authenticate": "Bearer"}
                 )
             
-            return {
+            principal = {
                 "id": user["id"],
                 "email": user["email"],
                 "tipo_usuario": user["tipo_usuario"]
             }
+            self.principal_cache.set(user_id, principal, generation=generation)
+            return dict(principal)
             
         except HTTPException:
             raise
@@ -502,6 +470,7 @@ class AuthService:
             
             # Executar atualização
             oracle_manager.execute_insert(update_query, params)
+            self.invalidate_principal(user_id)
             
             # Buscar usuário atualizado
             user = self.get_user_by_id(user_id)
@@ -537,5 +506,75 @@ class AuthService:
                 detail="Erro interno ao atualizar perfil"
             )
 
+    def invalidate_principal(self, user_id: int):
+        """Remover usuário do cache de autenticação após mudanças no cadastro"""
+        if self.principal_cache.invalidate(user_id):
+            logger.debug(f"🧹 Cache de autenticação invalidado para usuário {user_id}")
+    
+    def update_user_status(self, user_id: int, new_status: StatusUsuario) -> Dict[str, Any]:
+        """Alterar status do usuário (ativo, inativo, pendente, bloqueado)"""
+        try:
+            update_query = """
+                UPDATE USUARIOS
+                SET STATUS = :status, ULTIMA_ATUALIZACAO = CURRENT_TIMESTAMP
+                WHERE ID = :user_id
+                RETURNING ID INTO :out_id
+            """
+            
+            updated = oracle_manager.execute_returning(
+                update_query,
+                {"status": new_status.value, "user_id": user_id},
+                {"out_id": int}
+            )
+            
+            # Invalidar mesmo sem linha afetada: o cache não pode sobreviver à mudança
+            self.invalidate_principal(user_id)
+            
+            if not updated:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Usuário não encontrado"
+                )
+            
+            logger.info(f"✅ Status do usuário {user_id} alterado para {new_status.value}")
+            
+            return {"id": user_id, "status": new_status.value}
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao alterar status do usuário {user_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro interno ao alterar status do usuário"
+            )
+    
+    async def get_user_by_email_async(self, email: str) -> Optional[Dict[str, Any]]:
+        """Versão assíncrona de get_user_by_email"""
+        return await oracle_manager.run_async(self.get_user_by_email, email)
+    
+    async def register_user_async(self, user_data: UserCreate) -> Dict[str, Any]:
+        """Versão assíncrona de register_user (hash bcrypt no pool de processos)"""
+        hashed_password = await password_hasher.hash(user_data.senha)
+        return await oracle_manager.run_async(self.register_user, user_data, hashed_password)
+    
+    async def authenticate_user_async(self, login_data: UserLogin) -> Dict[str, Any]:
+        """Versão assíncrona de authenticate_user (verificação bcrypt no pool de processos)"""
+        user = await oracle_manager.run_async(self.get_login_candidate, login_data)
+        password_valid, new_hash = await password_hasher.verify_and_update(login_data.senha, user["senha_hash"])
+        return await oracle_manager.run_async(self.complete_login, login_data, user, password_valid, new_hash)
+    
+    async def verify_access_token_async(self, token: str) -> Dict[str, Any]:
+        """Versão assíncrona de verify_access_token"""
+        return await oracle_manager.run_async(self.verify_access_token, token)
+    
+    async def update_user_profile_async(self, user_id: int, profile_data: UserProfileUpdate) -> Dict[str, Any]:
+        """Versão assíncrona de update_user_profile"""
+        return await oracle_manager.run_async(self.update_user_profile, user_id, profile_data)
+
+    async def update_user_status_async(self, user_id: int, new_status: StatusUsuario) -> Dict[str, Any]:
+        """Versão assíncrona de update_user_status"""
+        return await oracle_manager.run_async(self.update_user_status, user_id, new_status)
+
 # Instância global do serviço
 auth_service = AuthService() 
\ No newline at end of file
@@ -0,0 +1,206 @@
+import logging
+from typing import List, Dict, Any, Tuple
+from fastapi import HTTPException, status
+
+from ..core.cache import TTLCache
+from ..core.oracle_config import oracle_manager
+from ..core.single_flight import SingleFlight
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Grade de agregação: em cada zoom o mundo é dividido em tiles de
+# 360 / 2^zoom graus, e cada tile em CELLS_PER_TILE x CELLS_PER_TILE células
+MAX_ZOOM = 20
+CELLS_PER_TILE = 8
+MAX_TILES_PER_REQUEST = 256
+
+# Cache de clusters por tile (invalidado quando entra ocorrência no tile)
+CLUSTER_CACHE_TTL_SECONDS = 300
+CLUSTER_CACHE_MAXSIZE = 5000
+
+def tile_size(zoom: int) -> float:
+    """Tamanho do tile em graus no zoom informado"""
+    return 360.0 / (2 ** zoom)
+
+def tile_of(lat: float, lng: float, zoom: int) -> Tuple[int, int]:
+    """Tile (x, y) que contém o ponto"""
+    size = tile_size(zoom)
+    max_x = 2 ** zoom - 1
+    max_y = max(0, 2 ** zoom // 2 - 1)
+    tx = min(int((lng + 180) // size), max_x)
+    ty = min(int((lat + 90) // size), max_y)
+    return tx, ty
+
+def lng_ranges(min_lng: float, max_lng: float) -> List[Tuple[float, float]]:
+    """Faixas de longitude, separando janelas que cruzam o antimeridiano"""
+    if min_lng <= max_lng:
+        return [(min_lng, max_lng)]
+    return [(min_lng, 180.0), (-180.0, max_lng)]
+
+class ClusterService:
+    """Agregação de ocorrências em clusters por zoom para o mapa"""
+
+    def __init__(self):
+        self.tile_cache = TTLCache(maxsize=CLUSTER_CACHE_MAXSIZE, ttl=CLUSTER_CACHE_TTL_SECONDS)
+        self.single_flight = SingleFlight("clusters")
+
+    def _tiles_for_bbox(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        zoom: int
+    ) -> List[Tuple[int, int]]:
+        """Tiles que cobrem a área pedida"""
+        tiles = []
+        _, ty_min = tile_of(min_lat, 0, zoom)
+        _, ty_max = tile_of(max_lat, 0, zoom)
+        for range_min, range_max in lng_ranges(min_lng, max_lng):
+            tx_min, _ = tile_of(0, range_min, zoom)
+            tx_max, _ = tile_of(0, range_max, zoom)
+            for tx in range(tx_min, tx_max + 1):
+                for ty in range(ty_min, ty_max + 1):
+                    tiles.append((tx, ty))
+
+        if len(tiles) > MAX_TILES_PER_REQUEST:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Área muito grande para o zoom informado"
+            )
+        return tiles
+
+    def _load_tiles(self, tiles: List[Tuple[int, int]], zoom: int) -> Dict[Tuple[int, int], List[Dict[str, Any]]]:
+        """Agregar no Oracle os tiles ausentes do cache (uma consulta por faixa de linhas)"""
+        size = tile_size(zoom)
+        cell = size / CELLS_PER_TILE
+        loaded: Dict[Tuple[int, int], List[Dict[str, Any]]] = {tile: [] for tile in tiles}
+
+        rows_by_y: Dict[int, List[int]] = {}
+        for tx, ty in tiles:
+            rows_by_y.setdefault(ty, []).append(tx)
+
+        # Tamanho da célula vem do zoom (inteiro validado), seguro como literal;
+        # precisa ser literal para a expressão do SELECT casar com a do GROUP BY
+        cell_literal = repr(cell)
+        query = f"""
+        SELECT FLOOR((LAT + 90) / {cell_literal}), FLOOR((LNG + 180) / {cell_literal}),
+               TIPO_OCORRENCIA, GRAU_SEVERIDADE, COUNT(*), SUM(LAT), SUM(LNG)
+        FROM OCORRENCIAS
+        WHERE LAT >= :min_lat AND LAT < :max_lat
+          AND LNG >= :min_lng AND LNG < :max_lng
+          AND STATUS <> 'descartada'
+        GROUP BY FLOOR((LAT + 90) / {cell_literal}), FLOOR((LNG + 180) / {cell_literal}),
+                 TIPO_OCORRENCIA, GRAU_SEVERIDADE
+        """
+
+        for ty, txs in rows_by_y.items():
+            params = {
+                "min_lat": -90 + ty * size,
+                "max_lat": -90 + (ty + 1) * size if ty < 2 ** zoom // 2 - 1 else 90.0001,
+                "min_lng": -180 + min(txs) * size,
+                "max_lng": -180 + (max(txs) + 1) * size if max(txs) < 2 ** zoom - 1 else 180.0001
+            }
+
+            cells: Dict[Tuple[int, int], Dict[str, Any]] = {}
+            for cy, cx, tipo, severidade, total, sum_lat, sum_lng in oracle_manager.execute_query(query, params):
+                key = (int(cx), int(cy))
+                cluster = cells.setdefault(key, {
+                    "count": 0, "sum_lat": 0.0, "sum_lng": 0.0,
+                    "por_tipo": {}, "por_severidade": {}
+                })
+                cluster["count"] += total
+                cluster["sum_lat"] += float(sum_lat)
+                cluster["sum_lng"] += float(sum_lng)
+                cluster["por_tipo"][tipo] = cluster["por_tipo"].get(tipo, 0) + total
+                cluster["por_severidade"][severidade] = cluster["por_severidade"].get(severidade, 0) + total
+
+            for (cx, cy), cluster in cells.items():
+                tile = (min(cx // CELLS_PER_TILE, 2 ** zoom - 1), min(cy // CELLS_PER_TILE, max(0, 2 ** zoom // 2 - 1)))
+                if tile not in loaded:
+                    continue
+                loaded[tile].append({
+                    "lat": round(cluster["sum_lat"] / cluster["count"], 6),
+                    "lng": round(cluster["sum_lng"] / cluster["count"], 6),
+                    "count": cluster["count"],
+                    "por_tipo": cluster["por_tipo"],
+                    "por_severidade": cluster["por_severidade"]
+                })
+
+        return loaded
+
+    def get_clusters(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        zoom: int
+    ) -> Dict[str, Any]:
+        """Clusters (centróide + contagens por tipo e severidade) da área no zoom"""
+        try:
+            tiles = self._tiles_for_bbox(min_lat, min_lng, max_lat, max_lng, zoom)
+
+            clusters_by_tile = {}
+            missing = []
+            for tile in tiles:
+                cached = self.tile_cache.get((zoom, tile[0], tile[1]))
+                if cached is None:
+                    missing.append(tile)
+                else:
+                    clusters_by_tile[tile] = cached
+
+            if missing:
+                # Inserção durante a consulta invalida o tile: não regravar o agregado antigo
+                generation = self.tile_cache.snapshot()
+                for tile, clusters in self._load_tiles(missing, zoom).items():
+                    self.tile_cache.set((zoom, tile[0], tile[1]), clusters, generation=generation)
+                    clusters_by_tile[tile] = clusters
+
+            ranges = lng_ranges(min_lng, max_lng)
+            clusters = [
+                cluster
+                for tile in tiles
+                for cluster in clusters_by_tile[tile]
+                if min_lat <= cluster["lat"] <= max_lat
+                and any(low <= cluster["lng"] <= high for low, high in ranges)
+            ]
+
+            return {
+                "zoom": zoom,
+                "total": sum(cluster["count"] for cluster in clusters),
+                "clusters": clusters
+            }
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao calcular clusters de ocorrências: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao calcular clusters de ocorrências"
+            )
+
+    def invalidate_point(self, lat: float, lng: float):
+        """Descartar do cache os tiles (em todos os zooms) que contêm o ponto"""
+        for zoom in range(MAX_ZOOM + 1):
+            tx, ty = tile_of(lat, lng, zoom)
+            self.tile_cache.invalidate((zoom, tx, ty))
+
+    async def get_clusters_async(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        zoom: int
+    ) -> Dict[str, Any]:
+        """Versão assíncrona de get_clusters (mesma área e zoom em andamento é reaproveitada)"""
+        return await self.single_flight.run(
+            (min_lat, min_lng, max_lat, max_lng, zoom),
+            oracle_manager.run_async, self.get_clusters, min_lat, min_lng, max_lat, max_lng, zoom
+        )
+
+# Instância global do serviço
+cluster_service = ClusterService()
@@ -0,0 +1,326 @@
+import os
+import uuid
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..core.disk_cache import DiskLRU
+from ..core.executors import BoundedExecutor, ExecutorSaturated
+from ..core.image_processing import SNIFF_BYTES, build_variants, render_variant, sniff_content_type
+from ..core.single_flight import SingleFlight
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Folga para cabeçalhos e delimitadores do multipart sobre MAX_FILE_SIZE
+MULTIPART_OVERHEAD = 64 * 1024
+
+class ImageService:
+    """Armazenamento de imagens por hash de conteúdo e geração de variantes
+
+    Layout em UPLOAD_DIR:
+        objects/<h[:2]>/<h>                 arquivo original
+        variants/<h[:2]>/<h>/<largura>.webp variantes WebP (cache LRU)
+        tmp/                                uploads em andamento
+
+    Variantes são descartáveis: acima de IMAGE_CACHE_MAX_BYTES as menos
+    usadas são apagadas e geradas de novo quando pedidas.
+    """
+
+    def __init__(self, root: str, workers: int, max_pending: int):
+        self.root = root
+        self.executor = BoundedExecutor(
+            "images",
+            ProcessPoolExecutor,
+            max_workers=workers,
+            max_pending=max_pending
+        )
+        self.variant_cache = DiskLRU(os.path.join(root, "variants"), settings.IMAGE_CACHE_MAX_BYTES)
+        self.single_flight = SingleFlight("image_variants")
+
+    def object_path(self, digest: str) -> str:
+        """Caminho do original de um hash"""
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def variants_dir(self, digest: str) -> str:
+        """Diretório das variantes WebP de um hash"""
+        return os.path.join(self.root, "variants", digest[:2], digest)
+
+    def variant_path(self, digest: str, width: int) -> str:
+        """Caminho da variante WebP de uma largura"""
+        return os.path.join(self.variants_dir(digest), f"{width}.webp")
+
+    def width_bucket(self, width: int) -> int:
+        """Menor largura padronizada que atende o pedido (limita variantes por imagem)"""
+        for bucket in sorted(settings.IMAGE_WIDTH_BUCKETS):
+            if bucket >= width:
+                return bucket
+        return max(settings.IMAGE_WIDTH_BUCKETS)
+
+    def tmp_path(self) -> str:
+        """Novo caminho temporário para um upload"""
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        return os.path.join(tmp_dir, uuid.uuid4().hex)
+
+    def image_url(self, digest: str) -> str:
+        """URL pública da imagem"""
+        return f"{settings.API_V1_STR}/images/{digest}"
+
+    def store_file(self, tmp_path: str, digest: str) -> bool:
+        """Mover arquivo temporário para objects/ (False se o conteúdo já existia)"""
+        dest_path = self.object_path(digest)
+        if os.path.exists(dest_path):
+            os.unlink(tmp_path)
+            return False
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        os.replace(tmp_path, dest_path)
+        return True
+
+    async def receive_multipart(self, request: Request, field_name: str = "file") -> Dict[str, Any]:
+        """Receber o campo de arquivo de um multipart/form-data direto para o disco
+
+        O corpo é processado em blocos conforme chega: o arquivo é gravado em
+        tmp/ e o SHA-256 calculado no caminho, sem manter o upload em memória.
+        Demais campos do formulário são ignorados.
+        """
+        content_type, options = parse_options_header(request.headers.get("content-type", ""))
+        boundary = options.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Envie a imagem como multipart/form-data"
+            )
+
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > settings.MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Arquivo excede o limite de {settings.MAX_FILE_SIZE // (1024 * 1024)}MB"
+            )
+
+        events = []
+        header_field = bytearray()
+        header_value = bytearray()
+        headers: Dict[bytes, bytes] = {}
+
+        def on_header_field(data, start, end):
+            header_field.extend(data[start:end])
+
+        def on_header_value(data, start, end):
+            header_value.extend(data[start:end])
+
+        def on_header_end():
+            headers[bytes(header_field).lower()] = bytes(header_value)
+            header_field.clear()
+            header_value.clear()
+
+        def on_headers_finished():
+            events.append(("headers", dict(headers)))
+            headers.clear()
+
+        def on_part_data(data, start, end):
+            events.append(("data", bytes(data[start:end])))
+
+        def on_part_end():
+            events.append(("end", None))
+
+        parser = MultipartParser(boundary, callbacks={
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        })
+
+        tmp_path = self.tmp_path()
+        handle = None
+        in_file_part = False
+        done = False
+        sha256 = hashlib.sha256()
+        size = 0
+        head = b""
+
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                for event, payload in events:
+                    if event == "headers":
+                        _, disposition = parse_options_header(payload.get(b"content-disposition", b""))
+                        in_file_part = not done and disposition.get(b"name") == field_name.encode()
+                        if in_file_part and handle is None:
+                            handle = open(tmp_path, "wb")
+                    elif event == "data" and in_file_part:
+                        size += len(payload)
+                        if size > settings.MAX_FILE_SIZE:
+                            raise HTTPException(
+                                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"Arquivo excede o limite de {settings.MAX_FILE_SIZE // (1024 * 1024)}MB"
+                            )
+                        if len(head) < SNIFF_BYTES:
+                            head += payload[:SNIFF_BYTES - len(head)]
+                            if len(head) >= SNIFF_BYTES and not self._allowed_type(head):
+                                raise HTTPException(
+                                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                                    detail=f"Tipo de arquivo não permitido. Aceitos: {', '.join(settings.ALLOWED_FILE_TYPES)}"
+                                )
+                        sha256.update(payload)
+                        await run_in_threadpool(handle.write, payload)
+                    elif event == "end" and in_file_part:
+                        in_file_part = False
+                        done = True
+                events.clear()
+            parser.finalize()
+
+            if handle is None or size == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Campo de arquivo '{field_name}' não enviado"
+                )
+            handle.close()
+
+            content_type = self._allowed_type(head)
+            if not content_type:
+                raise HTTPException(
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail=f"Tipo de arquivo não permitido. Aceitos: {', '.join(settings.ALLOWED_FILE_TYPES)}"
+                )
+
+            digest = sha256.hexdigest()
+            created = await run_in_threadpool(self.store_file, tmp_path, digest)
+            return {"hash": digest, "tamanho": size, "content_type": content_type, "novo": created}
+
+        except BaseException:
+            if handle is not None:
+                handle.close()
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def ingest_file(self, path: str) -> Dict[str, Any]:
+        """Levar um arquivo completo já em disco (upload retomável) para objects/
+
+        Bloqueante: lê o arquivo uma vez para o SHA-256 e o tipo.
+        """
+        sha256 = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as handle:
+            head = handle.read(SNIFF_BYTES)
+            handle.seek(0)
+            for block in iter(lambda: handle.read(1024 * 1024), b""):
+                sha256.update(block)
+                size += len(block)
+
+        content_type = self._allowed_type(head)
+        if not content_type:
+            os.unlink(path)
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Tipo de arquivo não permitido. Aceitos: {', '.join(settings.ALLOWED_FILE_TYPES)}"
+            )
+
+        digest = sha256.hexdigest()
+        created = self.store_file(path, digest)
+        return {"hash": digest, "tamanho": size, "content_type": content_type, "novo": created}
+
+    def discard_object(self, digest: str):
+        """Apagar um original rejeitado (outro upload pode já tê-lo apagado)"""
+        try:
+            os.unlink(self.object_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _allowed_type(self, head: bytes) -> Optional[str]:
+        """Tipo MIME do arquivo, se estiver em ALLOWED_FILE_TYPES"""
+        content_type = sniff_content_type(head)
+        return content_type if content_type in settings.ALLOWED_FILE_TYPES else None
+
+    async def process(self, stored: Dict[str, Any]) -> Dict[str, Any]:
+        """Validar a imagem e gerar as variantes WebP no pool de processos"""
+        digest = stored["hash"]
+        try:
+            info = await self.executor.run(
+                build_variants,
+                self.object_path(digest),
+                self.variants_dir(digest),
+                settings.IMAGE_VARIANT_WIDTHS,
+                stored["content_type"]
+            )
+        except ExecutorSaturated as e:
+            # O original fica em objects/: a nova tentativa gera as variantes dele
+            logger.warning(f"⚠️ {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Processamento de imagens sobrecarregado. Tente novamente em instantes.",
+                headers={"Retry-After": "5"}
+            )
+        except ValueError as e:
+            logger.warning(f"⚠️ Upload rejeitado ({digest[:12]}): {e}")
+            if stored.get("novo"):
+                self.discard_object(digest)
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Arquivo não é uma imagem válida"
+            )
+
+        for width in settings.IMAGE_VARIANT_WIDTHS:
+            await run_in_threadpool(self.variant_cache.add, self.variant_path(digest, width))
+
+        logger.info(f"🖼️ Imagem {digest[:12]} processada ({info['largura']}x{info['altura']})")
+        return {
+            **info,
+            "hash": digest,
+            "url": self.image_url(digest),
+            "miniatura_url": f"{self.image_url(digest)}?w={min(settings.IMAGE_VARIANT_WIDTHS)}"
+        }
+
+    def original(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Caminho e tipo MIME do original (None se não existir)"""
+        path = self.object_path(digest)
+        try:
+            with open(path, "rb") as handle:
+                head = handle.read(SNIFF_BYTES)
+        except FileNotFoundError:
+            return None
+        return {"path": path, "content_type": sniff_content_type(head) or "application/octet-stream"}
+
+    async def get_variant(self, digest: str, width: int) -> Optional[str]:
+        """Caminho da variante WebP (largura arredondada ao bucket), gerando se preciso"""
+        bucket = self.width_bucket(width)
+        path = self.variant_path(digest, bucket)
+        if await run_in_threadpool(self.variant_cache.get, path):
+            return path
+
+        source = self.object_path(digest)
+        if not os.path.exists(source):
+            return None
+
+        try:
+            # Vários pedidos da mesma variante ainda não gerada: um só render
+            await self.single_flight.run(path, self.executor.run, render_variant, source, path, bucket)
+        except ExecutorSaturated as e:
+            logger.warning(f"⚠️ {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Processamento de imagens sobrecarregado. Tente novamente em instantes.",
+                headers={"Retry-After": "5"}
+            )
+        except ValueError as e:
+            logger.error(f"❌ Falha ao gerar variante de {digest[:12]}: {e}")
+            return None
+
+        await run_in_threadpool(self.variant_cache.add, path)
+        return path
+
+# Instância global do serviço
+image_service = ImageService(
+    root=settings.UPLOAD_DIR,
+    workers=settings.IMAGE_WORKERS,
+    max_pending=settings.IMAGE_MAX_PENDING
+)
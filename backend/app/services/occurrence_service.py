@@ -1,178 +1,324 @@
 import logging
 import json
-from datetime import datetime
+import hashlib
+import re
+import math
+import base64
+import binascii
+from datetime import datetime, date
 from typing import List, Optional, Dict, Any
 from sqlalchemy import text
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 
+from ..core.config import settings
 from ..core.oracle_config import oracle_manager
+from ..core.cache import StaleWhileRevalidateCache
+from ..core.single_flight import SingleFlight
+from .cluster_service import cluster_service
 from ..schemas.occurrence_schemas import (
     OccurrenceCreate, 
+    OccurrenceBatchItem,
+    OccurrenceUpdate,
     OccurrenceResponse, 
     TipoOcorrencia, 
     GrauSeveridade, 
-    StatusOcorrencia
+    StatusOcorrencia,
+    IMAGENS_MAX_BYTES
 )
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
 
+# Formato do timestamp dentro do cursor de paginação
+CURSOR_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+def encode_cursor(data_criacao: datetime, occurrence_id: int) -> str:
+    """Gerar cursor opaco a partir da chave (DATA_CRIACAO, ID) da última linha"""
+    payload = json.dumps([data_criacao.strftime(CURSOR_TIMESTAMP_FORMAT), occurrence_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decodificar cursor opaco em (timestamp, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data_criacao, occurrence_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        datetime.strptime(data_criacao, CURSOR_TIMESTAMP_FORMAT)
+        return data_criacao, int(occurrence_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido"
+        )
+
+def resolve_page_size(limit: Optional[int]) -> int:
+    """Aplicar tamanho padrão e limite máximo de página"""
+    if not limit or limit < 1:
+        return settings.DEFAULT_PAGE_SIZE
+    return min(limit, settings.MAX_PAGE_SIZE)
+
+def keyset_clause(cursor: Optional[str], params: Dict[str, Any], alias: str = "") -> str:
+    """Condição de keyset para ORDER BY DATA_CRIACAO DESC, ID DESC"""
+    if not cursor:
+        return ""
+    
+    cursor_data, cursor_id = decode_cursor(cursor)
+    params["cursor_data"] = cursor_data
+    params["cursor_id"] = cursor_id
+    return f"""
+            AND ({alias}DATA_CRIACAO < TO_TIMESTAMP(:cursor_data, 'YYYY-MM-DD"T"HH24:MI:SS.FF6')
+                 OR ({alias}DATA_CRIACAO = TO_TIMESTAMP(:cursor_data, 'YYYY-MM-DD"T"HH24:MI:SS.FF6')
+                     AND {alias}ID < :cursor_id))"""
+
+# Alterações mais recentes que isso ainda não entram no delta: uma transação
+# em andamento pode gravar um DATA_ATUALIZACAO anterior ao já entregue
+SYNC_SETTLE_SECONDS = 2
+
+def since_clause(since: Optional[str], params: Dict[str, Any]) -> str:
+    """Condição de marca d'água para ORDER BY DATA_ATUALIZACAO, ID (delta sync)"""
+    if not since:
+        return ""
+    
+    since_data, since_id = decode_cursor(since)
+    params["since_data"] = since_data
+    params["since_id"] = since_id
+    return """
+            AND (DATA_ATUALIZACAO > TO_TIMESTAMP(:since_data, 'YYYY-MM-DD"T"HH24:MI:SS.FF6')
+                 OR (DATA_ATUALIZACAO = TO_TIMESTAMP(:since_data, 'YYYY-MM-DD"T"HH24:MI:SS.FF6')
+                     AND ID > :since_id))"""
+
+def strong_etag(*parts) -> str:
+    """ETag forte a partir da impressão digital da coleção e dos parâmetros da requisição"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+# Busca textual (Oracle Text): palavras reservadas da sintaxe CONTAINS
+TEXT_RESERVED_WORDS = {
+    "ABOUT", "ACCUM", "AND", "BT", "BTG", "BTI", "BTP", "EQUIV", "FUZZY", "HASPATH",
+    "INPATH", "MINUS", "NEAR", "NOT", "NT", "NTG", "NTI", "NTP", "OR", "PT", "RT",
+    "SQE", "SYN", "TR", "TRSYN", "TT", "WITHIN"
+}
+MAX_SEARCH_TERMS = 8
+
+def text_search_query(termos: str) -> str:
+    """Montar expressão CONTAINS segura: todas as palavras, por radical ($)"""
+    tokens = [
+        token for token in re.findall(r"[^\W_]+", termos.lower())
+        if len(token) > 1 and token.upper() not in TEXT_RESERVED_WORDS
+    ][:MAX_SEARCH_TERMS]
+    
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe ao menos uma palavra para a busca"
+        )
+    return " AND ".join(f"${token}" for token in tokens)
+
+def decode_offset_cursor(cursor: Optional[str]) -> int:
+    """Cursor de páginas ordenadas por relevância (deslocamento)"""
+    if not cursor:
+        return 0
+    try:
+        offset = int(cursor)
+    except ValueError:
+        offset = -1
+    if offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido"
+        )
+    return offset
+
+# Colunas padrão de uma ocorrência, na ordem esperada por row_to_occurrence
+OCCURRENCE_COLUMNS = """ID, USUARIO_ID, TIPO_OCORRENCIA, LOCALIZACAO, GRAU_SEVERIDADE,
+                   DESCRICAO, COORDENADAS, IMAGENS, STATUS, DATA_CRIACAO, DATA_ATUALIZACAO, VERSAO"""
+
+def row_to_occurrence(row) -> Dict[str, Any]:
+    """Converter linha com OCCURRENCE_COLUMNS em dicionário da API"""
+    return {
+        "id": row[0],
+        "usuario_id": row[1],
+        "tipo_ocorrencia": row[2],
+        "localizacao": row[3],
+        "grau_severidade": row[4],
+        "descricao": row[5],
+        "coordenadas": json.loads(row[6]) if row[6] else None,
+        "imagens": json.loads(row[7]) if row[7] else [],
+        "status": row[8],
+        "data_criacao": row[9],
+        "data_atualizacao": row[10],
+        "versao": row[11]
+    }
+
+# Colunas devolvidas pelo UPDATE de update_occurrence: OCCURRENCE_COLUMNS e extras
+UPDATE_RETURNING = {
+    "ID": int, "USUARIO_ID": int, "TIPO_OCORRENCIA": str, "LOCALIZACAO": str,
+    "GRAU_SEVERIDADE": str, "DESCRICAO": str, "COORDENADAS": str, "IMAGENS": str,
+    "STATUS": str, "DATA_CRIACAO": datetime, "DATA_ATUALIZACAO": datetime, "VERSAO": int,
+    "NOTAS_INVESTIGACAO": str, "NOTAS_RESOLUCAO": str, "LAT": float, "LNG": float
+}
+
+# Fluxo de triagem: status de origem -> status de destino permitidos
+STATUS_TRANSITIONS = {
+    StatusOcorrencia.REPORTADA.value: {StatusOcorrencia.INVESTIGANDO.value, StatusOcorrencia.DESCARTADA.value},
+    StatusOcorrencia.INVESTIGANDO.value: {StatusOcorrencia.CONFIRMADA.value, StatusOcorrencia.DESCARTADA.value},
+    StatusOcorrencia.CONFIRMADA.value: {StatusOcorrencia.RESOLVIDA.value, StatusOcorrencia.DESCARTADA.value},
+    StatusOcorrencia.RESOLVIDA.value: {StatusOcorrencia.INVESTIGANDO.value},
+    StatusOcorrencia.DESCARTADA.value: {StatusOcorrencia.INVESTIGANDO.value},
+}
+
+def allowed_previous_status(new_status: str) -> List[str]:
+    """Status a partir dos quais se pode ir para new_status (inclui o próprio)"""
+    return sorted({new_status} | {
+        origin for origin, targets in STATUS_TRANSITIONS.items() if new_status in targets
+    })
+
+# Ordem da fila de triagem; igual à expressão do índice IDX_OCORR_FILA
+SEVERITY_ORDER_SQL = (
+    "CASE GRAU_SEVERIDADE WHEN 'critica' THEN 0 WHEN 'alta' THEN 1 "
+    "WHEN 'media' THEN 2 ELSE 3 END"
+)
+
+def occurrence_etag(occurrence_id: int, versao: int) -> str:
+    """ETag forte de uma ocorrência (muda a cada atualização)"""
+    return f'"{occurrence_id}-{versao}"'
+
+# Raio médio da Terra e km por grau de latitude
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+def radius_bbox(lat: float, lng: float, raio_km: float) -> Dict[str, float]:
+    """Retângulo que contém o círculo (pré-filtro pelo índice LAT/LNG)"""
+    delta_lat = raio_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(lat))
+    delta_lng = 180.0 if cos_lat < 1e-6 else min(180.0, raio_km / (KM_PER_DEGREE * cos_lat))
+    return {
+        "min_lat": max(-90.0, lat - delta_lat),
+        "max_lat": min(90.0, lat + delta_lat),
+        "min_lng": lng - delta_lng,
+        "max_lng": lng + delta_lng
+    }
+
+def lng_clause(min_lng: float, max_lng: float, params: Dict[str, Any]) -> str:
+    """Filtro de longitude, tratando janelas que cruzam o antimeridiano"""
+    if max_lng - min_lng >= 360:
+        return "1 = 1"
+    min_lng = (min_lng + 180) % 360 - 180
+    max_lng = (max_lng + 180) % 360 - 180
+    params["min_lng"] = min_lng
+    params["max_lng"] = max_lng
+    if min_lng <= max_lng:
+        return "LNG BETWEEN :min_lng AND :max_lng"
+    return "(LNG >= :min_lng OR LNG <= :max_lng)"
+
+def owner_clause(usuario_id: Optional[int], params: Dict[str, Any]) -> str:
+    """Filtro opcional pelo dono da ocorrência (vazio quando usuario_id é None)"""
+    if usuario_id is None:
+        return ""
+    params["usuario_id"] = usuario_id
+    return "\n              AND USUARIO_ID = :usuario_id"
+
+def occurrence_params(occurrence_data: OccurrenceCreate, usuario_id: int) -> Dict[str, Any]:
+    """Binds do INSERT de uma nova ocorrência"""
+    coordenadas = occurrence_data.coordenadas
+    return {
+        "usuario_id": usuario_id,
+        "tipo_ocorrencia": occurrence_data.tipo_ocorrencia.value,
+        "localizacao": occurrence_data.localizacao,
+        "grau_severidade": occurrence_data.grau_severidade.value,
+        "descricao": occurrence_data.descricao,
+        "coordenadas": json.dumps(coordenadas) if coordenadas else None,
+        "imagens": json.dumps(occurrence_data.imagens) if occurrence_data.imagens else None,
+        "status": StatusOcorrencia.REPORTADA.value,
+        "lat": coordenadas["lat"] if coordenadas else None,
+        "lng": coordenadas["lng"] if coordenadas else None
+    }
+
+# INSERT em lote da sincronização offline (array DML)
+BATCH_INSERT_QUERY = """
+INSERT INTO OCORRENCIAS (
+    USUARIO_ID, TIPO_OCORRENCIA, LOCALIZACAO, GRAU_SEVERIDADE,
+    DESCRICAO, COORDENADAS, IMAGENS, STATUS, LAT, LNG, CHAVE_IDEMPOTENCIA
+) VALUES (
+    :usuario_id, :tipo_ocorrencia, :localizacao, :grau_severidade,
+    :descricao, :coordenadas, :imagens, :status, :lat, :lng, :chave_idempotencia
+)
+"""
+BATCH_INPUT_TYPES = {
+    "usuario_id": int, "tipo_ocorrencia": str, "localizacao": str, "grau_severidade": str,
+    "descricao": str, "coordenadas": str, "imagens": str, "status": str,
+    "lat": float, "lng": float, "chave_idempotencia": str
+}
+# Limite de itens numa lista IN do Oracle
+IN_LIST_LIMIT = 1000
+
 class OccurrenceService:
     """Serviço para gerenciar ocorrências ambientais no Oracle"""
     
     def __init__(self):
-        self.ensure_table_exists()
-    
-    def ensure_table_exists(self):
-        """Garantir que a tabela OCORRENCIAS existe no Oracle"""
-        try:
-            if not oracle_manager.check_table_exists("OCORRENCIAS"):
-                logger.warning("⚠️ Tabela OCORRENCIAS não encontrada, criando...")
-                self.create_occurrences_table()
-            else:
-                logger.info("✅ Tabela OCORRENCIAS existe")
-        except Exception as e:
-            logger.error(f"❌ Erro ao verificar tabela OCORRENCIAS: {e}")
-    
-    def create_occurrences_table(self):
-        """Criar tabela OCORRENCIAS no Oracle"""
-        try:
-            # Primeiro, verificar e remover constraints se existirem
-            try:
-                constraint_queries = [
-                    "ALTER TABLE OCORRENCIAS DROP CONSTRAINT FK_OCORRENCIAS_USUARIO",
-                    "ALTER TABLE OCORRENCIAS DROP CONSTRAINT CHK_TIPO_OCORRENCIA", 
-                    "ALTER TABLE OCORRENCIAS DROP CONSTRAINT CHK_SEVERIDADE",
-                    "ALTER TABLE OCORRENCIAS DROP CONSTRAINT CHK_STATUS",
-                    "ALTER TABLE OCORRENCIAS DROP CONSTRAINT FK_OCORRENCIAS_USR_V2",
-                    "ALTER TABLE OCORRENCIAS DROP CONSTRAINT CHK_TIPO_OCORR_V2",
-                    "ALTER TABLE OCORRENCIAS DROP CONSTRAINT CHK_SEVERIDADE_V2",
-                    "ALTER TABLE OCORRENCIAS DROP CONSTRAINT CHK_STATUS_V2"
-                ]
-                
-                for query in constraint_queries:
-                    try:
-                        oracle_manager.execute_insert(query, {})
-                    except Exception:
-                        # Ignorar se constraint não existir
-                        pass
-                        
-                logger.info("🔧 Constraints antigas removidas")
-            except Exception:
-                # Ignorar erros de constraints
-                pass
-            
-            # Remover tabela se existir
-            try:
-                drop_table_query = "DROP TABLE OCORRENCIAS"
-                oracle_manager.execute_insert(drop_table_query, {})
-                logger.info("🗑️ Tabela OCORRENCIAS anterior removida")
-            except Exception:
-                # Ignorar erro se tabela não existir
-                pass
-            
-            # Criar tabela com constraints únicos
-            import time
-            timestamp = str(int(time.time()))[-6:]  # Últimos 6 dígitos do timestamp
-            
-            create_table_query = f"""
-            CREATE TABLE OCORRENCIAS (
-                ID NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                USUARIO_ID NUMBER NOT NULL,
-                TIPO_OCORRENCIA VARCHAR2(50) NOT NULL,
-                LOCALIZACAO VARCHAR2(200) NOT NULL,
-                GRAU_SEVERIDADE VARCHAR2(20) NOT NULL,
-                DESCRICAO CLOB NOT NULL,
-                COORDENADAS CLOB,
-                IMAGENS CLOB,
-                STATUS VARCHAR2(20) DEFAULT 'reportada',
-                NOTAS_INVESTIGACAO CLOB,
-                NOTAS_RESOLUCAO CLOB,
-                DATA_CRIACAO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                DATA_ATUALIZACAO TIMESTAMP,
-                CONSTRAINT FK_OCORR_USR_{timestamp} FOREIGN KEY (USUARIO_ID) REFERENCES USUARIOS(ID),
-                CONSTRAINT CHK_TIPO_{timestamp} CHECK (TIPO_OCORRENCIA IN ('desmatamento', 'queimada', 'caca_pesca', 'enchente', 'poluicao', 'mineracao_ilegal')),
-                CONSTRAINT CHK_SEV_{timestamp} CHECK (GRAU_SEVERIDADE IN ('baixa', 'media', 'alta', 'critica')),
-                CONSTRAINT CHK_STAT_{timestamp} CHECK (STATUS IN ('reportada', 'investigando', 'confirmada', 'resolvida', 'descartada'))
-            )
-            """
-            
-            oracle_manager.execute_insert(create_table_query, {})
-            logger.info("✅ Tabela OCORRENCIAS criada com sucesso")
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao criar tabela OCORRENCIAS: {e}")
-            raise
+        # Leituras caras idênticas e simultâneas (painéis) viram uma só consulta
+        self.single_flight = SingleFlight("occurrences")
+        # Agregados dos painéis administrativos toleram alguns segundos de atraso
+        self.stats_cache = StaleWhileRevalidateCache(
+            "occurrence_stats",
+            maxsize=settings.STATS_CACHE_MAXSIZE,
+            soft_ttl=settings.STATS_CACHE_SOFT_TTL_SECONDS,
+            hard_ttl=settings.STATS_CACHE_HARD_TTL_SECONDS
+        )
     
     def create_occurrence(self, occurrence_data: OccurrenceCreate, usuario_id: int) -> Dict[str, Any]:
         """Criar nova ocorrência no Oracle"""
         try:
-            # Preparar dados
-            coordenadas_json = json.dumps(occurrence_data.coordenadas) if occurrence_data.coordenadas else None
-            imagens_json = json.dumps(occurrence_data.imagens) if occurrence_data.imagens else None
-            
-            # Query de inserção
+            # Query de inserção devolvendo ID e valores padrão do servidor
             insert_query = """
             INSERT INTO OCORRENCIAS (
                 USUARIO_ID, TIPO_OCORRENCIA, LOCALIZACAO, GRAU_SEVERIDADE, 
-                DESCRICAO, COORDENADAS, IMAGENS, STATUS
+                DESCRICAO, COORDENADAS, IMAGENS, STATUS, LAT, LNG
             ) VALUES (
                 :usuario_id, :tipo_ocorrencia, :localizacao, :grau_severidade,
-                :descricao, :coordenadas, :imagens, :status
+                :descricao, :coordenadas, :imagens, :status, :lat, :lng
             )
+            RETURNING ID, DATA_CRIACAO, DATA_ATUALIZACAO
+            INTO :out_id, :out_data_criacao, :out_data_atualizacao
             """
             
-            params = {
-                "usuario_id": usuario_id,
-                "tipo_ocorrencia": occurrence_data.tipo_ocorrencia.value,
-                "localizacao": occurrence_data.localizacao,
-                "grau_severidade": occurrence_data.grau_severidade.value,
-                "descricao": occurrence_data.descricao,
-                "coordenadas": coordenadas_json,
-                "imagens": imagens_json,
-                "status": StatusOcorrencia.REPORTADA.value
-            }
-            
-            # Executar inserção
-            oracle_manager.execute_insert(insert_query, params)
+            params = occurrence_params(occurrence_data, usuario_id)
             
-            # Buscar ocorrência criada
-            select_query = """
-            SELECT ID, USUARIO_ID, TIPO_OCORRENCIA, LOCALIZACAO, GRAU_SEVERIDADE,
-                   DESCRICAO, COORDENADAS, IMAGENS, STATUS, DATA_CRIACAO, DATA_ATUALIZACAO
-            FROM OCORRENCIAS 
-            WHERE USUARIO_ID = :usuario_id 
-            ORDER BY DATA_CRIACAO DESC 
-            FETCH FIRST 1 ROWS ONLY
-            """
-            
-            result = oracle_manager.execute_query(select_query, {"usuario_id": usuario_id})
+            # Executar inserção (uma única ida ao banco)
+            created = oracle_manager.execute_returning(
+                insert_query,
+                params,
+                {"out_id": int, "out_data_criacao": datetime, "out_data_atualizacao": datetime}
+            )
             
-            if not result:
+            if not created:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Erro ao recuperar ocorrência criada"
                 )
             
-            occurrence = result[0]
+            logger.info(f"✅ Ocorrência criada: ID {created['out_id']} - Tipo: {params['tipo_ocorrencia']}")
             
-            logger.info(f"✅ Ocorrência criada: ID {occurrence[0]} - Tipo: {occurrence[2]}")
+            # Clusters em cache dos tiles que contêm o ponto ficaram desatualizados
+            if params["lat"] is not None and params["lng"] is not None:
+                cluster_service.invalidate_point(params["lat"], params["lng"])
             
             return {
                 "success": True,
                 "message": "Ocorrência reportada com sucesso",
                 "data": {
-                    "id": occurrence[0],
-                    "usuario_id": occurrence[1],
-                    "tipo_ocorrencia": occurrence[2],
-                    "localizacao": occurrence[3],
-                    "grau_severidade": occurrence[4],
-                    "descricao": occurrence[5],
-                    "coordenadas": json.loads(occurrence[6]) if occurrence[6] else None,
-                    "imagens": json.loads(occurrence[7]) if occurrence[7] else [],
-                    "status": occurrence[8],
-                    "data_criacao": occurrence[9],
-                    "data_atualizacao": occurrence[10]
+                    "id": created["out_id"],
+                    "usuario_id": usuario_id,
+                    "tipo_ocorrencia": params["tipo_ocorrencia"],
+                    "localizacao": params["localizacao"],
+                    "grau_severidade": params["grau_severidade"],
+                    "descricao": params["descricao"],
+                    "coordenadas": occurrence_data.coordenadas,
+                    "imagens": occurrence_data.imagens or [],
+                    "status": params["status"],
+                    "data_criacao": created["out_data_criacao"],
+                    "data_atualizacao": created["out_data_atualizacao"],
+                    "versao": 1
                 }
             }
             
@@ -186,57 +332,591 @@ class OccurrenceService:
                 detail="Erro interno ao criar ocorrência"
             )
     
-    def get_user_occurrences(self, usuario_id: int) -> List[Dict[str, Any]]:
-        """Buscar ocorrências do usuário"""
+    def create_occurrences_batch(self, items: List[Dict[str, Any]], usuario_id: int) -> Dict[str, Any]:
+        """Inserir lote de ocorrências registradas offline
+        
+        Cada item é validado individualmente; os válidos vão ao Oracle num único
+        executemany (uma transação). Chaves já enviadas antes voltam como
+        "existente" com o ID original, sem duplicar a ocorrência.
+        """
+        if len(items) > settings.MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Lote excede o máximo de {settings.MAX_BATCH_SIZE} itens"
+            )
+        
+        try:
+            results: List[Dict[str, Any]] = []
+            rows: List[Dict[str, Any]] = []
+            row_results: List[Dict[str, Any]] = []
+            by_key: Dict[str, Dict[str, Any]] = {}
+            
+            # Validação em uma passada, sem abortar o lote
+            for index, raw_item in enumerate(items):
+                result = {
+                    "indice": index,
+                    "chave_idempotencia": raw_item.get("chave_idempotencia") if isinstance(raw_item, dict) else None
+                }
+                results.append(result)
+                
+                try:
+                    item = OccurrenceBatchItem.model_validate(raw_item)
+                except ValidationError as e:
+                    result["status"] = "invalida"
+                    result["erros"] = [
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                        for error in e.errors()
+                    ]
+                    continue
+                
+                if item.chave_idempotencia in by_key:
+                    result["status"] = "duplicada"
+                    result["erros"] = ["chave_idempotencia repetida no lote"]
+                    continue
+                
+                result["status"] = "criada"
+                by_key[item.chave_idempotencia] = result
+                rows.append({
+                    **occurrence_params(item, usuario_id),
+                    "chave_idempotencia": item.chave_idempotencia
+                })
+                row_results.append(result)
+            
+            # Array DML: linhas com erro não abortam as demais
+            for error in oracle_manager.execute_batch(BATCH_INSERT_QUERY, rows, BATCH_INPUT_TYPES):
+                result = row_results[error["offset"]]
+                if error["code"] == 1:
+                    result["status"] = "existente"
+                else:
+                    logger.warning(f"⚠️ Item {result['indice']} do lote rejeitado pelo Oracle: {error['message']}")
+                    result["status"] = "erro"
+                    result["erros"] = ["Erro ao gravar ocorrência"]
+            
+            # IDs das ocorrências criadas e das já existentes, pelas chaves
+            keys = [key for key, result in by_key.items() if result["status"] != "erro"]
+            for start in range(0, len(keys), IN_LIST_LIMIT):
+                chunk = keys[start:start + IN_LIST_LIMIT]
+                params = {"usuario_id": usuario_id}
+                params.update({f"chave_{i}": key for i, key in enumerate(chunk)})
+                placeholders = ", ".join(f":chave_{i}" for i in range(len(chunk)))
+                query = f"""
+                SELECT ID, CHAVE_IDEMPOTENCIA, DATA_CRIACAO
+                FROM OCORRENCIAS
+                WHERE CASE WHEN CHAVE_IDEMPOTENCIA IS NOT NULL THEN USUARIO_ID END = :usuario_id
+                AND CHAVE_IDEMPOTENCIA IN ({placeholders})
+                """
+                for occurrence_id, key, data_criacao in oracle_manager.execute_query(query, params):
+                    by_key[key]["id"] = occurrence_id
+                    by_key[key]["data_criacao"] = data_criacao
+            
+            created = 0
+            for row, result in zip(rows, row_results):
+                if result["status"] != "criada":
+                    continue
+                created += 1
+                if row["lat"] is not None and row["lng"] is not None:
+                    cluster_service.invalidate_point(row["lat"], row["lng"])
+            
+            summary = {
+                "total": len(results),
+                "criadas": created,
+                "existentes": sum(1 for result in results if result["status"] == "existente"),
+                "falhas": sum(1 for result in results if result["status"] in ("invalida", "duplicada", "erro")),
+                "itens": results
+            }
+            logger.info(
+                f"✅ Lote de ocorrências do usuário {usuario_id}: {summary['criadas']} criadas, "
+                f"{summary['existentes']} existentes, {summary['falhas']} falhas"
+            )
+            return summary
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao criar lote de ocorrências: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro interno ao sincronizar ocorrências"
+            )
+    
+    def get_occurrence(self, occurrence_id: int) -> Dict[str, Any]:
+        """Buscar uma ocorrência pelo ID, com as notas de triagem"""
+        try:
+            query = f"""
+            SELECT {OCCURRENCE_COLUMNS}, NOTAS_INVESTIGACAO, NOTAS_RESOLUCAO
+            FROM OCORRENCIAS
+            WHERE ID = :id
+            """
+            result = oracle_manager.execute_query(query, {"id": occurrence_id})
+            if not result:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Ocorrência não encontrada"
+                )
+            
+            row = result[0]
+            occurrence = row_to_occurrence(row)
+            occurrence["notas_investigacao"] = row[12]
+            occurrence["notas_resolucao"] = row[13]
+            return occurrence
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao buscar ocorrência {occurrence_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao buscar ocorrência"
+            )
+    
+    def update_occurrence(self, occurrence_id: int, update: OccurrenceUpdate, versao: int) -> Dict[str, Any]:
+        """Atualizar status/notas se a versão ainda for `versao` (concorrência otimista)
+        
+        Um único UPDATE ... RETURNING: incrementa VERSAO, grava DATA_ATUALIZACAO
+        e devolve a linha nova, sem bloquear a linha entre leitura e escrita.
+        Versão desatualizada -> 412; transição de status inválida -> 409.
+        """
+        changes = update.model_dump(exclude_unset=True, exclude_none=True, exclude={"versao"})
+        if not changes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Nenhum campo para atualizar"
+            )
+        
+        try:
+            params: Dict[str, Any] = {"id": occurrence_id, "versao": versao}
+            assignments = []
+            for column in ("status", "notas_investigacao", "notas_resolucao"):
+                if column in changes:
+                    value = changes[column]
+                    params[column] = value.value if isinstance(value, StatusOcorrencia) else value
+                    assignments.append(f"{column.upper()} = :{column}")
+            
+            status_guard = ""
+            if "status" in params:
+                previous = allowed_previous_status(params["status"])
+                params.update({f"from_{i}": value for i, value in enumerate(previous)})
+                status_guard = "AND STATUS IN ({})".format(", ".join(f":from_{i}" for i in range(len(previous))))
+            
+            returning_columns = ", ".join(UPDATE_RETURNING)
+            returning_binds = ", ".join(f":out_{column.lower()}" for column in UPDATE_RETURNING)
+            query = f"""
+            UPDATE OCORRENCIAS
+            SET {", ".join(assignments)},
+                VERSAO = VERSAO + 1,
+                DATA_ATUALIZACAO = LOCALTIMESTAMP
+            WHERE ID = :id AND VERSAO = :versao {status_guard}
+            RETURNING {returning_columns}
+            INTO {returning_binds}
+            """
+            
+            updated = oracle_manager.execute_returning(
+                query,
+                params,
+                {f"out_{column.lower()}": py_type for column, py_type in UPDATE_RETURNING.items()}
+            )
+            
+            if not updated:
+                self._raise_update_conflict(occurrence_id, versao)
+            
+            row = [updated[f"out_{column.lower()}"] for column in UPDATE_RETURNING]
+            occurrence = row_to_occurrence(row)
+            occurrence["notas_investigacao"] = row[12]
+            occurrence["notas_resolucao"] = row[13]
+            
+            # Descartar/restaurar muda o que aparece nos clusters do mapa
+            if row[14] is not None and row[15] is not None:
+                cluster_service.invalidate_point(row[14], row[15])
+            
+            logger.info(f"✅ Ocorrência {occurrence_id} atualizada para a versão {occurrence['versao']}")
+            return occurrence
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao atualizar ocorrência {occurrence_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro interno ao atualizar ocorrência"
+            )
+    
+    def _raise_update_conflict(self, occurrence_id: int, versao: int):
+        """Explicar por que o UPDATE condicional não afetou nenhuma linha"""
+        result = oracle_manager.execute_query(
+            "SELECT VERSAO, STATUS FROM OCORRENCIAS WHERE ID = :id",
+            {"id": occurrence_id}
+        )
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ocorrência não encontrada"
+            )
+        
+        current_version, current_status = result[0]
+        if current_version != versao:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Ocorrência alterada por outra pessoa; recarregue e tente novamente",
+                headers={"ETag": occurrence_etag(occurrence_id, current_version)}
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Transição de status inválida a partir de '{current_status}'"
+        )
+    
+    def attach_images(self, occurrence_id: int, urls: List[str]) -> Dict[str, Any]:
+        """Acrescentar URLs de imagens à ocorrência
+        
+        Leitura + UPDATE condicionado à VERSAO, repetido se outra escrita
+        acontecer no meio (mesma concorrência otimista do PATCH).
+        """
+        try:
+            for _ in range(3):
+                result = oracle_manager.execute_query(
+                    "SELECT IMAGENS, VERSAO FROM OCORRENCIAS WHERE ID = :id",
+                    {"id": occurrence_id}
+                )
+                if not result:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Ocorrência não encontrada"
+                    )
+                
+                imagens_atuais, versao = result[0]
+                imagens = json.loads(imagens_atuais) if imagens_atuais else []
+                imagens += [url for url in urls if url not in imagens]
+                imagens_json = json.dumps(imagens)
+                
+                if len(imagens) > settings.MAX_IMAGES_PER_OCCURRENCE or len(imagens_json.encode()) > IMAGENS_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Limite de {settings.MAX_IMAGES_PER_OCCURRENCE} imagens por ocorrência"
+                    )
+                
+                updated = oracle_manager.execute_update(
+                    """
+                    UPDATE OCORRENCIAS
+                    SET IMAGENS = :imagens, VERSAO = VERSAO + 1, DATA_ATUALIZACAO = LOCALTIMESTAMP
+                    WHERE ID = :id AND VERSAO = :versao
+                    """,
+                    {"imagens": imagens_json, "id": occurrence_id, "versao": versao}
+                )
+                if updated:
+                    return {"imagens": imagens, "versao": versao + 1}
+            
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Ocorrência em edição simultânea; tente novamente"
+            )
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao anexar imagens à ocorrência {occurrence_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao anexar imagens"
+            )
+    
+    def claim_occurrences(self, responsavel_id: int, quantidade: int) -> List[Dict[str, Any]]:
+        """Reservar as próximas `quantidade` ocorrências reportadas e livres
+        
+        Mais severas e mais antigas primeiro. SKIP LOCKED faz investigadores
+        simultâneos pegarem linhas diferentes sem esperar uns pelos outros; a
+        reserva vale por QUEUE_LEASE_SECONDS e depois volta para a fila.
+        """
+        try:
+            quantidade = max(1, min(quantidade, settings.QUEUE_MAX_CLAIM))
+            
+            select_query = f"""
+            SELECT ID
+            FROM OCORRENCIAS
+            WHERE STATUS = :status
+            AND (RESPONSAVEL_ID IS NULL OR LEASE_EXPIRA_EM IS NULL OR LEASE_EXPIRA_EM < LOCALTIMESTAMP)
+            ORDER BY {SEVERITY_ORDER_SQL}, DATA_CRIACAO, ID
+            FOR UPDATE SKIP LOCKED
+            """
+            update_query = """
+            UPDATE OCORRENCIAS
+            SET RESPONSAVEL_ID = :responsavel_id,
+                LEASE_EXPIRA_EM = LOCALTIMESTAMP + NUMTODSINTERVAL(:lease_seconds, 'SECOND')
+            WHERE ID = :id
+            """
+            
+            claimed_ids = oracle_manager.claim_rows(
+                select_query,
+                {"status": StatusOcorrencia.REPORTADA.value},
+                quantidade,
+                update_query,
+                {"responsavel_id": responsavel_id, "lease_seconds": settings.QUEUE_LEASE_SECONDS}
+            )
+            if not claimed_ids:
+                return []
+            
+            params = {f"id_{i}": occurrence_id for i, occurrence_id in enumerate(claimed_ids)}
+            query = f"""
+            SELECT {OCCURRENCE_COLUMNS}, LEASE_EXPIRA_EM
+            FROM OCORRENCIAS
+            WHERE ID IN ({", ".join(f":id_{i}" for i in range(len(claimed_ids)))})
+            ORDER BY {SEVERITY_ORDER_SQL}, DATA_CRIACAO, ID
+            """
+            
+            occurrences = []
+            for row in oracle_manager.execute_query(query, params):
+                occurrence = row_to_occurrence(row)
+                occurrence["lease_expira_em"] = row[12]
+                occurrences.append(occurrence)
+            
+            logger.info(f"📥 Usuário {responsavel_id} reservou {len(occurrences)} ocorrências da fila")
+            return occurrences
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao reservar ocorrências da fila: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao reservar ocorrências"
+            )
+    
+    def release_occurrences(self, responsavel_id: int, occurrence_ids: List[int]) -> int:
+        """Devolver à fila ocorrências reservadas pelo próprio usuário"""
+        try:
+            params: Dict[str, Any] = {"responsavel_id": responsavel_id}
+            params.update({f"id_{i}": occurrence_id for i, occurrence_id in enumerate(occurrence_ids)})
+            query = f"""
+            UPDATE OCORRENCIAS
+            SET RESPONSAVEL_ID = NULL, LEASE_EXPIRA_EM = NULL
+            WHERE RESPONSAVEL_ID = :responsavel_id
+            AND ID IN ({", ".join(f":id_{i}" for i in range(len(occurrence_ids)))})
+            """
+            
+            released = oracle_manager.execute_update(query, params)
+            
+            logger.info(f"📤 Usuário {responsavel_id} devolveu {released} ocorrências à fila")
+            return released
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao devolver ocorrências à fila: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao devolver ocorrências"
+            )
+    
+    def get_user_occurrences(
+        self,
+        usuario_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Buscar página de ocorrências do usuário (keyset por DATA_CRIACAO, ID)"""
         try:
-            query = """
-            SELECT ID, USUARIO_ID, TIPO_OCORRENCIA, LOCALIZACAO, GRAU_SEVERIDADE,
-                   DESCRICAO, COORDENADAS, IMAGENS, STATUS, DATA_CRIACAO, DATA_ATUALIZACAO
+            page_size = resolve_page_size(limit)
+            params = {"usuario_id": usuario_id, "fetch_rows": page_size + 1}
+            keyset = keyset_clause(cursor, params)
+            
+            query = f"""
+            SELECT {OCCURRENCE_COLUMNS}
             FROM OCORRENCIAS 
-            WHERE USUARIO_ID = :usuario_id 
-            ORDER BY DATA_CRIACAO DESC
+            WHERE USUARIO_ID = :usuario_id {keyset}
+            ORDER BY DATA_CRIACAO DESC, ID DESC
+            FETCH FIRST :fetch_rows ROWS ONLY
             """
             
-            results = oracle_manager.execute_query(query, {"usuario_id": usuario_id})
+            rows = oracle_manager.execute_query(query, params)
+            results = rows[:page_size]
+            next_cursor = encode_cursor(results[-1][9], results[-1][0]) if len(rows) > page_size else None
+            
+            occurrences = [row_to_occurrence(row) for row in results]
+            
+            return {"items": occurrences, "next_cursor": next_cursor}
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao buscar ocorrências: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao buscar ocorrências"
+            )
+    
+    def get_user_occurrence_changes(
+        self,
+        usuario_id: int,
+        since: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Ocorrências do usuário criadas ou alteradas após a marca `since`
+        
+        Descartadas voltam como tombstones ({"id", "data_atualizacao"}).
+        `next_since` é a marca a enviar na próxima sincronização.
+        """
+        try:
+            page_size = settings.MAX_PAGE_SIZE if not limit else resolve_page_size(limit)
+            params = {
+                "usuario_id": usuario_id,
+                "settle_seconds": SYNC_SETTLE_SECONDS,
+                "fetch_rows": page_size + 1
+            }
+            watermark = since_clause(since, params)
+            
+            query = f"""
+            SELECT {OCCURRENCE_COLUMNS}
+            FROM OCORRENCIAS
+            WHERE USUARIO_ID = :usuario_id
+            AND DATA_ATUALIZACAO <= LOCALTIMESTAMP - NUMTODSINTERVAL(:settle_seconds, 'SECOND') {watermark}
+            ORDER BY DATA_ATUALIZACAO, ID
+            FETCH FIRST :fetch_rows ROWS ONLY
+            """
+            
+            rows = oracle_manager.execute_query(query, params)
+            results = rows[:page_size]
+            
+            changed = []
+            removed = []
+            for row in results:
+                if row[8] == StatusOcorrencia.DESCARTADA.value:
+                    removed.append({"id": row[0], "data_atualizacao": row[10]})
+                else:
+                    changed.append(row_to_occurrence(row))
+            
+            return {
+                "alteradas": changed,
+                "removidas": removed,
+                "next_since": encode_cursor(results[-1][10], results[-1][0]) if results else since,
+                "has_more": len(rows) > page_size
+            }
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erro ao buscar alterações de ocorrências: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao buscar alterações de ocorrências"
+            )
+    
+    def get_user_occurrences_etag(self, usuario_id: int, *request_parts, settled: bool = False) -> str:
+        """ETag da coleção do usuário (muda a cada inserção, alteração ou remoção)
+        
+        Consulta só o índice (USUARIO_ID, DATA_ATUALIZACAO, ID); com `settled`
+        considera apenas as linhas já visíveis em get_user_occurrence_changes.
+        """
+        params = {"usuario_id": usuario_id}
+        settle = ""
+        if settled:
+            params["settle_seconds"] = SYNC_SETTLE_SECONDS
+            settle = "AND DATA_ATUALIZACAO <= LOCALTIMESTAMP - NUMTODSINTERVAL(:settle_seconds, 'SECOND')"
+        
+        query = f"""
+        SELECT COUNT(*), MAX(DATA_ATUALIZACAO), MAX(ID)
+        FROM OCORRENCIAS
+        WHERE USUARIO_ID = :usuario_id {settle}
+        """
+        total, last_update, last_id = oracle_manager.execute_query(query, params)[0]
+        return strong_etag(usuario_id, total, last_update, last_id, *request_parts)
+    
+    def get_all_occurrences(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Buscar página de todas as ocorrências (admin)"""
+        try:
+            page_size = resolve_page_size(limit)
+            params = {"fetch_rows": page_size + 1}
+            keyset = keyset_clause(cursor, params, alias="o.")
+            
+            query = f"""
+            SELECT o.ID, o.USUARIO_ID, u.NOME as USUARIO_NOME, o.TIPO_OCORRENCIA, 
+                   o.LOCALIZACAO, o.GRAU_SEVERIDADE, o.DESCRICAO, o.COORDENADAS, 
+                   o.IMAGENS, o.STATUS, o.DATA_CRIACAO, o.DATA_ATUALIZACAO, o.VERSAO
+            FROM OCORRENCIAS o
+            LEFT JOIN USUARIOS u ON o.USUARIO_ID = u.ID
+            WHERE 1 = 1 {keyset}
+            ORDER BY o.DATA_CRIACAO DESC, o.ID DESC
+            FETCH FIRST :fetch_rows ROWS ONLY
+            """
+            
+            rows = oracle_manager.execute_query(
+                query, params, cache_tables=("OCORRENCIAS", "USUARIOS")
+            )
+            results = rows[:page_size]
+            next_cursor = encode_cursor(results[-1][10], results[-1][0]) if len(rows) > page_size else None
             
             occurrences = []
             for row in results:
                 occurrences.append({
                     "id": row[0],
                     "usuario_id": row[1],
-                    "tipo_ocorrencia": row[2],
-                    "localizacao": row[3],
-                    "grau_severidade": row[4],
-                    "descricao": row[5],
-                    "coordenadas": json.loads(row[6]) if row[6] else None,
-                    "imagens": json.loads(row[7]) if row[7] else [],
-                    "status": row[8],
-                    "data_criacao": row[9],
-                    "data_atualizacao": row[10]
+                    "usuario_nome": row[2],
+                    "tipo_ocorrencia": row[3],
+                    "localizacao": row[4],
+                    "grau_severidade": row[5],
+                    "descricao": row[6],
+                    "coordenadas": json.loads(row[7]) if row[7] else None,
+                    "imagens": json.loads(row[8]) if row[8] else [],
+                    "status": row[9],
+                    "data_criacao": row[10],
+                    "data_atualizacao": row[11],
+                    "versao": row[12]
                 })
             
-            return occurrences
+            return {"items": occurrences, "next_cursor": next_cursor}
             
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"❌ Erro ao buscar ocorrências: {e}")
+            logger.error(f"❌ Erro ao buscar todas as ocorrências: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Erro ao buscar ocorrências"
             )
-    
-    def get_all_occurrences(self) -> List[Dict[str, Any]]:
-        """Buscar todas as ocorrências (admin)"""
+
+    def search_occurrences(
+        self,
+        termos: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        status_filtro: Optional[str] = None,
+        tipo_ocorrencia: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Busca textual em DESCRICAO e LOCALIZACAO (admin), por relevância
+        
+        Usa o índice Oracle Text IDX_OCORR_TEXTO: sem acentos e por radical
+        em português. Páginas por deslocamento, já que a ordem é pelo SCORE.
+        """
         try:
-            query = """
+            page_size = resolve_page_size(limit)
+            offset = decode_offset_cursor(cursor)
+            params: Dict[str, Any] = {
+                "text_query": text_search_query(termos),
+                "offset": offset,
+                "fetch_rows": page_size + 1
+            }
+            
+            filters = ""
+            if status_filtro:
+                filters += " AND o.STATUS = :status"
+                params["status"] = status_filtro
+            if tipo_ocorrencia:
+                filters += " AND o.TIPO_OCORRENCIA = :tipo_ocorrencia"
+                params["tipo_ocorrencia"] = tipo_ocorrencia
+            
+            query = f"""
             SELECT o.ID, o.USUARIO_ID, u.NOME as USUARIO_NOME, o.TIPO_OCORRENCIA, 
                    o.LOCALIZACAO, o.GRAU_SEVERIDADE, o.DESCRICAO, o.COORDENADAS, 
-                   o.IMAGENS, o.STATUS, o.DATA_CRIACAO, o.DATA_ATUALIZACAO
+                   o.IMAGENS, o.STATUS, o.DATA_CRIACAO, o.DATA_ATUALIZACAO, o.VERSAO, SCORE(1)
             FROM OCORRENCIAS o
             LEFT JOIN USUARIOS u ON o.USUARIO_ID = u.ID
-            ORDER BY o.DATA_CRIACAO DESC
+            WHERE CONTAINS(o.DESCRICAO, :text_query, 1) > 0 {filters}
+            ORDER BY SCORE(1) DESC, o.ID DESC
+            OFFSET :offset ROWS FETCH NEXT :fetch_rows ROWS ONLY
             """
             
-            results = oracle_manager.execute_query(query, {})
+            rows = oracle_manager.execute_query(query, params)
+            results = rows[:page_size]
+            next_cursor = str(offset + page_size) if len(rows) > page_size else None
             
             occurrences = []
             for row in results:
@@ -252,17 +932,381 @@ class OccurrenceService:
                     "imagens": json.loads(row[8]) if row[8] else [],
                     "status": row[9],
                     "data_criacao": row[10],
-                    "data_atualizacao": row[11]
+                    "data_atualizacao": row[11],
+                    "versao": row[12],
+                    "relevancia": row[13]
                 })
             
-            return occurrences
+            return {"items": occurrences, "next_cursor": next_cursor}
             
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"❌ Erro ao buscar todas as ocorrências: {e}")
+            logger.error(f"❌ Erro na busca textual de ocorrências: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Erro ao buscar ocorrências"
             )
 
+    def get_occurrences_in_bbox(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        limit: Optional[int] = None,
+        usuario_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Ocorrências dentro do retângulo do mapa (índice LAT/LNG), mais recentes primeiro
+        
+        Com `usuario_id`, só as ocorrências desse usuário.
+        """
+        try:
+            params: Dict[str, Any] = {
+                "min_lat": min_lat,
+                "max_lat": max_lat,
+                "fetch_rows": resolve_page_size(limit)
+            }
+            lng_filter = lng_clause(min_lng, max_lng, params)
+            user_filter = owner_clause(usuario_id, params)
+            
+            query = f"""
+            SELECT {OCCURRENCE_COLUMNS}
+            FROM OCORRENCIAS
+            WHERE LAT BETWEEN :min_lat AND :max_lat
+              AND {lng_filter}{user_filter}
+            ORDER BY DATA_CRIACAO DESC, ID DESC
+            FETCH FIRST :fetch_rows ROWS ONLY
+            """
+            
+            results = oracle_manager.execute_query(query, params)
+            return [row_to_occurrence(row) for row in results]
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao buscar ocorrências por área: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao buscar ocorrências por área"
+            )
+    
+    def get_occurrences_near(
+        self,
+        lat: float,
+        lng: float,
+        raio_km: float,
+        limit: Optional[int] = None,
+        usuario_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Ocorrências num raio (km), da mais próxima para a mais distante
+        
+        O retângulo envolvente usa o índice LAT/LNG; a distância exata
+        (haversine) só é calculada para as linhas dentro dele. Com
+        `usuario_id`, só as ocorrências desse usuário.
+        """
+        try:
+            bbox = radius_bbox(lat, lng, raio_km)
+            params: Dict[str, Any] = {
+                "lat": lat,
+                "lng": lng,
+                "raio_km": raio_km,
+                "rad": math.pi / 180,
+                "earth_radius": EARTH_RADIUS_KM,
+                "min_lat": bbox["min_lat"],
+                "max_lat": bbox["max_lat"],
+                "fetch_rows": resolve_page_size(limit)
+            }
+            lng_filter = lng_clause(bbox["min_lng"], bbox["max_lng"], params)
+            user_filter = owner_clause(usuario_id, params)
+            
+            query = f"""
+            SELECT * FROM (
+                SELECT {OCCURRENCE_COLUMNS},
+                       2 * :earth_radius * ASIN(SQRT(
+                           POWER(SIN((LAT - :lat) * :rad / 2), 2) +
+                           COS(:lat * :rad) * COS(LAT * :rad) * POWER(SIN((LNG - :lng) * :rad / 2), 2)
+                       )) AS DISTANCIA_KM
+                FROM OCORRENCIAS
+                WHERE LAT BETWEEN :min_lat AND :max_lat
+                  AND {lng_filter}{user_filter}
+            )
+            WHERE DISTANCIA_KM <= :raio_km
+            ORDER BY DISTANCIA_KM
+            FETCH FIRST :fetch_rows ROWS ONLY
+            """
+            
+            results = oracle_manager.execute_query(query, params)
+            
+            occurrences = []
+            for row in results:
+                occurrence = row_to_occurrence(row)
+                occurrence["distancia_km"] = round(float(row[12]), 3)
+                occurrences.append(occurrence)
+            
+            return occurrences
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao buscar ocorrências próximas: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao buscar ocorrências próximas"
+            )
+    
+    def get_occurrence_stats(
+        self,
+        usuario_id: Optional[int] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        territorio_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Contagens por tipo, severidade e status em uma única consulta GROUPING SETS
+        
+        Sem usuario_id, retorna a visão geral (admin), opcionalmente filtrada
+        por intervalo de datas (inclusivo) e território do autor.
+        """
+        try:
+            filters = []
+            params: Dict[str, Any] = {}
+            join = ""
+            
+            if usuario_id is not None:
+                filters.append("o.USUARIO_ID = :usuario_id")
+                params["usuario_id"] = usuario_id
+            if territorio_id is not None:
+                join = "JOIN USUARIOS u ON o.USUARIO_ID = u.ID"
+                filters.append("u.TERRITORIO_ID = :territorio_id")
+                params["territorio_id"] = territorio_id
+            if data_inicio is not None:
+                filters.append("o.DATA_CRIACAO >= :data_inicio")
+                params["data_inicio"] = datetime.combine(data_inicio, datetime.min.time())
+            if data_fim is not None:
+                filters.append("o.DATA_CRIACAO < :data_fim + 1")
+                params["data_fim"] = datetime.combine(data_fim, datetime.min.time())
+            
+            where = f"WHERE {' AND '.join(filters)}" if filters else ""
+            
+            query = f"""
+            SELECT o.TIPO_OCORRENCIA, o.GRAU_SEVERIDADE, o.STATUS,
+                   GROUPING(o.TIPO_OCORRENCIA), GROUPING(o.GRAU_SEVERIDADE), GROUPING(o.STATUS),
+                   COUNT(*)
+            FROM OCORRENCIAS o
+            {join}
+            {where}
+            GROUP BY GROUPING SETS ((o.TIPO_OCORRENCIA), (o.GRAU_SEVERIDADE), (o.STATUS), ())
+            """
+            
+            results = oracle_manager.execute_query(query, params)
+            
+            stats = {
+                "total": 0,
+                "por_tipo": {},
+                "por_severidade": {},
+                "por_status": {}
+            }
+            
+            for tipo, severidade, status_occ, g_tipo, g_severidade, g_status, total in results:
+                if not g_tipo:
+                    stats["por_tipo"][tipo] = total
+                elif not g_severidade:
+                    stats["por_severidade"][severidade] = total
+                elif not g_status:
+                    stats["por_status"][status_occ] = total
+                else:
+                    stats["total"] = total
+            
+            return stats
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao calcular estatísticas de ocorrências: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao calcular estatísticas"
+            )
+    
+    def get_territory_counts(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """Contagem de ocorrências por território do autor, com quebra por status
+        
+        Territórios sem ocorrências no período aparecem com total 0.
+        """
+        try:
+            filters = ""
+            params: Dict[str, Any] = {}
+            if data_inicio is not None:
+                filters += " AND o.DATA_CRIACAO >= :data_inicio"
+                params["data_inicio"] = datetime.combine(data_inicio, datetime.min.time())
+            if data_fim is not None:
+                filters += " AND o.DATA_CRIACAO < :data_fim + 1"
+                params["data_fim"] = datetime.combine(data_fim, datetime.min.time())
+            
+            query = f"""
+            SELECT t.ID, t.NOME, o.STATUS, COUNT(o.ID)
+            FROM TERRITORIOS t
+            LEFT JOIN USUARIOS u ON u.TERRITORIO_ID = t.ID
+            LEFT JOIN OCORRENCIAS o ON o.USUARIO_ID = u.ID {filters}
+            GROUP BY t.ID, t.NOME, o.STATUS
+            """
+            
+            territories: Dict[int, Dict[str, Any]] = {}
+            for territorio_id, nome, status_occ, total in oracle_manager.execute_query(query, params):
+                territory = territories.setdefault(territorio_id, {
+                    "territorio_id": territorio_id,
+                    "territorio_nome": nome,
+                    "total": 0,
+                    "por_status": {}
+                })
+                if status_occ is not None:
+                    territory["total"] += total
+                    territory["por_status"][status_occ] = total
+            
+            return sorted(territories.values(), key=lambda territory: (-territory["total"], territory["territorio_id"]))
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao contar ocorrências por território: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro ao calcular estatísticas por território"
+            )
+    
+    async def create_occurrence_async(self, occurrence_data: OccurrenceCreate, usuario_id: int) -> Dict[str, Any]:
+        """Versão assíncrona de create_occurrence"""
+        return await oracle_manager.run_async(self.create_occurrence, occurrence_data, usuario_id)
+    
+    async def create_occurrences_batch_async(self, items: List[Dict[str, Any]], usuario_id: int) -> Dict[str, Any]:
+        """Versão assíncrona de create_occurrences_batch"""
+        return await oracle_manager.run_async(self.create_occurrences_batch, items, usuario_id)
+    
+    async def get_occurrence_async(self, occurrence_id: int) -> Dict[str, Any]:
+        """Versão assíncrona de get_occurrence"""
+        return await oracle_manager.run_async(self.get_occurrence, occurrence_id)
+    
+    async def update_occurrence_async(self, occurrence_id: int, update: OccurrenceUpdate, versao: int) -> Dict[str, Any]:
+        """Versão assíncrona de update_occurrence"""
+        return await oracle_manager.run_async(self.update_occurrence, occurrence_id, update, versao)
+    
+    async def attach_images_async(self, occurrence_id: int, urls: List[str]) -> Dict[str, Any]:
+        """Versão assíncrona de attach_images"""
+        return await oracle_manager.run_async(self.attach_images, occurrence_id, urls)
+    
+    async def claim_occurrences_async(self, responsavel_id: int, quantidade: int) -> List[Dict[str, Any]]:
+        """Versão assíncrona de claim_occurrences"""
+        return await oracle_manager.run_async(self.claim_occurrences, responsavel_id, quantidade)
+    
+    async def release_occurrences_async(self, responsavel_id: int, occurrence_ids: List[int]) -> int:
+        """Versão assíncrona de release_occurrences"""
+        return await oracle_manager.run_async(self.release_occurrences, responsavel_id, occurrence_ids)
+    
+    async def get_user_occurrences_async(
+        self,
+        usuario_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Versão assíncrona de get_user_occurrences"""
+        return await oracle_manager.run_async(self.get_user_occurrences, usuario_id, limit, cursor)
+    
+    async def get_user_occurrence_changes_async(
+        self,
+        usuario_id: int,
+        since: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Versão assíncrona de get_user_occurrence_changes"""
+        return await oracle_manager.run_async(self.get_user_occurrence_changes, usuario_id, since, limit)
+    
+    async def get_user_occurrences_etag_async(self, usuario_id: int, *request_parts, settled: bool = False) -> str:
+        """Versão assíncrona de get_user_occurrences_etag"""
+        return await oracle_manager.run_async(
+            self.get_user_occurrences_etag, usuario_id, *request_parts, settled=settled
+        )
+    
+    async def get_all_occurrences_async(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Versão assíncrona de get_all_occurrences (chamadas idênticas agrupadas)"""
+        return await self.single_flight.run(
+            ("all", limit, cursor),
+            oracle_manager.run_async, self.get_all_occurrences, limit, cursor
+        )
+
+    async def search_occurrences_async(
+        self,
+        termos: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        status_filtro: Optional[str] = None,
+        tipo_ocorrencia: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Versão assíncrona de search_occurrences"""
+        return await oracle_manager.run_async(
+            self.search_occurrences, termos, limit, cursor, status_filtro, tipo_ocorrencia
+        )
+
+    async def get_occurrence_stats_async(
+        self,
+        usuario_id: Optional[int] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        territorio_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Versão assíncrona de get_occurrence_stats
+        
+        A visão geral (sem usuario_id) vem do stats_cache; as estatísticas do
+        próprio usuário são sempre atuais, só com chamadas idênticas agrupadas.
+        """
+        if usuario_id is None:
+            return await self.stats_cache.get(
+                ("stats", data_inicio, data_fim, territorio_id),
+                lambda: oracle_manager.run_async(
+                    self.get_occurrence_stats, None, data_inicio, data_fim, territorio_id
+                )
+            )
+        return await self.single_flight.run(
+            ("stats", usuario_id, data_inicio, data_fim, territorio_id),
+            oracle_manager.run_async, self.get_occurrence_stats, usuario_id, data_inicio, data_fim, territorio_id
+        )
+    
+    async def get_territory_counts_async(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """Versão assíncrona de get_territory_counts (servida pelo stats_cache)"""
+        return await self.stats_cache.get(
+            ("territorios", data_inicio, data_fim),
+            lambda: oracle_manager.run_async(self.get_territory_counts, data_inicio, data_fim)
+        )
+
+    async def get_occurrences_in_bbox_async(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        limit: Optional[int] = None,
+        usuario_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Versão assíncrona de get_occurrences_in_bbox"""
+        return await oracle_manager.run_async(
+            self.get_occurrences_in_bbox, min_lat, min_lng, max_lat, max_lng, limit, usuario_id
+        )
+    
+    async def get_occurrences_near_async(
+        self,
+        lat: float,
+        lng: float,
+        raio_km: float,
+        limit: Optional[int] = None,
+        usuario_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Versão assíncrona de get_occurrences_near"""
+        return await oracle_manager.run_async(
+            self.get_occurrences_near, lat, lng, raio_km, limit, usuario_id
+        )
+
 # Instância global do serviço
 occurrence_service = OccurrenceService() 
\ No newline at end of file
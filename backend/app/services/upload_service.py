@@ -0,0 +1,213 @@
+import os
+import re
+import json
+import time
+import uuid
+import fcntl
+import logging
+from typing import Dict, Any, AsyncIterator, Callable, Optional
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from .image_service import image_service
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# IDs gerados por create (uuid4().hex); nada fora disso vira caminho em disco
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+class ResumableUploadService:
+    """Uploads retomáveis no estilo tus (criar, PATCH por offset, HEAD de progresso)
+
+    Cada upload é um arquivo de dados em UPLOAD_DIR/resumable/<id> mais um
+    <id>.json com os metadados. O offset é o tamanho do arquivo em disco, então
+    qualquer worker da API continua o upload de onde ele parou.
+
+    Concluído, o arquivo vai para o armazenamento de imagens e o <id>.json
+    guarda o resultado até expirar: um cliente que perdeu a resposta final
+    repete o PATCH (ou faz HEAD) e recebe o mesmo desfecho.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.join(root, "resumable")
+
+    def _data_path(self, upload_id: str) -> str:
+        return os.path.join(self.root, upload_id)
+
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.root, f"{upload_id}.json")
+
+    def _expire_stale(self):
+        """Remover uploads abandonados há mais de RESUMABLE_UPLOAD_EXPIRATION_HOURS"""
+        limit = time.time() - settings.RESUMABLE_UPLOAD_EXPIRATION_HOURS * 3600
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if os.path.getmtime(path) < limit:
+                    os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def create(self, occurrence_id: int, usuario_id: int, length: int) -> str:
+        """Registrar novo upload de `length` bytes para a ocorrência"""
+        if length <= 0 or length > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload-Length deve estar entre 1 e {settings.MAX_FILE_SIZE} bytes"
+            )
+
+        os.makedirs(self.root, exist_ok=True)
+        self._expire_stale()
+
+        upload_id = uuid.uuid4().hex
+        with open(self._meta_path(upload_id), "w") as meta:
+            json.dump({"occurrence_id": occurrence_id, "usuario_id": usuario_id, "length": length}, meta)
+        open(self._data_path(upload_id), "wb").close()
+
+        logger.info(f"📤 Upload retomável {upload_id} criado ({length} bytes) para ocorrência {occurrence_id}")
+        return upload_id
+
+    def _check_id(self, upload_id: str):
+        if not UPLOAD_ID_PATTERN.match(upload_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload não encontrado ou expirado"
+            )
+
+    def get(self, upload_id: str, usuario_id: int) -> Dict[str, Any]:
+        """Metadados e offset atual de um upload do usuário"""
+        self._check_id(upload_id)
+        try:
+            with open(self._meta_path(upload_id)) as meta:
+                upload = json.load(meta)
+        except (FileNotFoundError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload não encontrado ou expirado"
+            )
+
+        if upload["usuario_id"] != usuario_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload não encontrado ou expirado"
+            )
+
+        if "armazenado" in upload:
+            upload["offset"] = upload["length"]
+            return upload
+
+        try:
+            upload["offset"] = os.path.getsize(self._data_path(upload_id))
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload não encontrado ou expirado"
+            )
+        return upload
+
+    async def append(self, upload_id: str, usuario_id: int, offset: int, chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+        """Anexar o corpo do PATCH ao arquivo a partir de `offset`
+
+        Os blocos vão direto para o disco conforme chegam; se a conexão cair no
+        meio, o que já foi gravado conta e o cliente retoma do novo offset.
+        """
+        upload = await run_in_threadpool(self.get, upload_id, usuario_id)
+
+        if "armazenado" in upload:
+            # Já recebido por inteiro: repetição do PATCH final
+            if offset != upload["length"]:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Upload-Offset não corresponde ao recebido",
+                    headers={"Upload-Offset": str(upload["length"])}
+                )
+            upload["completo"] = True
+            return upload
+
+        handle = open(self._data_path(upload_id), "ab")
+        try:
+            # Um PATCH por vez por upload (vale entre processos)
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Upload já está recebendo dados em outra conexão"
+                )
+
+            current = os.fstat(handle.fileno()).st_size
+            if offset != current:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Upload-Offset não corresponde ao recebido",
+                    headers={"Upload-Offset": str(current)}
+                )
+
+            try:
+                async for chunk in chunks:
+                    if current + len(chunk) > upload["length"]:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Dados excedem o Upload-Length declarado"
+                        )
+                    await run_in_threadpool(handle.write, chunk)
+                    current += len(chunk)
+            finally:
+                handle.flush()
+        finally:
+            handle.close()
+
+        upload["offset"] = current
+        upload["completo"] = current == upload["length"]
+        return upload
+
+    def _update_meta(self, upload_id: str, update: Callable[[Dict[str, Any]], Any]) -> Any:
+        """Ler, alterar e regravar o <id>.json sob trava exclusiva (entre processos)"""
+        self._check_id(upload_id)
+        try:
+            meta = open(self._meta_path(upload_id), "r+")
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload não encontrado ou expirado"
+            )
+        with meta:
+            fcntl.flock(meta.fileno(), fcntl.LOCK_EX)
+            upload = json.load(meta)
+            result = update(upload)
+            meta.seek(0)
+            meta.truncate()
+            json.dump(upload, meta)
+        return result
+
+    def complete(self, upload_id: str) -> Dict[str, Any]:
+        """Entregar o arquivo completo ao armazenamento de imagens (bloqueante)
+
+        Idempotente: numa repetição devolve o que já foi armazenado.
+        """
+        def ingest(upload: Dict[str, Any]) -> Dict[str, Any]:
+            if "armazenado" not in upload:
+                upload["armazenado"] = image_service.ingest_file(self._data_path(upload_id))
+            return upload["armazenado"]
+
+        return self._update_meta(upload_id, ingest)
+
+    def record_outcome(
+        self,
+        upload_id: str,
+        resultado: Optional[Dict[str, Any]] = None,
+        erro: Optional[Dict[str, Any]] = None
+    ):
+        """Guardar o desfecho definitivo (imagem anexada ou erro) para repetições"""
+        def record(upload: Dict[str, Any]):
+            if resultado is not None:
+                upload["resultado"] = resultado
+            if erro is not None:
+                upload["erro"] = erro
+
+        self._update_meta(upload_id, record)
+
+# Instância global do serviço
+resumable_uploads = ResumableUploadService(settings.UPLOAD_DIR)
@@ -0,0 +1,38 @@
+import statistics
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentil por interpolação linear (samples em segundos)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Resumo de latências em milissegundos"""
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]):
+    """Imprimir resumo em formato de tabela"""
+    print(f"\n{title}")
+    header = f"{'cenário':<28}{'n':>7}{'média':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'máx':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, s in rows.items():
+        print(
+            f"{name:<28}{s['n']:>7}{s['mean_ms']:>10}{s['p50_ms']:>10}"
+            f"{s['p95_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}"
+        )
@@ -0,0 +1,66 @@
+"""
+Benchmark: latência p99 com chamadas Oracle dentro de handlers async
+
+Compara o caminho antigo (execute_query síncrono dentro da corrotina, travando
+o event loop) com o novo (execute_query_async no executor do oracle_manager).
+Enquanto as consultas rodam, uma corrotina "sonda" mede a latência de um
+endpoint leve, que é o que os demais usuários da API sentem.
+
+Uso (a partir de backend/, com Oracle acessível):
+    python -m benchmarks.bench_async_oracle --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.oracle_config import oracle_manager
+from benchmarks._stats import print_table, summarize
+
+
+async def _probe(stop: asyncio.Event, samples: list, interval: float):
+    """Simula um endpoint sem banco e mede o atraso imposto pelo event loop"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+async def _run(mode: str, query: str, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    db_samples, probe_samples = [], []
+    stop = asyncio.Event()
+
+    async def one_request():
+        async with semaphore:
+            start = time.perf_counter()
+            if mode == "sync":
+                oracle_manager.execute_query(query)
+            else:
+                await oracle_manager.execute_query_async(query)
+            db_samples.append(time.perf_counter() - start)
+
+    probe = asyncio.create_task(_probe(stop, probe_samples, 0.005))
+    await asyncio.gather(*(one_request() for _ in range(total)))
+    stop.set()
+    await probe
+    return summarize(db_samples), summarize(probe_samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--query", default="SELECT COUNT(*) FROM OCORRENCIAS")
+    args = parser.parse_args()
+
+    rows = {}
+    for mode, label in (("sync", "antes (sync no loop)"), ("async", "depois (executor)")):
+        db, probe = asyncio.run(_run(mode, args.query, args.requests, args.concurrency))
+        rows[f"{label} - consulta"] = db
+        rows[f"{label} - sonda"] = probe
+
+    print_table(f"{args.requests} requisições, concorrência {args.concurrency}", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: sincronização offline, item a item x POST /occurrences/batch
+
+Grava N ocorrências pelo caminho de item único (create_occurrence, uma ida
+ao banco por item) e N pelo lote (create_occurrences_batch, executemany) e
+compara a vazão. ATENÇÃO: insere linhas reais para o usuário informado;
+usar num banco de testes.
+
+Uso (a partir de backend/, com Oracle acessível):
+    python -m benchmarks.bench_batch_ingest --usuario-id 1 --items 500
+"""
+import argparse
+import time
+import uuid
+
+from app.core.oracle_config import oracle_manager
+from app.schemas.occurrence_schemas import OccurrenceCreate
+from app.services.occurrence_service import occurrence_service
+from benchmarks._stats import print_table, summarize
+
+
+def _item(index: int) -> dict:
+    return {
+        "tipo_ocorrencia": "queimada",
+        "localizacao": f"Benchmark de sincronização {index}",
+        "grau_severidade": "media",
+        "descricao": "Ocorrência gerada pelo benchmark de sincronização offline",
+        "coordenadas": {"lat": -23.5 + index * 1e-4, "lng": -46.6 - index * 1e-4},
+        "chave_idempotencia": f"bench-{uuid.uuid4()}"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuario-id", type=int, default=1)
+    parser.add_argument("--items", type=int, default=500)
+    args = parser.parse_args()
+
+    oracle_manager.initialize()
+
+    single_samples = []
+    start = time.perf_counter()
+    for index in range(args.items):
+        data = _item(index)
+        data.pop("chave_idempotencia")
+        item_start = time.perf_counter()
+        occurrence_service.create_occurrence(OccurrenceCreate(**data), args.usuario_id)
+        single_samples.append(time.perf_counter() - item_start)
+    single_elapsed = time.perf_counter() - start
+
+    items = [_item(index) for index in range(args.items)]
+    start = time.perf_counter()
+    result = occurrence_service.create_occurrences_batch(items, args.usuario_id)
+    batch_elapsed = time.perf_counter() - start
+
+    # Reenvio do mesmo lote: tudo deve voltar como "existente"
+    start = time.perf_counter()
+    replay = occurrence_service.create_occurrences_batch(items, args.usuario_id)
+    replay_elapsed = time.perf_counter() - start
+
+    print_table(
+        f"{args.items} ocorrências",
+        {
+            "item a item (por item)": summarize(single_samples),
+            "lote (total)": summarize([batch_elapsed]),
+            "lote reenviado (total)": summarize([replay_elapsed]),
+        }
+    )
+    print(f"\nVazão item a item: {args.items / single_elapsed:.0f} itens/s")
+    print(f"Vazão em lote:     {args.items / batch_elapsed:.0f} itens/s ({single_elapsed / batch_elapsed:.1f}x)")
+    print(f"Lote: {result['criadas']} criadas; reenvio: {replay['existentes']} existentes")
+    oracle_manager.close()
+
+
+if __name__ == "__main__":
+    main()
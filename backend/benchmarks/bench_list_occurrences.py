@@ -0,0 +1,59 @@
+"""
+Benchmark: latência das listagens de ocorrências
+
+Mede páginas de GET /occurrences (por usuário) e /occurrences/all (admin)
+direto no serviço. Rodar antes e depois de `alembic -x db=oracle upgrade
+oracle@head` para comparar CLOB (LOB locator por linha) com VARCHAR2.
+
+Uso (a partir de backend/, com Oracle acessível):
+    python -m benchmarks.bench_list_occurrences --usuario-id 1 --limit 100 --iterations 30
+"""
+import argparse
+import time
+
+from app.core.oracle_config import oracle_manager
+from app.services.occurrence_service import occurrence_service
+from benchmarks._stats import print_table, summarize
+
+
+def _time_pages(fetch, iterations: int):
+    samples = []
+    rows = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        page = fetch()
+        samples.append(time.perf_counter() - start)
+        rows = len(page["items"])
+    return summarize(samples), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuario-id", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    oracle_manager.initialize()
+    # Aquecimento (cache de statements e conexões do pool)
+    occurrence_service.get_all_occurrences(args.limit)
+
+    user_stats, user_rows = _time_pages(
+        lambda: occurrence_service.get_user_occurrences(args.usuario_id, args.limit), args.iterations
+    )
+    all_stats, all_rows = _time_pages(
+        lambda: occurrence_service.get_all_occurrences(args.limit), args.iterations
+    )
+
+    print_table(
+        f"Página de até {args.limit} itens, {args.iterations} iterações",
+        {
+            f"usuário ({user_rows} linhas)": user_stats,
+            f"admin ({all_rows} linhas)": all_stats,
+        }
+    )
+    oracle_manager.close()
+
+
+if __name__ == "__main__":
+    main()
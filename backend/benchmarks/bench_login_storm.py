@@ -0,0 +1,67 @@
+"""
+Benchmark: rajada de logins (bcrypt) e latência dos demais endpoints
+
+Compara a verificação bcrypt inline no event loop (comportamento antigo) com
+o pool de processos do password_hasher. Uma corrotina "sonda" simula um
+endpoint leve e mede o atraso que ele sofre durante a rajada.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_login_storm --logins 50
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.password_hasher import hash_password, password_hasher, verify_password
+from benchmarks._stats import print_table, summarize
+
+
+async def _probe(stop: asyncio.Event, samples: list, interval: float):
+    """Mede quanto o event loop atrasa uma tarefa curta"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+async def _storm(mode: str, logins: int, password: str, hashed: str):
+    login_samples, probe_samples = [], []
+    stop = asyncio.Event()
+
+    async def one_login():
+        start = time.perf_counter()
+        if mode == "inline":
+            verify_password(password, hashed)
+            await asyncio.sleep(0)
+        else:
+            await password_hasher.verify(password, hashed)
+        login_samples.append(time.perf_counter() - start)
+
+    probe = asyncio.create_task(_probe(stop, probe_samples, 0.005))
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+    stop.set()
+    await probe
+    return summarize(login_samples), summarize(probe_samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50)
+    args = parser.parse_args()
+
+    password = "senhaTeste123"
+    hashed = hash_password(password)
+
+    rows = {}
+    for mode, label in (("inline", "antes (bcrypt no loop)"), ("pool", "depois (pool)")):
+        logins, probe = asyncio.run(_storm(mode, args.logins, password, hashed))
+        rows[f"{label} - login"] = logins
+        rows[f"{label} - sonda"] = probe
+
+    password_hasher.executor.shutdown()
+    print_table(f"{args.logins} logins simultâneos", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: tamanho e tempo de codificação das respostas de /occurrences
+
+Para páginas de GET /occurrences com N itens, compara JSON (orjson) e
+MessagePack, sem compressão, com gzip e com brotli (se instalado), nos
+mesmos níveis usados pelo CompressionMiddleware. Mostra os bytes que vão
+pela rede e o tempo de serializar + comprimir cada página.
+
+Não acessa o Oracle; usa as ocorrências sintéticas de bench_serialization.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_payload_formats --rows 20 100 1000 --iterations 50
+"""
+import argparse
+import time
+import zlib
+
+from app.core.compression import brotli
+from app.core.config import settings
+from app.core.responses import dumps, packb
+from benchmarks._stats import print_table, summarize
+from benchmarks.bench_serialization import sample_occurrences
+
+
+def _gzip(body: bytes) -> bytes:
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def _variants():
+    compressions = [("", None), ("+gzip", _gzip)]
+    if brotli is not None:
+        compressions.append(("+br", _brotli))
+    for format_name, encode in (("json", dumps), ("msgpack", packb)):
+        for suffix, compress in compressions:
+            yield f"{format_name}{suffix}", encode, compress
+
+
+def _time(encode, compress, content, iterations: int):
+    samples = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        body = encode(content)
+        if compress is not None:
+            body = compress(body)
+        samples.append(time.perf_counter() - start)
+        size = len(body)
+    return summarize(samples), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        content = {
+            "success": True,
+            "message": f"Encontradas {rows} ocorrências",
+            "data": sample_occurrences(rows),
+            "next_cursor": "MjAyNi0wMS0wMVQxMjowMDowMHwxMjM0NQ"
+        }
+
+        timings = {}
+        sizes = {}
+        for name, encode, compress in _variants():
+            _time(encode, compress, content, 1)  # aquecimento
+            timings[name], sizes[name] = _time(encode, compress, content, args.iterations)
+
+        print_table(f"Codificação de {rows} ocorrências, {args.iterations} iterações", timings)
+        baseline = sizes["json"]
+        print(f"\n{'formato':<28}{'bytes':>12}{'% do json':>12}")
+        for name, size in sizes.items():
+            print(f"{name:<28}{size:>12}{size * 100 / baseline:>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()
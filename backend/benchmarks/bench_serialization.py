@@ -0,0 +1,104 @@
+"""
+Benchmark: serialização de listagens grandes de ocorrências
+
+Compara, para uma página com N ocorrências no formato de GET /occurrences:
+  - padrão FastAPI: model_dump, validação pelo response_model, dump em modo
+    JSON e json.dumps (o caminho de uma rota que devolve o modelo)
+  - jsonable_encoder + json.dumps (rota sem response_model)
+  - unvalidated_response: model_construct + orjson (FastJSONResponse)
+
+Não acessa o Oracle; as linhas são sintéticas, com datetime e Decimal como
+chegam do banco.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_serialization --rows 10000 --iterations 20
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import unvalidated_response
+from app.schemas.occurrence_schemas import PaginatedApiResponse
+from benchmarks._stats import print_table, summarize
+
+TIPOS = ["queimada", "desmatamento", "poluicao_agua", "garimpo_ilegal", "invasao_territorio"]
+SEVERIDADES = ["baixa", "media", "alta", "critica"]
+
+
+def sample_occurrences(rows: int) -> list:
+    """Ocorrências sintéticas no formato de row_to_occurrence"""
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    return [
+        {
+            "id": index,
+            "usuario_id": index % 50 + 1,
+            "tipo_ocorrencia": TIPOS[index % len(TIPOS)],
+            "localizacao": f"Aldeia {index % 40}, margem do rio, próximo ao marco {index}",
+            "grau_severidade": SEVERIDADES[index % len(SEVERIDADES)],
+            "descricao": "Foco de fumaça visto ao amanhecer, área de mata ciliar atingida. " * 2,
+            "coordenadas": {"lat": -3.1 - index * 1e-4, "lng": -60.0 + index * 1e-4},
+            "imagens": [f"/api/v1/images/{index:064x}"] if index % 3 == 0 else [],
+            "status": "reportada",
+            "data_criacao": base + timedelta(minutes=index),
+            "data_atualizacao": base + timedelta(minutes=index, seconds=30),
+            "versao": Decimal(1 + index % 4)
+        }
+        for index in range(rows)
+    ]
+
+
+def _fastapi_default(items: list) -> bytes:
+    model = PaginatedApiResponse(success=True, message="lista", data=items, next_cursor="abc")
+    validated = PaginatedApiResponse.model_validate(model.model_dump())
+    content = validated.model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _jsonable_encoder(items: list) -> bytes:
+    content = jsonable_encoder({"success": True, "message": "lista", "data": items, "next_cursor": "abc"})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _orjson_unvalidated(items: list) -> bytes:
+    return unvalidated_response(
+        PaginatedApiResponse, success=True, message="lista", data=items, next_cursor="abc"
+    ).body
+
+
+def _time(encode, items: list, iterations: int):
+    samples = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        body = encode(items)
+        samples.append(time.perf_counter() - start)
+        size = len(body)
+    return summarize(samples), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    items = sample_occurrences(args.rows)
+    results = {}
+    for name, encode in (
+        ("padrão FastAPI", _fastapi_default),
+        ("jsonable_encoder", _jsonable_encoder),
+        ("orjson sem validação", _orjson_unvalidated),
+    ):
+        encode(items)  # aquecimento
+        stats, size = _time(encode, items, args.iterations)
+        results[f"{name} {size // 1024}KB"] = stats
+
+    print_table(f"Serialização de {args.rows} ocorrências, {args.iterations} iterações", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: tempo de cold start da API
+
+Mede, em processos novos, o tempo de `import app.main` e o tempo do lifespan
+(pools em paralelo + verificação de schema) em cada SCHEMA_CHECK_MODE.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks._stats import print_table, summarize
+
+PROBE = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+import app.main as main
+t1 = time.perf_counter()
+
+async def run_lifespan():
+    async with main.lifespan(main.app):
+        return time.perf_counter()
+
+t2 = asyncio.run(run_lifespan()) if {lifespan} else t1
+print(json.dumps({{"import": t1 - t0, "lifespan": t2 - t1}}))
+"""
+
+
+def _measure(runs: int, mode: str, lifespan: bool):
+    env = dict(os.environ, SCHEMA_CHECK_MODE=mode)
+    imports, lifespans = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(lifespan=lifespan)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        imports.append(result["import"])
+        lifespans.append(result["lifespan"])
+    return summarize(imports), summarize(lifespans)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-only", action="store_true", help="Não executar o lifespan (sem banco)")
+    args = parser.parse_args()
+
+    rows = {}
+    modes = ("marker",) if args.import_only else ("full", "marker", "skip")
+    for mode in modes:
+        imported, lifespan = _measure(args.runs, mode, not args.import_only)
+        rows["import app.main"] = imported
+        if not args.import_only:
+            rows[f"lifespan ({mode})"] = lifespan
+
+    print_table(f"Cold start em {args.runs} processos", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -107,12 +107,13 @@ def run_migrations():
     if not run_command(current_cmd, "Verificando revisão atual"):
         # Se não há tabela de migrations, inicializar
         print("📝 Inicializando Alembic...")
-        init_cmd = "alembic stamp head"
+        init_cmd = "alembic stamp postgres@head"
         if not run_command(init_cmd, "Inicializando Alembic"):
             return False
     
-    # Executar migrations
-    upgrade_cmd = "alembic upgrade head"
+    # Executar migrations (branch postgres; o branch oracle é aplicado à parte
+    # com `alembic -x db=oracle upgrade oracle@head`)
+    upgrade_cmd = "alembic upgrade postgres@head"
     return run_command(upgrade_cmd, "Executando migrations")
 
 
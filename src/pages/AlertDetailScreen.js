@@ -260,7 +260,7 @@ const AlertDetailScreen = ({ navigation, route }) => {
             <View style={styles.imagesContainer}>
               {displayData.images.map((image, index) => (
                 <View key={index} style={styles.imageContainer}>
-                  <Image source={{ uri: image }} style={styles.image} />
+                  <Image source={{ uri: apiService.imageUrl(image, 640) }} style={styles.image} />
                 </View>
               ))}
             </View>
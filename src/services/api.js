@@ -14,6 +14,12 @@ console.log('🌐 API URL configurada:', API_BASE_URL);
 class ApiService {
   constructor() {
     this.baseURL = API_BASE_URL;
+    // MessagePack: respostas menores que JSON em conexões lentas (opcional)
+    this.useMsgpack = false;
+  }
+
+  setBinaryFormat(enabled) {
+    this.useMsgpack = enabled;
   }
 
   async healthCheck() {
@@ -35,12 +41,14 @@ class ApiService {
   async request(endpoint, options = {}) {
     const url = `${this.baseURL}${endpoint}`;
     
+    // Cabeçalhos da chamada somam-se aos padrões (não os substituem)
     const config = {
+      ...options,
       headers: {
         'Content-Type': 'application/json',
+        ...(this.useMsgpack ? { Accept: 'application/msgpack, application/json;q=0.9' } : {}),
         ...options.headers,
       },
-      ...options,
     };
 
     // Adicionar token de autorização se disponível
@@ -60,6 +68,11 @@ class ApiService {
       
       const response = await Promise.race([fetchPromise, timeoutPromise]);
       
+      // ETag igual à enviada em If-None-Match: nada mudou desde a última busca
+      if (response.status === 304) {
+        return { notModified: true, etag: response.headers.get('etag') };
+      }
+
       if (!response.ok) {
         const errorData = await response.json().catch(() => ({}));
         const errorMessage = errorData.message || errorData.detail || `HTTP ${response.status}: ${response.statusText}`;
@@ -73,8 +86,23 @@ class ApiService {
       }
 
       const contentType = response.headers.get('content-type');
+      if (contentType && contentType.includes('application/msgpack')) {
+        const { decode } = require('@msgpack/msgpack');
+        const data = decode(new Uint8Array(await response.arrayBuffer()));
+        const etag = response.headers.get('etag');
+        if (etag && data && typeof data === 'object') {
+          data.etag = etag;
+        }
+        return data;
+      }
+
       if (contentType && contentType.includes('application/json')) {
-        return await response.json();
+        const data = await response.json();
+        const etag = response.headers.get('etag');
+        if (etag && data && typeof data === 'object') {
+          data.etag = etag;
+        }
+        return data;
       }
       
       return await response.text();
@@ -213,8 +241,17 @@ class ApiService {
   }
 
   // Métodos de Ocorrências
-  async getOccurrences() {
-    return await this.request('/occurrences/');
+  buildQuery(params = {}) {
+    const query = Object.entries(params)
+      .filter(([, value]) => value !== undefined && value !== null)
+      .map(([key, value]) => `${encodeURIComponent(key)}=${encodeURIComponent(value)}`)
+      .join('&');
+    return query ? `?${query}` : '';
+  }
+
+  // Paginação por cursor: passar o next_cursor da resposta anterior
+  async getOccurrences({ limit, cursor } = {}) {
+    return await this.request(`/occurrences/${this.buildQuery({ limit, cursor })}`);
   }
 
   async createOccurrence(occurrenceData) {
@@ -224,12 +261,101 @@ class ApiService {
     });
   }
 
-  async getUserOccurrences() {
-    return await this.request('/occurrences/', {
+  // Sincronização incremental: enviar o next_since e a etag da resposta anterior
+  async getOccurrenceChanges({ since, limit, etag } = {}) {
+    return await this.request(`/occurrences/changes${this.buildQuery({ since, limit })}`, {
+      headers: etag ? { 'If-None-Match': etag } : {},
+    });
+  }
+
+  // Sincronização offline: cada item leva uma chave_idempotencia gerada no app
+  async syncOccurrences(items) {
+    return await this.request('/occurrences/batch', {
+      method: 'POST',
+      body: JSON.stringify({ items }),
+    });
+  }
+
+  async getUserOccurrences({ limit, cursor } = {}) {
+    return await this.request(`/occurrences/${this.buildQuery({ limit, cursor })}`, {
       method: 'GET',
     });
   }
 
+  // Triagem: enviar a etag lida em getOccurrence (resposta 412 = alterada por outra pessoa)
+  async getOccurrence(id) {
+    return await this.request(`/occurrences/${id}`);
+  }
+
+  async updateOccurrence(id, changes, etag) {
+    return await this.request(`/occurrences/${id}`, {
+      method: 'PATCH',
+      headers: etag ? { 'If-Match': etag } : {},
+      body: JSON.stringify(changes),
+    });
+  }
+
+  // Foto da ocorrência: uri local da câmera/galeria (React Native)
+  async uploadOccurrenceImage(id, { uri, type = 'image/jpeg', name = 'foto.jpg' }) {
+    const form = new FormData();
+    form.append('file', { uri, type, name });
+    return await this.request(`/occurrences/${id}/images`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'multipart/form-data' },
+      body: form,
+    });
+  }
+
+  // Caminhos devolvidos pela API (ex.: /api/v1/images/...) como URL absoluta
+  absoluteUrl(path) {
+    if (!path || /^https?:\/\//.test(path)) {
+      return path;
+    }
+    return `${this.baseURL.replace(/\/api\/v1$/, '')}${path}`;
+  }
+
+  // Imagens enviadas, com largura para receber a variante WebP reduzida
+  imageUrl(path, width) {
+    const url = this.absoluteUrl(path);
+    return width && url && !url.includes('?') ? `${url}?w=${width}` : url;
+  }
+
+  // Upload retomável (estilo tus): cria o upload e envia os bytes a partir do offset
+  // já recebido pelo servidor, então uma nova tentativa reenvia só o que faltou
+  async createResumableUpload(occurrenceId, size) {
+    const token = await this.getStoredToken();
+    const response = await fetch(`${this.baseURL}/uploads/?occurrence_id=${occurrenceId}`, {
+      method: 'POST',
+      headers: { Authorization: `Bearer ${token}`, 'Upload-Length': String(size), 'Tus-Resumable': '1.0.0' },
+    });
+    if (response.status !== 201) {
+      throw new Error(`HTTP ${response.status}: não foi possível iniciar o upload`);
+    }
+    return response.headers.get('location');
+  }
+
+  async resumeUpload(location, blob) {
+    const token = await this.getStoredToken();
+    const url = this.absoluteUrl(location);
+    const headers = { Authorization: `Bearer ${token}`, 'Tus-Resumable': '1.0.0' };
+
+    const head = await fetch(url, { method: 'HEAD', headers });
+    const offset = Number(head.headers.get('upload-offset') || 0);
+
+    const response = await fetch(url, {
+      method: 'PATCH',
+      headers: { ...headers, 'Upload-Offset': String(offset), 'Content-Type': 'application/offset+octet-stream' },
+      body: blob.slice(offset),
+    });
+    if (response.status === 200) {
+      return await response.json();
+    }
+    if (response.status !== 204) {
+      throw new Error(`HTTP ${response.status}: falha no envio`);
+    }
+    return { offset: Number(response.headers.get('upload-offset')) };
+  }
+
   async getOccurrenceStats() {
     return await this.request('/occurrences/stats/', {
       method: 'GET',